@@ -0,0 +1,89 @@
+"""
+Compares building the JSON body of an upload batch by base64 encoding
+each file chunk into a dict and serializing it with the json module
+against writing it with BatchJsonEncoder.
+
+    python -m benchmarks.batch_serialization --num-files 100 --file-size-bytes 30000
+"""
+
+import argparse, base64, json, os, time, tracemalloc
+
+from insight_cli.utils import BatchJsonEncoder
+
+
+def build_with_json_module(batch_header: dict, files: dict[str, dict]) -> bytes:
+    return json.dumps(
+        {
+            **batch_header,
+            "files": {
+                file_path: {
+                    "content": base64.b64encode(file["content"]).decode("utf-8"),
+                    "size_bytes": len(file["content"]),
+                    "chunk_index": file["chunk_index"],
+                    "num_total_chunks": file["num_total_chunks"],
+                }
+                for file_path, file in files.items()
+            },
+        }
+    ).encode("utf-8")
+
+
+def build_with_batch_json_encoder(
+    batch_header: dict, files: dict[str, dict]
+) -> bytearray:
+    return BatchJsonEncoder.encode(batch_header, files)
+
+
+def run(build, batch_header: dict, files: dict[str, dict]) -> dict:
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    body = build(batch_header, files)
+    elapsed_seconds = time.perf_counter() - start_time
+    _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": elapsed_seconds,
+        "body_bytes": len(body),
+        "peak_memory_bytes": peak_memory_bytes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--num-files", type=int, default=100)
+    parser.add_argument("--file-size-bytes", type=int, default=30_000)
+    args = parser.parse_args()
+
+    batch_header = {"repository_id": "repository_id", "batch_index": 0}
+    files = {
+        f"src/module_{i}.py": {
+            "content": memoryview(os.urandom(args.file_size_bytes)),
+            "size_bytes": args.file_size_bytes,
+            "chunk_index": 0,
+            "num_total_chunks": 1,
+        }
+        for i in range(args.num_files)
+    }
+
+    if json.loads(build_with_json_module(batch_header, files)) != json.loads(
+        build_with_batch_json_encoder(batch_header, files)
+    ):
+        raise RuntimeError("Batch bodies differ")
+
+    print(f"{args.num_files} files, {args.num_files * args.file_size_bytes} bytes")
+    print(f"{'serializer':<20}{'seconds':>9}{'body bytes':>13}{'peak memory':>13}")
+
+    for name, build in (
+        ("json module", build_with_json_module),
+        ("BatchJsonEncoder", build_with_batch_json_encoder),
+    ):
+        result = run(build, batch_header, files)
+        print(
+            f"{name:<20}{result['seconds']:>9.3f}{result['body_bytes']:>13}"
+            f"{result['peak_memory_bytes']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compares the peak memory of reading, encoding and building the request
+bodies of the upload batches of one large file when each chunk is read
+into its own bytes object and the body is copied before it is sent, and
+when chunks are read into one buffer per batch and passed on as views
+down to the transport. Request bodies are left uncompressed.
+
+    python -m benchmarks.chunking --file-size-bytes 50000000
+"""
+
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+import argparse, os, tempfile, time, tracemalloc
+
+from insight_cli.api.base.batch_api import BatchAPI
+from insight_cli.utils import BatchPlanner, File, FileChunkRange
+from insight_cli import config
+
+
+def read_batches_with_copies(
+    planned_batches: list[list[FileChunkRange]],
+) -> Iterator[list[tuple[FileChunkRange, bytes]]]:
+    for planned_batch in planned_batches:
+        yield [
+            (
+                chunk_range,
+                File(Path(chunk_range["path"])).read_range(
+                    chunk_range["start"], chunk_range["end"]
+                ),
+            )
+            for chunk_range in planned_batch
+        ]
+
+
+def run(upload_format: str, uses_views: bool, file: File) -> dict:
+    with patch.object(config, "INSIGHT_API_UPLOAD_FORMAT", upload_format):
+        planned_batches = BatchPlanner.plan(
+            [(str(file.path), file.size_bytes)],
+            BatchAPI._MAX_BATCH_SIZE_BYTES,
+            upload_format,
+        )
+        read_batches = (
+            BatchAPI._read_batches(planned_batches)
+            if uses_views
+            else read_batches_with_copies(planned_batches)
+        )
+
+        tracemalloc.start()
+        start_time = time.perf_counter()
+
+        for encoded_batch in BatchAPI._encode_batches(read_batches):
+            request_body = BatchAPI._get_request_body({}, {}, encoded_batch)
+            body = request_body["data"]
+
+            if not uses_views:
+                body = bytes(body)
+
+            del encoded_batch, request_body, body
+
+        elapsed_seconds = time.perf_counter() - start_time
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {"seconds": elapsed_seconds, "peak_memory_bytes": peak_memory_bytes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--file-size-bytes", type=int, default=50_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = Path(temp_dir) / "large_file.bin"
+        file_path.write_bytes(os.urandom(args.file_size_bytes))
+        file = File(file_path)
+
+        print(f"1 file, {args.file_size_bytes} bytes")
+        print(f"{'format':<8}{'chunks':<8}{'seconds':>9}{'peak memory':>13}")
+
+        for upload_format in ("json", "binary"):
+            for uses_views in (False, True):
+                result = run(upload_format, uses_views, file)
+                print(
+                    f"{upload_format:<8}{'views' if uses_views else 'copies':<8}"
+                    f"{result['seconds']:>9.3f}{result['peak_memory_bytes']:>13}"
+                )
+
+
+if __name__ == "__main__":
+    main()
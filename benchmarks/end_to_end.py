@@ -0,0 +1,141 @@
+"""
+Measures repository operations end to end against a local
+StandInServer: a cold initialize, a resync with no changes, a resync
+after a share of the files changed, and queries. Each scenario runs in
+a fresh process, so its peak RSS is its own. Results are printed as
+JSON with the wall time, bytes sent, requests made and peak RSS of
+every scenario.
+
+    python -m benchmarks.end_to_end --num-files 1000 --latency-seconds 0.02
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse, json, multiprocessing, resource, sys, tempfile, time
+
+from insight_cli.repository import Repository
+from insight_cli import config
+from .stand_in_server import StandInServer
+from .synthetic_repository import SyntheticRepository
+
+_QUERIES = [
+    "handle request",
+    "build response headers body",
+    "internal server error",
+    "repository manager file name",
+    "status code",
+]
+
+
+def get_peak_rss_bytes() -> int:
+    """
+    ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def run_operation(base_url: str, repository_path: Path, operation: str) -> dict:
+    """
+    Runs in the scenario's own process.
+    """
+    config.INSIGHT_API_BASE_URL = base_url
+    repository = Repository(repository_path)
+
+    start_time = time.perf_counter()
+
+    if operation == "initialize":
+        repository.initialize()
+
+    elif operation == "reinitialize":
+        repository.reinitialize()
+
+    else:
+        for query_string in _QUERIES:
+            repository.query(query_string, 10)
+
+    return {
+        "wall_seconds": time.perf_counter() - start_time,
+        "peak_rss_bytes": get_peak_rss_bytes(),
+    }
+
+
+def run_scenario(
+    server: StandInServer, repository_path: Path, name: str, operation: str
+) -> dict:
+    bytes_received = sum(server.bytes_received.values())
+    requests_handled = sum(server.requests_handled.values())
+
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        result = executor.submit(
+            run_operation, server.base_url, repository_path, operation
+        ).result()
+
+    return {
+        "name": name,
+        "wall_seconds": result["wall_seconds"],
+        "bytes_sent": sum(server.bytes_received.values()) - bytes_received,
+        "requests_made": sum(server.requests_handled.values()) - requests_handled,
+        "peak_rss_bytes": result["peak_rss_bytes"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--num-files", type=int, default=1000)
+    parser.add_argument("--median-file-size-bytes", type=int, default=8 * 1024)
+    parser.add_argument("--file-size-sigma", type=float, default=1.0)
+    parser.add_argument("--max-depth", type=int, default=4)
+    parser.add_argument("--churn-fraction", type=float, default=0.01)
+    parser.add_argument("--latency-seconds", type=float, default=0.0)
+    parser.add_argument("--bandwidth-bytes-per-second", type=float, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir, StandInServer(
+        latency_seconds=args.latency_seconds,
+        bandwidth_bytes_per_second=args.bandwidth_bytes_per_second,
+    ) as server:
+        repository = SyntheticRepository(
+            Path(temp_dir),
+            args.num_files,
+            args.median_file_size_bytes,
+            args.file_size_sigma,
+            args.max_depth,
+        ).create()
+
+        scenarios = [
+            run_scenario(server, repository.path, "cold_initialize", "initialize"),
+            run_scenario(server, repository.path, "noop_resync", "reinitialize"),
+        ]
+
+        repository.churn(args.churn_fraction)
+        scenarios.append(
+            run_scenario(server, repository.path, "churn_resync", "reinitialize")
+        )
+        scenarios.append(run_scenario(server, repository.path, "query", "query"))
+
+        results = {
+            "parameters": {
+                key: str(value) if isinstance(value, Path) else value
+                for key, value in vars(args).items()
+            },
+            "repository": {
+                "num_files": len(repository.file_paths),
+                "size_bytes": repository.size_bytes,
+            },
+            "scenarios": scenarios,
+        }
+
+    output = json.dumps(results, indent=2)
+    print(output)
+
+    if args.output is not None:
+        args.output.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
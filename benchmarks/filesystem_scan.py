@@ -0,0 +1,339 @@
+"""
+Measures the local hot paths of a directory scan on synthetic trees:
+reading the ignore patterns, walking the tree, reading modified times,
+finding the largest file and matching paths against ignore patterns.
+Each stage is timed on its own, best of a few runs, then run again to
+count its stat, open and scandir calls and the peak memory it
+allocates. Results can be saved as a baseline and later runs compared
+against it. By default trees of 1k, 10k, 100k and 1M files are
+measured; creating the largest takes a few minutes, so pass smaller
+sizes for a quick run.
+
+    python -m benchmarks.filesystem_scan --num-files 1000 10000 100000
+    python -m benchmarks.filesystem_scan --save-baseline baseline.json
+    python -m benchmarks.filesystem_scan --baseline baseline.json
+"""
+
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+import argparse, json, os, random, sys, tempfile, time, tracemalloc
+
+from insight_cli.repository.pattern_ignorer import PatternIgnorer
+from insight_cli.utils.string_matcher import StringMatcher
+from insight_cli.utils import Directory, File
+
+_INSIGHT_IGNORE = """\
+# generated ignore file
+\\.git
+__pycache__
+\\.venv
+node_modules
+build/
+
+## _directory_
+\\.mypy_cache
+dist
+
+## _file_
+_pb2\\.py$
+^.*/migrations/\\d{4}_.*\\.py$
+\\.min\\.py$
+"""
+
+_IGNORED_DIR_NAMES = ["__pycache__", ".venv", "node_modules", "build", ".git"]
+_FILE_EXTENSIONS = [".py"] * 7 + [".txt", ".json", ".pyc"]
+
+
+class _CountedDirEntry:
+    """
+    An os.DirEntry whose stat calls are counted. A DirEntry stats its
+    file at most once per result it caches: one shared by both kinds
+    of stat for anything but a symlink, and one more for the target of
+    a symlink, which is_dir and is_file also need. Their type is
+    otherwise known from the directory listing without a stat call.
+    """
+
+    def __init__(self, entry: os.DirEntry, counts: dict[str, int]):
+        self._entry = entry
+        self._counts = counts
+        self._cached_stats = set()
+
+    def __getattr__(self, name: str):
+        return getattr(self._entry, name)
+
+    def __fspath__(self) -> str:
+        return self._entry.__fspath__()
+
+    def _count_stat(self, follow_symlinks: bool) -> None:
+        stat_key = follow_symlinks and self._entry.is_symlink()
+
+        if stat_key not in self._cached_stats:
+            self._cached_stats.add(stat_key)
+            self._counts["stat"] += 1
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        self._count_stat(follow_symlinks)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self._entry.is_symlink():
+            self._count_stat(follow_symlinks)
+
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        if follow_symlinks and self._entry.is_symlink():
+            self._count_stat(follow_symlinks)
+
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+
+class _CountedScandirIterator:
+    def __init__(self, iterator, counts: dict[str, int]):
+        self._iterator = iterator
+        self._counts = counts
+
+    def __iter__(self):
+        for entry in self._iterator:
+            yield _CountedDirEntry(entry, self._counts)
+
+    def __enter__(self) -> "_CountedScandirIterator":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._iterator.close()
+
+
+class SyscallCounter:
+    """
+    Counts stat and lstat calls by wrapping them in the os module,
+    including those made through the entries os.scandir returns (see
+    _CountedDirEntry), and open and scandir calls through audit
+    events, while entered.
+    """
+
+    _active: "SyscallCounter | None" = None
+    _AUDIT_EVENTS = {"open": "open", "os.scandir": "scandir"}
+
+    @staticmethod
+    def _audit(event: str, args: tuple) -> None:
+        counter = SyscallCounter._active
+
+        if counter is not None and event in SyscallCounter._AUDIT_EVENTS:
+            counter.counts[SyscallCounter._AUDIT_EVENTS[event]] += 1
+
+    def __init__(self):
+        self.counts = {"stat": 0, "open": 0, "scandir": 0}
+
+    def _wrap(self, func: Callable) -> Callable:
+        def counted(*args, **kwargs):
+            self.counts["stat"] += 1
+            return func(*args, **kwargs)
+
+        return counted
+
+    def _wrap_scandir(self, scandir: Callable) -> Callable:
+        def counted(*args, **kwargs):
+            return _CountedScandirIterator(scandir(*args, **kwargs), self.counts)
+
+        return counted
+
+    def __enter__(self) -> "SyscallCounter":
+        self._patchers = [
+            patch.object(os, "stat", self._wrap(os.stat)),
+            patch.object(os, "lstat", self._wrap(os.lstat)),
+            patch.object(os, "scandir", self._wrap_scandir(os.scandir)),
+        ]
+
+        for patcher in self._patchers:
+            patcher.start()
+
+        SyscallCounter._active = self
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        SyscallCounter._active = None
+
+        for patcher in self._patchers:
+            patcher.stop()
+
+
+sys.addaudithook(SyscallCounter._audit)
+
+
+def create_tree(path: Path, num_files: int, seed: int = 0) -> None:
+    """
+    A tree of small files, mostly Python, spread over nested packages,
+    with a share of them in directories the ignore file excludes.
+    """
+    rng = random.Random(seed)
+    (path / PatternIgnorer._FILE_NAME).write_text(_INSIGHT_IGNORE)
+    num_dirs = max(1, num_files // 20)
+    dir_paths = [path]
+
+    for i in range(1, num_dirs):
+        parent_path = rng.choice(dir_paths[-64:])
+        dir_name = (
+            rng.choice(_IGNORED_DIR_NAMES) if rng.random() < 0.05 else f"package_{i}"
+        )
+        dir_paths.append(parent_path / dir_name)
+
+    for dir_path in dir_paths:
+        dir_path.mkdir(parents=True, exist_ok=True)
+
+    for i in range(num_files):
+        file_path = rng.choice(dir_paths) / (
+            f"module_{i}{rng.choice(_FILE_EXTENSIONS)}"
+        )
+        file_path.write_bytes(b"x" * rng.randint(0, 64))
+
+
+def get_stages(path: Path) -> list[tuple[str, Callable[[dict], None]]]:
+    """
+    Each stage reads what earlier stages left in a shared state.
+    """
+
+    def regex_patterns(state: dict) -> None:
+        state["regex_patterns"] = PatternIgnorer(path).regex_patterns
+
+    def get_files(state: dict) -> None:
+        state["directory"] = Directory(path, state["regex_patterns"], {".py"})
+
+    def file_modified_times(state: dict) -> None:
+        state["directory"].file_modified_times
+
+    def largest_file_by_size(state: dict) -> None:
+        state["directory"].largest_file_by_size
+
+    def matches_any_regex_pattern(state: dict) -> None:
+        for file_path in state["directory"].file_paths:
+            StringMatcher.matches_any_regex_pattern(
+                str(file_path), state["regex_patterns"]["file"]
+            )
+
+    return [
+        ("PatternIgnorer.regex_patterns", regex_patterns),
+        ("Directory._get_files", get_files),
+        ("Directory.file_modified_times", file_modified_times),
+        ("Directory.largest_file_by_size", largest_file_by_size),
+        ("StringMatcher.matches_any_regex_pattern", matches_any_regex_pattern),
+    ]
+
+
+def run(path: Path, num_repeats: int) -> dict[str, dict]:
+    """
+    Times are the best of [num_repeats] runs of every stage.
+    """
+    results = {}
+
+    for i in range(num_repeats + 1):
+        traced = i == num_repeats
+        File._instances.clear()
+        state = {}
+
+        for name, stage in get_stages(path):
+            if not traced:
+                start_time = time.perf_counter()
+                stage(state)
+                seconds = time.perf_counter() - start_time
+
+                if name in results:
+                    seconds = min(seconds, results[name]["seconds"])
+
+                results[name] = {"seconds": seconds}
+                continue
+
+            tracemalloc.start()
+
+            with SyscallCounter() as counter:
+                stage(state)
+
+            _, peak_memory_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name].update(
+                {**counter.counts, "peak_memory_bytes": peak_memory_bytes}
+            )
+
+    File._instances.clear()
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns a line per stage and tree size found in both, flagging
+    stages that got slower than [threshold] times the baseline.
+    """
+    lines = []
+
+    for num_files, stages in results.items():
+        for name, result in stages.items():
+            baseline_result = baseline.get(num_files, {}).get(name)
+
+            if baseline_result is None or not baseline_result["seconds"]:
+                continue
+
+            ratio = result["seconds"] / baseline_result["seconds"]
+            flag = "  REGRESSION" if ratio > threshold else ""
+            lines.append(f"{num_files:>9} {name:<42}{ratio:>7.2f}x{flag}")
+
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--num-files",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--num-repeats", type=int, default=3)
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--regression-threshold", type=float, default=1.1)
+    args = parser.parse_args()
+
+    results = {}
+
+    for num_files in args.num_files:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            create_tree(Path(temp_dir), num_files)
+            results[str(num_files)] = run(Path(temp_dir), args.num_repeats)
+
+        print(f"{num_files} files")
+        print(
+            f"{'stage':<42}{'seconds':>9}{'stat':>9}{'open':>9}{'scandir':>9}"
+            f"{'peak memory':>13}"
+        )
+
+        for name, result in results[str(num_files)].items():
+            print(
+                f"{name:<42}{result['seconds']:>9.3f}{result['stat']:>9}"
+                f"{result['open']:>9}{result['scandir']:>9}"
+                f"{result['peak_memory_bytes']:>13}"
+            )
+
+        print()
+
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline is not None:
+        print(f"compared with {args.baseline}")
+
+        for line in compare(
+            results,
+            json.loads(args.baseline.read_text()),
+            args.regression_threshold,
+        ):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import base64, hashlib, json, re, threading, time, uuid
+
+from insight_cli.api.base import RequestBodyCompressor
+from insight_cli.utils import BatchFrameCodec, FileDelta
+
+
+class StandInRepository:
+    def __init__(self):
+        self._file_chunks: dict[str, dict[int, bytes]] = {}
+        self._num_total_chunks: dict[str, int] = {}
+        self.files: dict[str, bytes] = {}
+
+    def add_file_chunk(
+        self, path: str, chunk_index: int, num_total_chunks: int, content: bytes
+    ) -> bytes | None:
+        """
+        Returns the file content once its last chunk has arrived.
+        """
+        self.files.pop(path, None)
+        self._num_total_chunks[path] = num_total_chunks
+        self._file_chunks.setdefault(path, {})[chunk_index] = content
+
+        if len(self._file_chunks[path]) < num_total_chunks:
+            return None
+
+        file_chunks = self._file_chunks.pop(path)
+        self.files[path] = b"".join(file_chunks[i] for i in range(num_total_chunks))
+
+        return self.files[path]
+
+    def delete_file(self, path: str) -> None:
+        self.files.pop(path, None)
+        self._file_chunks.pop(path, None)
+
+    def query(self, query_string: str, limit: int) -> list[dict]:
+        query_words = set(re.findall(r"\w+", query_string.lower()))
+        matches = []
+
+        for path, content in self.files.items():
+            for line_number, line in enumerate(
+                content.decode("utf-8", errors="replace").splitlines(), start=1
+            ):
+                score = len(query_words & set(re.findall(r"\w+", line.lower())))
+
+                if score:
+                    matches.append(
+                        (
+                            score,
+                            {
+                                "path": path,
+                                "start_line": line_number,
+                                "end_line": line_number,
+                                "content": line,
+                            },
+                        )
+                    )
+
+        matches.sort(key=lambda match: -match[0])
+
+        return [match for _, match in matches[:limit]]
+
+
+class StandInServer:
+    """
+    Local in-process implementation of the insight API endpoints the
+    CLI calls, for tests and benchmarks. It accepts upload batches as
+    JSON with base64 contents or as binary frames (see
+    BatchFrameCodec), with any request body compression the client
+    supports, reassembles the uploaded files and answers queries by
+    counting query words on each line. File deltas are applied to the
+    content they are based on, and batches with deltas based on other
+    content are answered with 412. Blobs are stored by hash across
+    repositories, as the real server does, so uploads can reference
+    content it already holds. Query matches are streamed as newline
+    delimited JSON to clients that accept it, unless [streams_queries]
+    is off. Bytes received and requests handled are counted per
+    endpoint.
+
+    Each request can be delayed by [latency_seconds], and request and
+    response bodies by their transfer time at
+    [bandwidth_bytes_per_second] on each connection, to stand in for a
+    remote server.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        accepted_encodings: list[str] | None = None,
+        streams_queries: bool = True,
+        latency_seconds: float = 0.0,
+        bandwidth_bytes_per_second: float | None = None,
+    ):
+        self.accepted_encodings = (
+            RequestBodyCompressor.get_supported_encodings()
+            if accepted_encodings is None
+            else accepted_encodings
+        )
+        self.streams_queries = streams_queries
+        self.latency_seconds = latency_seconds
+        self.bandwidth_bytes_per_second = bandwidth_bytes_per_second
+        self.repositories: dict[str, StandInRepository] = {}
+        self.blobs: dict[str, bytes] = {}
+        self._pending_file_references: dict[
+            str, list[tuple[StandInRepository, str]]
+        ] = {}
+        self.bytes_received: dict[str, int] = {}
+        self.requests_handled: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._http_server = ThreadingHTTPServer(
+            (host, port), StandInServer._create_request_handler(self)
+        )
+        self._http_server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(
+            target=self._http_server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _record_request(self, endpoint: str, size_bytes: int) -> None:
+        with self._lock:
+            self.bytes_received[endpoint] = (
+                self.bytes_received.get(endpoint, 0) + size_bytes
+            )
+            self.requests_handled[endpoint] = (
+                self.requests_handled.get(endpoint, 0) + 1
+            )
+
+    def _wait_for_transfer(self, size_bytes: int) -> None:
+        if self.bandwidth_bytes_per_second:
+            time.sleep(size_bytes / self.bandwidth_bytes_per_second)
+
+    def _get_repository(self, repository_id: str) -> StandInRepository:
+        with self._lock:
+            if repository_id not in self.repositories:
+                raise KeyError(repository_id)
+
+            return self.repositories[repository_id]
+
+    @staticmethod
+    def _decode_batch(content_type: str, body: bytes) -> tuple[dict, list[tuple]]:
+        """
+        Returns the batch header and its (path, chunk_index,
+        num_total_chunks, content) file chunks, whatever the format.
+        """
+        if content_type == BatchFrameCodec.CONTENT_TYPE:
+            batch_header, file_chunks = BatchFrameCodec.decode(body)
+
+            return batch_header, [
+                (
+                    file_chunk_header["path"],
+                    file_chunk_header["chunk_index"],
+                    file_chunk_header["num_total_chunks"],
+                    bytes(file_chunk_content),
+                )
+                for file_chunk_header, file_chunk_content in file_chunks
+            ]
+
+        batch = json.loads(body)
+
+        return batch, [
+            (
+                path,
+                file["chunk_index"],
+                file["num_total_chunks"],
+                base64.b64decode(file["content"]),
+            )
+            for path, file in batch.pop("files").items()
+        ]
+
+    @staticmethod
+    def get_blob_hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=32).hexdigest()
+
+    def _store_blob(self, content: bytes) -> None:
+        blob_hash = StandInServer.get_blob_hash(content)
+        self.blobs[blob_hash] = content
+
+        for repository, path in self._pending_file_references.pop(blob_hash, []):
+            repository.files[path] = content
+
+    def _reference_blob(
+        self, repository: StandInRepository, path: str, blob_hash: str
+    ) -> None:
+        """
+        A referenced blob may be uploaded by another batch of the same
+        upload that has not arrived yet.
+        """
+        if blob_hash in self.blobs:
+            repository.files[path] = self.blobs[blob_hash]
+        else:
+            self._pending_file_references.setdefault(blob_hash, []).append(
+                (repository, path)
+            )
+
+    def _apply_file_deltas(
+        self, repository: StandInRepository, file_deltas: dict[str, dict]
+    ) -> bool:
+        """
+        Deltas are applied only if every one of them is based on the
+        content currently stored, so a rejected batch changes nothing.
+        """
+        if any(
+            StandInServer.get_blob_hash(repository.files.get(path, b""))
+            != file_delta["base_blob_hash"]
+            for path, file_delta in file_deltas.items()
+        ):
+            return False
+
+        for path, file_delta in file_deltas.items():
+            content = FileDelta.apply(
+                repository.files[path],
+                [
+                    {
+                        "start_line": edit["start_line"],
+                        "end_line": edit["end_line"],
+                        "content": base64.b64decode(edit["content"]),
+                    }
+                    for edit in file_delta["edits"]
+                ],
+            )
+            repository.files[path] = content
+            self._store_blob(content)
+
+        return True
+
+    @staticmethod
+    def _get_cookie(headers, name: str) -> str | None:
+        for cookie in headers.get("Cookie", "").split(";"):
+            cookie_name, _, cookie_value = cookie.strip().partition("=")
+
+            if cookie_name == name:
+                return cookie_value
+
+        return None
+
+    def _handle(
+        self, method: str, endpoint: str, headers, body: bytes
+    ) -> tuple[int, object]:
+        if endpoint == "create_repository" and method == "POST":
+            repository_id = uuid.uuid4().hex
+
+            with self._lock:
+                self.repositories[repository_id] = StandInRepository()
+
+            return 200, {"repository_id": repository_id}
+
+        if endpoint in {"initialize_repository", "reinitialize_repository"}:
+            batch_header, file_chunks = StandInServer._decode_batch(
+                headers.get("Content-Type", "").split(";")[0], body
+            )
+            repository_id = batch_header.get(
+                "repository_id"
+            ) or StandInServer._get_cookie(headers, "repository_id")
+            repository = self._get_repository(repository_id)
+
+            with self._lock:
+                if not self._apply_file_deltas(
+                    repository, batch_header.get("file_deltas") or {}
+                ):
+                    return 412, None
+
+                for file_chunk in file_chunks:
+                    content = repository.add_file_chunk(*file_chunk)
+
+                    if content is not None:
+                        self._store_blob(content)
+
+                for path, blob_hash in (
+                    batch_header.get("file_references") or {}
+                ).items():
+                    self._reference_blob(repository, path, blob_hash)
+
+                for path, change in (batch_header.get("changes") or {}).items():
+                    if change == "delete":
+                        repository.delete_file(path)
+
+            return 200, None
+
+        request_data = json.loads(body) if body else {}
+
+        if endpoint == "negotiate_blobs":
+            self._get_repository(request_data["repository_id"])
+
+            with self._lock:
+                wanted_blob_hashes = [
+                    blob_hash
+                    for blob_hash in request_data["blob_hashes"]
+                    if blob_hash not in self.blobs
+                ]
+
+            return 200, {
+                "wanted_blob_hashes": wanted_blob_hashes,
+                "supports_file_deltas": True,
+            }
+
+        if endpoint == "validate_repository_id":
+            with self._lock:
+                is_valid = request_data["repository_id"] in self.repositories
+
+            return 200, {"repository_id_is_valid": is_valid}
+
+        if endpoint == "query_repository":
+            return 200, self._get_repository(request_data["repository_id"]).query(
+                request_data["query_string"], request_data["limit"]
+            )
+
+        if endpoint == "uninitialize_repository":
+            with self._lock:
+                self.repositories.pop(request_data["repository_id"], None)
+
+            return 200, None
+
+        return 404, None
+
+    @staticmethod
+    def _create_request_handler(server: "StandInServer") -> type:
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _respond(self, status_code: int, response_data: object) -> None:
+                response_body = json.dumps(response_data).encode("utf-8")
+                server._wait_for_transfer(len(response_body))
+
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response_body)))
+                self.end_headers()
+                self.wfile.write(response_body)
+
+            def _respond_with_stream(self, response_data: list) -> None:
+                """
+                Each item is sent as its own chunk so that the client
+                receives it as soon as it is written.
+                """
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                for item in response_data:
+                    line = json.dumps(item).encode("utf-8") + b"\n"
+                    server._wait_for_transfer(len(line))
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _handle_request(self) -> None:
+                endpoint = urlparse(self.path).path.strip("/")
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server._record_request(endpoint, len(body))
+                time.sleep(server.latency_seconds)
+                server._wait_for_transfer(len(body))
+
+                content_encoding = self.headers.get(
+                    "Content-Encoding", RequestBodyCompressor.IDENTITY
+                )
+
+                if content_encoding not in server.accepted_encodings:
+                    self._respond(415, None)
+                    return
+
+                try:
+                    status_code, response_data = server._handle(
+                        self.command,
+                        endpoint,
+                        self.headers,
+                        RequestBodyCompressor.decompress(body, content_encoding),
+                    )
+
+                except KeyError:
+                    status_code, response_data = 404, None
+
+                except ValueError:
+                    status_code, response_data = 400, None
+
+                if (
+                    endpoint == "query_repository"
+                    and status_code == 200
+                    and server.streams_queries
+                    and "application/x-ndjson" in self.headers.get("Accept", "")
+                ):
+                    self._respond_with_stream(response_data)
+                    return
+
+                self._respond(status_code, response_data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle_request
+
+        return RequestHandler
+
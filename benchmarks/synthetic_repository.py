@@ -0,0 +1,103 @@
+from pathlib import Path
+import math, random
+
+_SOURCE_LINES = [
+    "def handle_request(request):\n",
+    "    response = build_response(request.headers, request.body)\n",
+    "    if response.status_code >= 500:\n",
+    "        raise InternalServerError(response)\n",
+    "    return response\n",
+    "\n",
+    "class RepositoryManager:\n",
+    "    _FILE_NAME = 'repository.json'\n",
+]
+
+
+class SyntheticRepository:
+    """
+    Deterministic tree of Python source files for benchmarks. File
+    sizes follow a log-normal distribution around
+    [median_file_size_bytes], capped below the largest file size the
+    CLI uploads, and each file is placed [0, max_depth] directories
+    deep in a tree that branches [dir_fanout] ways per level.
+    """
+
+    MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024 - 1
+
+    @staticmethod
+    def get_source(rng: random.Random, size_bytes: int, name: str) -> str:
+        lines = []
+
+        while sum(map(len, lines)) < size_bytes:
+            lines.append(rng.choice(_SOURCE_LINES).replace("request", name))
+
+        return "".join(lines)[:size_bytes]
+
+    def __init__(
+        self,
+        path: Path,
+        num_files: int,
+        median_file_size_bytes: int = 8 * 1024,
+        file_size_sigma: float = 1.0,
+        max_depth: int = 4,
+        dir_fanout: int = 4,
+        seed: int = 0,
+    ):
+        self.path = path
+        self.num_files = num_files
+        self.median_file_size_bytes = median_file_size_bytes
+        self.file_size_sigma = file_size_sigma
+        self.max_depth = max_depth
+        self.dir_fanout = dir_fanout
+        self.file_paths: list[Path] = []
+        self._rng = random.Random(seed)
+        self._num_revisions = 0
+
+    def _get_file_size_bytes(self) -> int:
+        size_bytes = self._rng.lognormvariate(
+            math.log(self.median_file_size_bytes), self.file_size_sigma
+        )
+
+        return max(1, min(int(size_bytes), SyntheticRepository.MAX_FILE_SIZE_BYTES))
+
+    def _get_dir_path(self) -> Path:
+        dir_path = self.path
+
+        for _ in range(self._rng.randint(0, self.max_depth)):
+            dir_path /= f"package_{self._rng.randrange(self.dir_fanout)}"
+
+        return dir_path
+
+    def _write_file(self, file_path: Path, name: str) -> None:
+        file_path.write_text(
+            SyntheticRepository.get_source(self._rng, self._get_file_size_bytes(), name)
+        )
+
+    def create(self) -> "SyntheticRepository":
+        for i in range(self.num_files):
+            dir_path = self._get_dir_path()
+            dir_path.mkdir(parents=True, exist_ok=True)
+            file_path = dir_path / f"module_{i}.py"
+            self._write_file(file_path, f"request{i}")
+            self.file_paths.append(file_path)
+
+        return self
+
+    def churn(self, fraction: float) -> list[Path]:
+        """
+        Rewrites a [fraction] of the files, at least one, with new
+        content and returns their paths.
+        """
+        self._num_revisions += 1
+        changed_file_paths = self._rng.sample(
+            self.file_paths, max(1, round(len(self.file_paths) * fraction))
+        )
+
+        for file_path in changed_file_paths:
+            self._write_file(file_path, f"{file_path.stem}_{self._num_revisions}")
+
+        return changed_file_paths
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(file_path.stat().st_size for file_path in self.file_paths)
@@ -0,0 +1,93 @@
+"""
+Compares the JSON and binary upload formats, with and without request
+body compression, by initializing the same synthetic repository
+against a local StandInServer.
+
+    python -m benchmarks.upload_formats --num-files 200 --file-size-bytes 20000
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+import argparse, random, tempfile, time, tracemalloc
+
+from insight_cli.api import CreateRepositoryAPI, InitializeRepositoryAPI
+from insight_cli.api.base import Client
+from insight_cli.utils import File
+from insight_cli import config
+from .stand_in_server import StandInServer
+from .synthetic_repository import SyntheticRepository
+
+
+def create_files(dir_path: Path, num_files: int, file_size_bytes: int) -> list[File]:
+    rng = random.Random(0)
+    files = []
+
+    for i in range(num_files):
+        file_path = dir_path / f"module_{i}.py"
+        file_path.write_text(
+            SyntheticRepository.get_source(rng, file_size_bytes, f"request{i}")
+        )
+        files.append(File(file_path))
+
+    return files
+
+
+def run(upload_format: str, compression: bool, files: list[File]) -> dict:
+    with StandInServer() as server, patch.multiple(
+        config,
+        INSIGHT_API_BASE_URL=server.base_url,
+        INSIGHT_API_UPLOAD_FORMAT=upload_format,
+        INSIGHT_API_REQUEST_COMPRESSION=compression,
+    ):
+        Client._instance = None
+        repository_id = CreateRepositoryAPI.make_request()["repository_id"]
+
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        InitializeRepositoryAPI.make_request(repository_id, files)
+        elapsed_seconds = time.perf_counter() - start_time
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        Client._instance = None
+
+        uploaded_files = server.repositories[repository_id].files
+
+        if any(uploaded_files[str(file.path)] != file.content for file in files):
+            raise RuntimeError(f"{upload_format} upload was not received intact")
+
+        return {
+            "seconds": elapsed_seconds,
+            "wire_bytes": server.bytes_received["initialize_repository"],
+            "peak_memory_bytes": peak_memory_bytes,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--num-files", type=int, default=200)
+    parser.add_argument("--file-size-bytes", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = create_files(Path(temp_dir), args.num_files, args.file_size_bytes)
+        total_size_bytes = sum(file.size_bytes for file in files)
+
+        print(f"{len(files)} files, {total_size_bytes} bytes")
+        print(
+            f"{'format':<8}{'compression':<13}{'seconds':>9}{'wire bytes':>13}"
+            f"{'x source':>10}{'peak memory':>13}"
+        )
+
+        for upload_format in ("json", "binary"):
+            for compression in (False, True):
+                result = run(upload_format, compression, files)
+                print(
+                    f"{upload_format:<8}{str(compression):<13}"
+                    f"{result['seconds']:>9.3f}{result['wire_bytes']:>13}"
+                    f"{result['wire_bytes'] / total_size_bytes:>10.2f}"
+                    f"{result['peak_memory_bytes']:>13}"
+                )
+
+
+if __name__ == "__main__":
+    main()
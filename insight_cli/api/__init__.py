@@ -1,6 +1,19 @@
-from .create_repository_api import CreateRepositoryAPI
-from .initialize_repository_api import InitializeRepositoryAPI
-from .query_repository_api import QueryRepositoryAPI
-from .reinitialize_repository_api import ReinitializeRepositoryAPI
-from .uninitialize_repository_api import UninitializeRepositoryAPI
-from .validate_repository_id_api import ValidateRepositoryIdAPI
+from .create_repository_api import AsyncCreateRepositoryAPI, CreateRepositoryAPI
+from .initialize_repository_api import (
+    AsyncInitializeRepositoryAPI,
+    InitializeRepositoryAPI,
+)
+from .negotiate_blobs_api import AsyncNegotiateBlobsAPI, NegotiateBlobsAPI
+from .query_repository_api import AsyncQueryRepositoryAPI, QueryRepositoryAPI
+from .reinitialize_repository_api import (
+    AsyncReinitializeRepositoryAPI,
+    ReinitializeRepositoryAPI,
+)
+from .uninitialize_repository_api import (
+    AsyncUninitializeRepositoryAPI,
+    UninitializeRepositoryAPI,
+)
+from .validate_repository_id_api import (
+    AsyncValidateRepositoryIdAPI,
+    ValidateRepositoryIdAPI,
+)
@@ -1 +1,11 @@
 from .api import API
+from .async_api import AsyncAPI
+from .batch_api import BatchAPI
+from .batch_journal import BatchJournal, RecordingBatchJournal
+from .batch_scheduler import BatchScheduler
+from .client import Client
+from .deadline import Deadline, DeadlineExceededError
+from .retry_policy import RetryPolicy
+from .request_hedger import RequestHedger
+from .request_body_compressor import RequestBodyCompressor
+from .request_metrics import EndpointMetrics, OperationMetrics, RequestMetrics
@@ -1,8 +1,36 @@
 from abc import ABC, abstractmethod
 from typing import Any
+import functools, requests
+
+from .client import Client
+from .request_hedger import RequestHedger
+from .retry_policy import RetryPolicy
 
 
 class API(ABC):
+    @staticmethod
+    def _request(
+        method: str,
+        endpoint: str,
+        retry_policy: RetryPolicy | None = None,
+        hedger: RequestHedger | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Only requests that are safe to resend should be given a
+        [retry_policy] or a [hedger].
+        """
+        send = (
+            Client().request
+            if hedger is None
+            else functools.partial(hedger.call, Client().request)
+        )
+
+        if retry_policy is None:
+            return send(method, endpoint, **kwargs)
+
+        return retry_policy.call(send, method, endpoint, **kwargs)
+
     @abstractmethod
     def make_request(self, *args, **kwargs) -> Any:
         pass
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import Any
+import asyncio, functools, requests
+
+from .client import Client
+from .request_hedger import RequestHedger
+from .retry_policy import RetryPolicy
+
+
+class AsyncAPI(ABC):
+    """
+    Asyncio counterpart of API. Requests still go through the shared
+    Client session, run on the Client's worker threads, so that
+    several calls can be awaited together on one event loop.
+    """
+
+    @staticmethod
+    async def _send(method: str, endpoint: str, **kwargs) -> requests.Response:
+        return await asyncio.get_running_loop().run_in_executor(
+            Client().executor,
+            functools.partial(Client().request, method, endpoint, **kwargs),
+        )
+
+    @staticmethod
+    async def _request(
+        method: str,
+        endpoint: str,
+        retry_policy: RetryPolicy | None = None,
+        hedger: RequestHedger | None = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Only requests that are safe to resend should be given a
+        [retry_policy] or a [hedger].
+        """
+        send = (
+            AsyncAPI._send
+            if hedger is None
+            else functools.partial(hedger.call_async, Client().request)
+        )
+
+        if retry_policy is None:
+            return await send(method, endpoint, **kwargs)
+
+        return await retry_policy.call_async(send, method, endpoint, **kwargs)
+
+    @abstractmethod
+    async def make_request(self, *args, **kwargs) -> Any:
+        pass
@@ -0,0 +1,298 @@
+from abc import abstractmethod
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+import hashlib, json
+
+from insight_cli.utils import (
+    BatchFrameCodec,
+    BatchJsonEncoder,
+    Diagnostics,
+    File,
+    FileChunkRange,
+    Pipeline,
+    Tracer,
+)
+from insight_cli import config
+from .api import API
+from .batch_journal import BatchJournal
+from .batch_scheduler import BatchScheduler
+from .retry_policy import RetryPolicy
+
+
+class BatchAPI(API):
+    """
+    Uploads run as a staged pipeline: planned batches are read from
+    disk, encoded and sent, with a bounded queue between each stage
+    and at most config.INSIGHT_API_MAX_CONCURRENCY batches in flight
+    (see BatchScheduler). Peak memory therefore depends on the
+    concurrency and batch size rather than on the size of the
+    repository.
+    """
+
+    _MAX_BATCH_SIZE_BYTES = 3 * 1024**2
+    _PIPELINE_STAGE_SIZE = 1
+
+    @staticmethod
+    def _get_batch_id(
+        repository_id: str,
+        batch_index: int,
+        num_total_batches: int,
+        planned_batch: list[FileChunkRange],
+        changes: dict[str, str] | None = None,
+        file_references: dict[str, str] | None = None,
+        file_deltas: dict[str, dict] | None = None,
+    ) -> str:
+        """
+        The id is derived only from what the batch carries, so a
+        batch that is resent after a failure keeps its id and the
+        server can recognize it as a duplicate.
+        """
+        batch_description = json.dumps(
+            [
+                repository_id,
+                batch_index,
+                num_total_batches,
+                planned_batch,
+                changes,
+                file_references,
+                file_deltas,
+            ],
+            sort_keys=True,
+        )
+
+        return hashlib.sha256(batch_description.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _get_file_blob_hashes(files: list[File]) -> dict[str, str]:
+        """
+        Empty files are left out: they cost no more to upload than to
+        reference, so they are always uploaded rather than negotiated.
+        """
+        return {
+            str(file.path): file.blob_hash for file in files if file.size_bytes > 0
+        }
+
+    @staticmethod
+    def _deduplicate_files(
+        files: list[File],
+        file_blob_hashes: dict[str, str],
+        wanted_blob_hashes: set[str] | None,
+    ) -> tuple[list[File], dict[str, str]]:
+        """
+        Returns the files to upload and the blob hash each of the
+        other files references. A wanted blob is uploaded once, from
+        the first file holding it, and files without a blob hash are
+        always uploaded. Without [wanted_blob_hashes] the server cannot
+        resolve references, so every file is uploaded.
+        """
+        if wanted_blob_hashes is None:
+            return files, {}
+
+        files_to_upload, file_references = [], {}
+        uploaded_blob_hashes = set()
+
+        for file in files:
+            blob_hash = file_blob_hashes.get(str(file.path))
+
+            if blob_hash is None:
+                files_to_upload.append(file)
+
+            elif (
+                blob_hash in wanted_blob_hashes
+                and blob_hash not in uploaded_blob_hashes
+            ):
+                uploaded_blob_hashes.add(blob_hash)
+                files_to_upload.append(file)
+
+            else:
+                file_references[str(file.path)] = blob_hash
+
+        return files_to_upload, file_references
+
+    @staticmethod
+    def _read_batches(
+        planned_batches: Iterable[list[FileChunkRange]],
+    ) -> Iterator[list[tuple[FileChunkRange, memoryview]]]:
+        """
+        The file chunks of a batch are read straight into a single
+        buffer and handed on as views into it, so their content is
+        held once per batch and never copied before it is encoded.
+        """
+        for planned_batch in planned_batches:
+            buffer = memoryview(
+                bytearray(
+                    sum(
+                        chunk_range["end"] - chunk_range["start"]
+                        for chunk_range in planned_batch
+                    )
+                )
+            )
+            read_batch, offset = [], 0
+
+            with Tracer.span("read", size_bytes=len(buffer)):
+                for chunk_range in planned_batch:
+                    chunk_size_bytes = chunk_range["end"] - chunk_range["start"]
+                    file_content_chunk = buffer[offset : offset + chunk_size_bytes]
+                    file = File(Path(chunk_range["path"]))
+                    num_read_bytes = file.read_range_into(
+                        chunk_range["start"], file_content_chunk
+                    )
+                    read_batch.append(
+                        (chunk_range, file_content_chunk[:num_read_bytes])
+                    )
+                    offset += chunk_size_bytes
+
+            yield read_batch
+
+    @staticmethod
+    def _encode_batches(
+        read_batches: Iterable[list[tuple[FileChunkRange, memoryview]]],
+    ) -> Iterator[dict[str, dict]]:
+        """
+        Contents are left as raw bytes and only base64 encoded or
+        framed, depending on the upload format, when the request body
+        is built.
+        """
+        for read_batch in read_batches:
+            yield {
+                chunk_range["path"]: {
+                    "content": file_content_chunk,
+                    "size_bytes": len(file_content_chunk),
+                    "chunk_index": chunk_range["chunk_index"],
+                    "num_total_chunks": chunk_range["num_total_chunks"],
+                }
+                for chunk_range, file_content_chunk in read_batch
+            }
+
+    @staticmethod
+    def _get_request_body(
+        headers: dict[str, str],
+        batch_header: dict,
+        files: dict[str, dict],
+        changes: dict[str, str] | None = None,
+    ) -> dict:
+        """
+        Returns the headers and prebuilt body keyword arguments of a
+        batch request in the configured upload format.
+        """
+        upload_format = config.INSIGHT_API_UPLOAD_FORMAT
+        batch_header = {
+            **batch_header,
+            **({} if changes is None else {"changes": changes}),
+        }
+
+        with Tracer.span("encode", upload_format=upload_format):
+            if upload_format != "binary":
+                return {
+                    "headers": {
+                        **headers,
+                        "Content-Type": BatchJsonEncoder.CONTENT_TYPE,
+                    },
+                    "data": BatchJsonEncoder.encode(batch_header, files),
+                }
+
+            return {
+                "headers": {**headers, "Content-Type": BatchFrameCodec.CONTENT_TYPE},
+                "data": BatchFrameCodec.encode(
+                    batch_header,
+                    [
+                        (
+                            {
+                                "path": file_path,
+                                "chunk_index": file["chunk_index"],
+                                "num_total_chunks": file["num_total_chunks"],
+                                "change": (
+                                    "add" if changes is None else changes[file_path]
+                                ),
+                            },
+                            file["content"],
+                        )
+                        for file_path, file in files.items()
+                    ],
+                ),
+            }
+
+    @classmethod
+    def _stream_encoded_batches(
+        cls, planned_batches: list[list[FileChunkRange]]
+    ) -> Iterator[dict[str, dict]]:
+        read_batches = Pipeline.stage(
+            cls._read_batches(planned_batches), cls._PIPELINE_STAGE_SIZE
+        )
+
+        return Pipeline.stage(
+            cls._encode_batches(read_batches), cls._PIPELINE_STAGE_SIZE
+        )
+
+    @classmethod
+    def _prepare_batch_requests(
+        cls, request_batch_plans: list[dict], journal: BatchJournal | None = None
+    ) -> tuple[Iterator[dict], Callable[[dict], None]]:
+        """
+        Each request batch plan holds the metadata of a batch and the
+        file chunk ranges it carries under "planned_files". Batches
+        already acknowledged in [journal] are neither read nor sent.
+        """
+        if journal is not None:
+            journal.plan(
+                [
+                    request_batch_plan["batch_id"]
+                    for request_batch_plan in request_batch_plans
+                ]
+            )
+            request_batch_plans = [
+                request_batch_plan
+                for request_batch_plan in request_batch_plans
+                if not journal.is_acknowledged(request_batch_plan["batch_id"])
+            ]
+
+        encoded_batches = cls._stream_encoded_batches(
+            [
+                request_batch_plan["planned_files"]
+                for request_batch_plan in request_batch_plans
+            ]
+        )
+
+        request_batches = (
+            {
+                **{
+                    key: value
+                    for key, value in request_batch_plan.items()
+                    if key != "planned_files"
+                },
+                "files": encoded_batch,
+            }
+            for request_batch_plan, encoded_batch in zip(
+                request_batch_plans, encoded_batches
+            )
+        )
+
+        def make_batch_request(payload: dict) -> None:
+            cls._make_batch_request(payload)
+            Diagnostics.increment("batch_api.batches")
+
+            if journal is not None:
+                journal.acknowledge(payload["batch_id"])
+
+        return request_batches, make_batch_request
+
+    @classmethod
+    def _make_batch_requests(
+        cls, request_batch_plans: list[dict], journal: BatchJournal | None = None
+    ) -> None:
+        BatchScheduler().run(
+            *cls._prepare_batch_requests(request_batch_plans, journal), RetryPolicy()
+        )
+
+    @classmethod
+    async def _make_batch_requests_async(
+        cls, request_batch_plans: list[dict], journal: BatchJournal | None = None
+    ) -> None:
+        await BatchScheduler().run_async(
+            *cls._prepare_batch_requests(request_batch_plans, journal), RetryPolicy()
+        )
+
+    @staticmethod
+    @abstractmethod
+    def _make_batch_request(payload: dict) -> None:
+        pass
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+import threading
+
+
+class BatchJournal(ABC):
+    """
+    Records which batches of an upload were planned and which of
+    them the server acknowledged, so an interrupted upload can be
+    resumed by resending only the batches that were not acknowledged.
+    """
+
+    @abstractmethod
+    def plan(self, batch_ids: list[str]) -> None:
+        pass
+
+    @abstractmethod
+    def is_acknowledged(self, batch_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    def acknowledge(self, batch_id: str) -> None:
+        pass
+
+
+class RecordingBatchJournal(BatchJournal):
+    """
+    Remembers which batches were acknowledged, during this upload or,
+    according to [journal], before it, and passes every call on to
+    [journal] if there is one.
+    """
+
+    def __init__(self, journal: BatchJournal | None = None):
+        self._journal = journal
+        self._acknowledged_batch_ids: set[str] = set()
+        self._lock = threading.Lock()
+
+    def plan(self, batch_ids: list[str]) -> None:
+        if self._journal is not None:
+            self._journal.plan(batch_ids)
+
+    def is_acknowledged(self, batch_id: str) -> bool:
+        with self._lock:
+            if batch_id in self._acknowledged_batch_ids:
+                return True
+
+        return self._journal is not None and self._journal.is_acknowledged(batch_id)
+
+    def acknowledge(self, batch_id: str) -> None:
+        with self._lock:
+            self._acknowledged_batch_ids.add(batch_id)
+
+        if self._journal is not None:
+            self._journal.acknowledge(batch_id)
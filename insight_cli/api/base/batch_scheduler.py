@@ -0,0 +1,308 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Iterable, TypeVar
+import asyncio, heapq, itertools, requests, time
+
+from insight_cli.utils import Diagnostics
+from insight_cli import config
+from .client import Client
+from .retry_policy import RetryPolicy
+
+T = TypeVar("T")
+
+
+class BatchScheduler:
+    """
+    Runs batch requests with an adaptive number of requests in flight
+    (additive increase, multiplicative decrease). The concurrency
+    grows by about one per round of requests while batch latency
+    stays close to the fastest latency observed, and halves whenever
+    a request times out, fails to connect or is answered with a 429
+    or 5xx, never going above [max_concurrency].
+
+    When a RetryPolicy is given, failed batches it allows to retry
+    are resubmitted once their backoff delay has elapsed, without
+    holding a worker while they wait.
+
+    run blocks on its own thread pool while run_async awaits the same
+    scheduling on the running event loop.
+    """
+
+    _DECREASE_FACTOR = 0.5
+    _LATENCY_TOLERANCE = 1.5
+    _MIN_CONCURRENCY = 1
+
+    @staticmethod
+    def is_congestion_error(exception: BaseException) -> bool:
+        if isinstance(
+            exception,
+            (requests.exceptions.Timeout, requests.exceptions.ConnectionError),
+        ):
+            return True
+
+        if (
+            isinstance(exception, requests.exceptions.HTTPError)
+            and exception.response is not None
+        ):
+            status_code = exception.response.status_code
+            return status_code == 429 or status_code >= 500
+
+        return False
+
+    def __init__(
+        self,
+        max_concurrency: int = config.INSIGHT_API_MAX_CONCURRENCY,
+        initial_concurrency: int = config.INSIGHT_API_INITIAL_CONCURRENCY,
+    ):
+        if max_concurrency < BatchScheduler._MIN_CONCURRENCY:
+            raise ValueError(
+                f"max_concurrency must be at least {BatchScheduler._MIN_CONCURRENCY}"
+            )
+
+        self._max_concurrency: int = max_concurrency
+        self._concurrency: float = max(
+            BatchScheduler._MIN_CONCURRENCY, min(initial_concurrency, max_concurrency)
+        )
+        self._min_latency_seconds: float | None = None
+        self._last_decrease_time: float = float("-inf")
+        self._retry_counter = itertools.count()
+
+    @property
+    def concurrency(self) -> int:
+        return int(self._concurrency)
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    def _on_success(self, latency_seconds: float) -> None:
+        if (
+            self._min_latency_seconds is None
+            or latency_seconds < self._min_latency_seconds
+        ):
+            self._min_latency_seconds = latency_seconds
+
+        latency_is_flat = (
+            latency_seconds
+            <= self._min_latency_seconds * BatchScheduler._LATENCY_TOLERANCE
+        )
+
+        if latency_is_flat:
+            self._concurrency = min(
+                self._max_concurrency, self._concurrency + 1 / self._concurrency
+            )
+
+    def _on_congestion(self, start_time: float) -> None:
+        """
+        Requests that were already in flight when the concurrency was
+        last decreased report the same congestion event, so only
+        requests started after that decrease can decrease it again.
+        """
+        if start_time < self._last_decrease_time:
+            return
+
+        self._concurrency = max(
+            BatchScheduler._MIN_CONCURRENCY,
+            self._concurrency * BatchScheduler._DECREASE_FACTOR,
+        )
+        self._last_decrease_time = time.monotonic()
+
+    @staticmethod
+    def _timed(
+        make_batch_request: Callable[[T], None], batch: T
+    ) -> tuple[float, float, BaseException | None]:
+        start_time = time.monotonic()
+
+        try:
+            make_batch_request(batch)
+            return start_time, time.monotonic(), None
+
+        except Exception as e:
+            return start_time, time.monotonic(), e
+
+    @staticmethod
+    def _get_wait_timeout(
+        pending_retries: list[tuple[float, int, T, int]]
+    ) -> float | None:
+        if not pending_retries:
+            return None
+
+        return max(0.0, pending_retries[0][0] - time.monotonic())
+
+    def _pop_due_retry(
+        self, pending_retries: list[tuple[float, int, T, int]], num_in_flight: int
+    ) -> tuple[T, int] | None:
+        if (
+            pending_retries
+            and pending_retries[0][0] <= time.monotonic()
+            and num_in_flight < self.concurrency
+        ):
+            _, _, batch, attempt = heapq.heappop(pending_retries)
+            return batch, attempt
+
+        return None
+
+    def _handle_completed(
+        self,
+        future: Future | asyncio.Future,
+        batch: T,
+        attempt: int,
+        retry_policy: RetryPolicy | None,
+        pending_retries: list[tuple[float, int, T, int]],
+    ) -> None:
+        start_time, end_time, exception = future.result()
+
+        if exception is None:
+            self._on_success(end_time - start_time)
+            return
+
+        if BatchScheduler.is_congestion_error(exception):
+            self._on_congestion(start_time)
+
+        if retry_policy is not None and retry_policy.should_retry(attempt, exception):
+            retry_time = time.monotonic() + retry_policy.get_delay_seconds(
+                attempt, exception
+            )
+            heapq.heappush(
+                pending_retries,
+                (retry_time, next(self._retry_counter), batch, attempt + 1),
+            )
+            return
+
+        raise exception
+
+    def run(
+        self,
+        batches: Iterable[T],
+        make_batch_request: Callable[[T], None],
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        batches = iter(batches)
+        batches_are_exhausted = False
+        pending_retries: list[tuple[float, int, T, int]] = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+                in_flight: dict[Future, tuple[T, int]] = {}
+
+                def submit(batch: T, attempt: int) -> None:
+                    future = executor.submit(
+                        BatchScheduler._timed, make_batch_request, batch
+                    )
+                    in_flight[future] = (batch, attempt)
+
+                while True:
+                    while (
+                        due_retry := self._pop_due_retry(
+                            pending_retries, len(in_flight)
+                        )
+                    ) is not None:
+                        submit(*due_retry)
+
+                    while (
+                        not batches_are_exhausted
+                        and len(in_flight) < self.concurrency
+                    ):
+                        try:
+                            batch = next(batches)
+                        except StopIteration:
+                            batches_are_exhausted = True
+                            break
+
+                        submit(batch, 1)
+
+                    if not in_flight and not pending_retries:
+                        break
+
+                    timeout = BatchScheduler._get_wait_timeout(pending_retries)
+
+                    if not in_flight:
+                        time.sleep(timeout)
+                        continue
+
+                    done, _ = wait(
+                        in_flight, timeout=timeout, return_when=FIRST_COMPLETED
+                    )
+
+                    for future in done:
+                        batch, attempt = in_flight.pop(future)
+                        self._handle_completed(
+                            future, batch, attempt, retry_policy, pending_retries
+                        )
+
+        finally:
+            Diagnostics.record("batch_scheduler.concurrency", self.concurrency)
+
+    async def run_async(
+        self,
+        batches: Iterable[T],
+        make_batch_request: Callable[[T], None],
+        retry_policy: RetryPolicy | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """
+        Batch requests and the iteration of [batches] run on [executor]
+        (the Client's worker threads by default) so the event loop is
+        never blocked.
+        """
+        loop = asyncio.get_running_loop()
+        executor = executor or Client().executor
+        batches = iter(batches)
+        batches_are_exhausted = False
+        pending_retries: list[tuple[float, int, T, int]] = []
+        in_flight: dict[asyncio.Future, tuple[T, int]] = {}
+        exhausted = object()
+
+        def submit(batch: T, attempt: int) -> None:
+            future = loop.run_in_executor(
+                executor, BatchScheduler._timed, make_batch_request, batch
+            )
+            in_flight[future] = (batch, attempt)
+
+        try:
+            while True:
+                while (
+                    due_retry := self._pop_due_retry(pending_retries, len(in_flight))
+                ) is not None:
+                    submit(*due_retry)
+
+                while not batches_are_exhausted and len(in_flight) < self.concurrency:
+                    batch = await loop.run_in_executor(
+                        executor, next, batches, exhausted
+                    )
+
+                    if batch is exhausted:
+                        batches_are_exhausted = True
+                        break
+
+                    submit(batch, 1)
+
+                if not in_flight and not pending_retries:
+                    break
+
+                timeout = BatchScheduler._get_wait_timeout(pending_retries)
+
+                if not in_flight:
+                    await asyncio.sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    batch, attempt = in_flight.pop(future)
+                    self._handle_completed(
+                        future, batch, attempt, retry_policy, pending_retries
+                    )
+
+        finally:
+            if in_flight:
+                await asyncio.wait(in_flight)
+
+            Diagnostics.record("batch_scheduler.concurrency", self.concurrency)
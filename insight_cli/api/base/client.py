@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import json, requests, threading, time
+
+from insight_cli import config
+from insight_cli.utils import Tracer
+from .deadline import Deadline
+from .request_body_compressor import RequestBodyCompressor
+from .request_metrics import RequestMetrics
+
+
+class Client:
+    _instance: "Client | None" = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """
+        The __new__ method ensures a single Client per process. Every
+        API call goes through the same requests.Session so that
+        connections are kept alive and reused across calls and
+        upload batches instead of being opened once per request.
+        """
+        with cls._lock:
+            if cls._instance is None:
+                instance = super(Client, cls).__new__(cls)
+                instance._session = cls._create_session()
+                instance._request_body_compressor = RequestBodyCompressor()
+                instance._executor = None
+                cls._instance = instance
+
+        return cls._instance
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=config.INSIGHT_API_MAX_CONCURRENCY,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        session.headers.update(
+            {
+                "User-Agent": f"insight-cli/{config.INSIGHT_VERSION}",
+                "Accept": "application/json",
+            }
+        )
+
+        return session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Shared worker threads on which AsyncAPI runs requests, since
+        requests.Session is blocking. They are created on first use
+        and reused by every async request of the process.
+        """
+        with Client._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=config.INSIGHT_API_MAX_CONCURRENCY,
+                    thread_name_prefix="insight-api",
+                )
+
+            return self._executor
+
+    @staticmethod
+    def get_timeout(endpoint: str) -> tuple[float, float]:
+        return config.INSIGHT_API_TIMEOUTS.get(
+            endpoint, config.INSIGHT_API_DEFAULT_TIMEOUT
+        )
+
+    @staticmethod
+    def get_url(endpoint: str) -> str:
+        return f"{config.INSIGHT_API_BASE_URL}/{endpoint}"
+
+    @staticmethod
+    def _record_metrics(
+        endpoint: str, latency_seconds: float, response: requests.Response, stream: bool
+    ) -> None:
+        """
+        Bytes sent are those of the body as sent, after compression.
+        Bytes received are taken from the Content-Length header, or
+        from the content of a response that is not streamed.
+        """
+        if not RequestMetrics.is_started():
+            return
+
+        body = response.request.body if response.request is not None else None
+        content_length = response.headers.get("Content-Length")
+
+        if content_length is not None and content_length.isdigit():
+            bytes_received = int(content_length)
+        else:
+            bytes_received = 0 if stream else len(response.content)
+
+        RequestMetrics.record(
+            endpoint,
+            latency_seconds,
+            0 if body is None else len(body),
+            bytes_received,
+        )
+
+    def _request_with_compressed_body(
+        self, method: str, endpoint: str, **kwargs
+    ) -> requests.Response:
+        headers = dict(kwargs.pop("headers", {}))
+
+        if "json" in kwargs:
+            body = json.dumps(kwargs.pop("json")).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        else:
+            body = kwargs.pop("data")
+
+        while True:
+            compressed_body, encoding = self._request_body_compressor.compress(body)
+
+            if encoding != RequestBodyCompressor.IDENTITY:
+                headers["Content-Encoding"] = encoding
+            else:
+                headers.pop("Content-Encoding", None)
+
+            response = self._session.request(
+                method,
+                url=Client.get_url(endpoint),
+                headers=headers,
+                data=compressed_body,
+                **kwargs,
+            )
+
+            if (
+                response.status_code in RequestBodyCompressor.REJECTED_STATUS_CODES
+                and self._request_body_compressor.reject(encoding)
+            ):
+                continue
+
+            RequestBodyCompressor.record_compression(len(body), len(compressed_body))
+
+            return response
+
+    def request(
+        self, method: str, endpoint: str, compress: bool = False, **kwargs
+    ) -> requests.Response:
+        """
+        With [compress], the [json] or [data] body is sent compressed (see
+        RequestBodyCompressor). Responses are accepted compressed with
+        the Accept-Encoding that requests sends by default, and are
+        decompressed by requests. Timeouts are
+        capped by the active Deadline, if any.
+        """
+        kwargs["timeout"] = Deadline.cap_timeout(
+            endpoint, kwargs.get("timeout", Client.get_timeout(endpoint))
+        )
+
+        start_time = time.perf_counter()
+
+        try:
+            with Tracer.span(f"request {endpoint}", method=method):
+                if compress and ("json" in kwargs or "data" in kwargs):
+                    response = self._request_with_compressed_body(
+                        method, endpoint, **kwargs
+                    )
+                else:
+                    response = self._session.request(
+                        method, url=Client.get_url(endpoint), **kwargs
+                    )
+
+        except requests.exceptions.Timeout:
+            Deadline.check(endpoint)
+            raise
+
+        Client._record_metrics(
+            endpoint,
+            time.perf_counter() - start_time,
+            response,
+            kwargs.get("stream", False),
+        )
+
+        response.raise_for_status()
+
+        return response
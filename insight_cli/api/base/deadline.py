@@ -0,0 +1,84 @@
+import threading, time
+
+
+class DeadlineExceededError(Exception):
+    def __init__(self, stage: str, budget_seconds: float):
+        self.stage = stage
+        self.message = f"Ran out of the {budget_seconds:g}s time budget during {stage}"
+        super().__init__(self.message)
+
+
+class Deadline:
+    """
+    Overall time budget of a command, active while it is entered as a
+    context manager. Deadlines are process wide since one command runs
+    per process, so worker threads see the same deadline.
+
+    While a deadline is active, the connect and read timeouts of every
+    request are capped at the time remaining and no retry is delayed
+    past it. Each stage (a request endpoint or a local step such as a
+    directory scan) checks the deadline when it starts, and a stage
+    that starts or times out after the deadline has passed fails with
+    a DeadlineExceededError naming it.
+    """
+
+    _active: "Deadline | None" = None
+    _lock = threading.Lock()
+
+    def __init__(self, budget_seconds: float):
+        self._budget_seconds = budget_seconds
+        self._end_time: float = float("inf")
+        self._previous: Deadline | None = None
+
+    def __enter__(self) -> "Deadline":
+        with Deadline._lock:
+            self._end_time = time.monotonic() + self._budget_seconds
+            self._previous = Deadline._active
+            Deadline._active = self
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        with Deadline._lock:
+            Deadline._active = self._previous
+
+    @property
+    def remaining_seconds(self) -> float:
+        return max(0.0, self._end_time - time.monotonic())
+
+    @staticmethod
+    def get_remaining_seconds() -> float | None:
+        """
+        Returns None if no deadline is active.
+        """
+        deadline = Deadline._active
+
+        return None if deadline is None else deadline.remaining_seconds
+
+    @staticmethod
+    def check(stage: str) -> None:
+        deadline = Deadline._active
+
+        if deadline is not None and deadline.remaining_seconds <= 0:
+            raise DeadlineExceededError(stage, deadline._budget_seconds)
+
+    @staticmethod
+    def cap_timeout(
+        stage: str, timeout: float | tuple[float, float] | None
+    ) -> float | tuple[float, float] | None:
+        Deadline.check(stage)
+        remaining_seconds = Deadline.get_remaining_seconds()
+
+        if remaining_seconds is None:
+            return timeout
+
+        if timeout is None:
+            return remaining_seconds, remaining_seconds
+
+        if isinstance(timeout, tuple):
+            return tuple(
+                remaining_seconds if t is None else min(t, remaining_seconds)
+                for t in timeout
+            )
+
+        return min(timeout, remaining_seconds)
@@ -0,0 +1,119 @@
+import gzip, threading
+
+from insight_cli.utils import Diagnostics
+from insight_cli import config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class RequestBodyCompressor:
+    """
+    Compresses request bodies with the best Content-Encoding that both
+    the client and the server support, when enabled with
+    config.INSIGHT_API_REQUEST_COMPRESSION. zstd is preferred when the
+    optional zstandard package is installed, then gzip. A server that
+    answers 415 or 400 to a compressed body is taken not to support
+    its encoding, so the encoding is dropped and the body is resent
+    with the next one, down to sending it uncompressed.
+    """
+
+    IDENTITY = "identity"
+    REJECTED_STATUS_CODES = {400, 415}
+
+    @staticmethod
+    def get_supported_encodings() -> list[str]:
+        encodings = ["gzip", RequestBodyCompressor.IDENTITY]
+
+        if zstandard is not None:
+            encodings.insert(0, "zstd")
+
+        return encodings
+
+    @staticmethod
+    def decompress(body: bytes, encoding: str) -> bytes:
+        if encoding == "zstd":
+            return zstandard.ZstdDecompressor().decompress(body)
+
+        if encoding == "gzip":
+            return gzip.decompress(body)
+
+        return body
+
+    @staticmethod
+    def record_compression(
+        uncompressed_size_bytes: int, compressed_size_bytes: int
+    ) -> None:
+        Diagnostics.increment(
+            "request_compression.uncompressed_bytes", uncompressed_size_bytes
+        )
+        Diagnostics.increment(
+            "request_compression.compressed_bytes", compressed_size_bytes
+        )
+
+        total_compressed_size_bytes = Diagnostics.get(
+            "request_compression.compressed_bytes"
+        )
+
+        if total_compressed_size_bytes:
+            Diagnostics.record(
+                "request_compression.ratio",
+                Diagnostics.get("request_compression.uncompressed_bytes")
+                / total_compressed_size_bytes,
+            )
+
+    def __init__(
+        self,
+        gzip_level: int = config.INSIGHT_API_GZIP_LEVEL,
+        zstd_level: int = config.INSIGHT_API_ZSTD_LEVEL,
+    ):
+        self._gzip_level = gzip_level
+        self._zstd_level = zstd_level
+        self._encodings = (
+            RequestBodyCompressor.get_supported_encodings()
+            if config.INSIGHT_API_REQUEST_COMPRESSION
+            else [RequestBodyCompressor.IDENTITY]
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> str:
+        with self._lock:
+            return self._encodings[0]
+
+    def compress(self, body: bytes | bytearray) -> tuple[bytes | bytearray, str]:
+        """
+        An uncompressed body is returned as is rather than copied.
+        """
+        encoding = self.encoding
+
+        if encoding == "zstd":
+            compressed_body = zstandard.ZstdCompressor(level=self._zstd_level).compress(
+                body
+            )
+
+        elif encoding == "gzip":
+            compressed_body = gzip.compress(
+                body, compresslevel=self._gzip_level, mtime=0
+            )
+
+        else:
+            compressed_body = body
+
+        return compressed_body, encoding
+
+    def reject(self, encoding: str) -> bool:
+        """
+        Stops using [encoding] after the server refused it. Returns
+        whether the body should be resent with another encoding.
+        """
+        if encoding == RequestBodyCompressor.IDENTITY:
+            return False
+
+        with self._lock:
+            if encoding in self._encodings:
+                self._encodings.remove(encoding)
+
+        return True
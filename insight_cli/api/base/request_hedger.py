@@ -0,0 +1,248 @@
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, TypeVar
+import asyncio, bisect, functools, math, threading, time
+
+from insight_cli.utils import Diagnostics, LatencyHistogram
+from insight_cli import config
+from .client import Client
+
+T = TypeVar("T")
+
+
+class _UnneededRequestError(Exception):
+    pass
+
+
+class RequestHedger:
+    """
+    Sends a duplicate of a request that has not been answered within
+    the hedge delay of starting to run, on another of the Client's
+    pooled connections, and returns whichever answer arrives first.
+    A copy still waiting for a worker is cancelled. A copy already
+    sent cannot be, so its response is closed when it arrives. Only
+    requests that are safe to send twice should be hedged.
+
+    The hedge delay starts at [initial_delay_seconds] and, once
+    [min_num_samples] latencies have been observed, follows their
+    [percentile]. Without [initial_delay_seconds] no request is hedged
+    until then. Latencies observed by earlier processes can be loaded
+    with add_history. How often hedges are sent and how often they
+    win are counted in Diagnostics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_delay_seconds: float | None = config.INSIGHT_API_HEDGE_DELAY_SECONDS,
+        percentile: float = config.INSIGHT_API_HEDGE_PERCENTILE,
+        min_num_samples: int = 20,
+        max_num_samples: int = 1000,
+    ):
+        self._name = name
+        self._initial_delay_seconds = initial_delay_seconds
+        self._percentile = percentile
+        self._min_num_samples = min_num_samples
+        self._max_num_samples = max_num_samples
+        self._latencies_seconds: list[float] = []
+        self._lock = threading.Lock()
+
+    @property
+    def delay_seconds(self) -> float | None:
+        with self._lock:
+            if len(self._latencies_seconds) < self._min_num_samples:
+                return self._initial_delay_seconds
+
+            index = int(len(self._latencies_seconds) * self._percentile / 100)
+
+            return self._latencies_seconds[
+                min(index, len(self._latencies_seconds) - 1)
+            ]
+
+    def _record_latency(self, latency_seconds: float) -> None:
+        with self._lock:
+            if len(self._latencies_seconds) >= self._max_num_samples:
+                self._latencies_seconds.pop(
+                    min(
+                        bisect.bisect_left(self._latencies_seconds, latency_seconds),
+                        len(self._latencies_seconds) - 1,
+                    )
+                )
+
+            bisect.insort(self._latencies_seconds, latency_seconds)
+
+    def add_history(self, latency_histogram: LatencyHistogram) -> None:
+        """
+        Loads the latencies of [latency_histogram], evenly sampled down
+        to [max_num_samples], unless latencies have already been
+        observed.
+        """
+        latencies_seconds = latency_histogram.get_latencies_seconds()
+        step = max(1, math.ceil(len(latencies_seconds) / self._max_num_samples))
+
+        with self._lock:
+            if not self._latencies_seconds:
+                self._latencies_seconds = latencies_seconds[::step]
+
+    def _increment(self, counter_name: str) -> None:
+        Diagnostics.increment(f"request_hedger.{self._name}.{counter_name}")
+
+    @staticmethod
+    def _timed(
+        on_start: Callable[[], None],
+        is_answered: threading.Event,
+        func: Callable[..., T],
+        *args,
+        **kwargs,
+    ) -> tuple[float, T]:
+        """
+        Runs on a worker thread, so the latency returned with the
+        result leaves out the time the request waited for a worker. A
+        request that only gets a worker once another copy has been
+        answered is not sent.
+        """
+        if is_answered.is_set():
+            raise _UnneededRequestError()
+
+        on_start()
+        start_time = time.monotonic()
+        result = func(*args, **kwargs)
+        is_answered.set()
+
+        return time.monotonic() - start_time, result
+
+    @staticmethod
+    def _discard(future: Future | asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            _, result = future.result()
+
+            if hasattr(result, "close"):
+                result.close()
+
+    def _get_first_result(
+        self,
+        futures: list[Future | asyncio.Future],
+        completed_futures: list[Future | asyncio.Future],
+    ) -> tuple[bool, T | None]:
+        """
+        Returns whether one of [completed_futures] succeeded and, if
+        so, its result. The futures left behind are cancelled if they
+        have not started yet and discarded otherwise.
+        """
+        for future in futures:
+            if future not in completed_futures or future.exception() is not None:
+                continue
+
+            latency_seconds, result = future.result()
+            self._record_latency(latency_seconds)
+
+            if futures.index(future) > 0:
+                self._increment("hedge_wins")
+
+            for other_future in futures:
+                if other_future is not future and not other_future.cancel():
+                    other_future.add_done_callback(RequestHedger._discard)
+
+            return True, result
+
+        return False, None
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        The hedge delay is counted from when the request starts
+        running on one of the Client's workers rather than from when
+        it is queued for one.
+        """
+        executor = Client().executor
+        is_started, is_answered = threading.Event(), threading.Event()
+        futures = [
+            executor.submit(
+                RequestHedger._timed, is_started.set, is_answered, func, *args, **kwargs
+            )
+        ]
+        delay_seconds = self.delay_seconds
+
+        if delay_seconds is not None:
+            is_started.wait()
+
+        done, pending = wait(futures, timeout=delay_seconds)
+
+        if not done:
+            self._increment("hedges")
+            futures.append(
+                executor.submit(
+                    RequestHedger._timed,
+                    lambda: None,
+                    is_answered,
+                    func,
+                    *args,
+                    **kwargs,
+                )
+            )
+            pending = set(futures)
+
+        while True:
+            if done:
+                is_successful, result = self._get_first_result(futures, list(done))
+
+                if is_successful:
+                    return result
+
+            if not pending:
+                return futures[0].result()[1]
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    async def call_async(self, func: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        executor = Client().executor
+        is_started, is_answered = asyncio.Event(), threading.Event()
+        futures = [
+            loop.run_in_executor(
+                executor,
+                functools.partial(
+                    RequestHedger._timed,
+                    functools.partial(loop.call_soon_threadsafe, is_started.set),
+                    is_answered,
+                    func,
+                    *args,
+                    **kwargs,
+                ),
+            )
+        ]
+        delay_seconds = self.delay_seconds
+
+        if delay_seconds is not None:
+            await is_started.wait()
+
+        done, pending = await asyncio.wait(futures, timeout=delay_seconds)
+
+        if not done:
+            self._increment("hedges")
+            futures.append(
+                loop.run_in_executor(
+                    executor,
+                    functools.partial(
+                        RequestHedger._timed,
+                        lambda: None,
+                        is_answered,
+                        func,
+                        *args,
+                        **kwargs,
+                    ),
+                )
+            )
+            pending = set(futures)
+
+        while True:
+            if done:
+                is_successful, result = self._get_first_result(futures, list(done))
+
+                if is_successful:
+                    return result
+
+            if not pending:
+                return futures[0].result()[1]
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
@@ -0,0 +1,122 @@
+from typing import TypedDict
+import threading
+
+from insight_cli.utils import Diagnostics, LatencyHistogram
+
+
+class EndpointMetrics(TypedDict):
+    latency_histogram: dict[str, int]
+    num_requests: int
+    bytes_sent: int
+    bytes_received: int
+
+
+class OperationMetrics(TypedDict):
+    endpoints: dict[str, EndpointMetrics]
+    num_batches: int
+    num_retries: int
+    concurrency: int | None
+    compression_ratio: float | None
+    num_hedges: int
+    num_hedge_wins: int
+
+
+class RequestMetrics:
+    """
+    Process-wide collector of the latency and size of every request
+    the Client makes while an operation (e.g. a reinitialize) is
+    being measured, per endpoint, along with the number of batches
+    sent and retries made. Requests are only measured between start
+    and stop, which also reports what Diagnostics recorded in between:
+    the concurrency the batch scheduler settled on, the compression
+    ratio of the request bodies and how many requests were hedged.
+    """
+
+    _latency_histograms: dict[str, LatencyHistogram] | None = None
+    _endpoints: dict[str, EndpointMetrics] = {}
+    _start_diagnostics: dict[str, float] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def start() -> None:
+        with RequestMetrics._lock:
+            RequestMetrics._latency_histograms = {}
+            RequestMetrics._endpoints = {}
+            RequestMetrics._start_diagnostics = Diagnostics.snapshot()
+
+    @staticmethod
+    def stop() -> OperationMetrics:
+        with RequestMetrics._lock:
+            latency_histograms = RequestMetrics._latency_histograms or {}
+            endpoints = RequestMetrics._endpoints
+            RequestMetrics._latency_histograms = None
+            RequestMetrics._endpoints = {}
+
+        diagnostics = Diagnostics.snapshot()
+
+        def get_count(name: str) -> float:
+            return diagnostics.get(name, 0) - RequestMetrics._start_diagnostics.get(
+                name, 0
+            )
+
+        def get_hedger_count(counter_name: str) -> int:
+            return int(
+                sum(
+                    get_count(name)
+                    for name in diagnostics
+                    if name.startswith("request_hedger.")
+                    and name.endswith(f".{counter_name}")
+                )
+            )
+
+        for endpoint, latency_histogram in latency_histograms.items():
+            endpoints[endpoint]["latency_histogram"] = latency_histogram.to_dict()
+
+        num_batches = int(get_count("batch_api.batches"))
+        compressed_size_bytes = get_count("request_compression.compressed_bytes")
+
+        return {
+            "endpoints": endpoints,
+            "num_batches": num_batches,
+            "num_retries": int(get_count("retry_policy.retries")),
+            "concurrency": (
+                int(diagnostics["batch_scheduler.concurrency"])
+                if num_batches and "batch_scheduler.concurrency" in diagnostics
+                else None
+            ),
+            "compression_ratio": (
+                get_count("request_compression.uncompressed_bytes")
+                / compressed_size_bytes
+                if compressed_size_bytes
+                else None
+            ),
+            "num_hedges": get_hedger_count("hedges"),
+            "num_hedge_wins": get_hedger_count("hedge_wins"),
+        }
+
+    @staticmethod
+    def is_started() -> bool:
+        return RequestMetrics._latency_histograms is not None
+
+    @staticmethod
+    def record(
+        endpoint: str, latency_seconds: float, bytes_sent: int, bytes_received: int
+    ) -> None:
+        with RequestMetrics._lock:
+            if RequestMetrics._latency_histograms is None:
+                return
+
+            if endpoint not in RequestMetrics._latency_histograms:
+                RequestMetrics._latency_histograms[endpoint] = LatencyHistogram()
+                RequestMetrics._endpoints[endpoint] = {
+                    "latency_histogram": {},
+                    "num_requests": 0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                }
+
+            RequestMetrics._latency_histograms[endpoint].record(latency_seconds)
+            endpoint_metrics = RequestMetrics._endpoints[endpoint]
+            endpoint_metrics["num_requests"] += 1
+            endpoint_metrics["bytes_sent"] += bytes_sent
+            endpoint_metrics["bytes_received"] += bytes_received
@@ -0,0 +1,165 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, TypeVar
+import asyncio, random, requests, threading, time
+
+from insight_cli.utils import Diagnostics
+from insight_cli import config
+from .deadline import Deadline
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait
+    before retrying it. Only transient failures are retried: connection
+    errors, timeouts and 429/502/503/504 responses. Delays grow
+    exponentially with full jitter unless the server sent a
+    Retry-After header. A single policy is shared by every request of
+    one operation (e.g. all batches of an initialize), and the
+    operation as a whole may retry at most [retry_budget] times.
+    """
+
+    _RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+    @staticmethod
+    def is_retryable(exception: BaseException) -> bool:
+        if isinstance(
+            exception,
+            (requests.exceptions.Timeout, requests.exceptions.ConnectionError),
+        ):
+            return True
+
+        if isinstance(exception, requests.exceptions.HTTPError):
+            return (
+                exception.response is not None
+                and exception.response.status_code
+                in RetryPolicy._RETRYABLE_STATUS_CODES
+            )
+
+        return False
+
+    @staticmethod
+    def _get_retry_after_seconds(exception: BaseException) -> float | None:
+        response = getattr(exception, "response", None)
+
+        if response is None or response.status_code not in {429, 503}:
+            return None
+
+        retry_after = response.headers.get("Retry-After")
+
+        if retry_after is None:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+
+        except ValueError:
+            pass
+
+        try:
+            retry_after_time = parsedate_to_datetime(retry_after)
+
+        except (TypeError, ValueError):
+            return None
+
+        if retry_after_time.tzinfo is None:
+            retry_after_time = retry_after_time.replace(tzinfo=timezone.utc)
+
+        return max(0.0, (retry_after_time - datetime.now(timezone.utc)).total_seconds())
+
+    def __init__(
+        self,
+        max_attempts: int = config.INSIGHT_API_MAX_ATTEMPTS,
+        retry_budget: int = config.INSIGHT_API_RETRY_BUDGET,
+        base_delay_seconds: float = config.INSIGHT_API_RETRY_BASE_DELAY_SECONDS,
+        max_delay_seconds: float = config.INSIGHT_API_RETRY_MAX_DELAY_SECONDS,
+    ):
+        self._max_attempts = max_attempts
+        self._remaining_retry_budget = retry_budget
+        self._base_delay_seconds = base_delay_seconds
+        self._max_delay_seconds = max_delay_seconds
+        self._num_retries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining_retry_budget(self) -> int:
+        return self._remaining_retry_budget
+
+    @property
+    def num_retries(self) -> int:
+        return self._num_retries
+
+    def should_retry(self, attempt: int, exception: BaseException) -> bool:
+        """
+        Returns whether the request that failed on its [attempt]-th
+        attempt is retried. A positive answer consumes one unit of
+        the retry budget.
+        """
+        if attempt >= self._max_attempts or not RetryPolicy.is_retryable(exception):
+            return False
+
+        if Deadline.get_remaining_seconds() == 0:
+            return False
+
+        with self._lock:
+            if self._remaining_retry_budget <= 0:
+                return False
+
+            self._remaining_retry_budget -= 1
+            self._num_retries += 1
+
+        Diagnostics.increment("retry_policy.retries")
+
+        return True
+
+    def get_delay_seconds(self, attempt: int, exception: BaseException) -> float:
+        """
+        The delay never extends past the active Deadline, if any.
+        """
+        max_delay_seconds = self._max_delay_seconds
+        remaining_seconds = Deadline.get_remaining_seconds()
+
+        if remaining_seconds is not None:
+            max_delay_seconds = min(max_delay_seconds, remaining_seconds)
+
+        retry_after_seconds = RetryPolicy._get_retry_after_seconds(exception)
+
+        if retry_after_seconds is not None:
+            return min(retry_after_seconds, max_delay_seconds)
+
+        return random.uniform(
+            0,
+            min(max_delay_seconds, self._base_delay_seconds * 2 ** (attempt - 1)),
+        )
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        attempt = 1
+
+        while True:
+            try:
+                return func(*args, **kwargs)
+
+            except Exception as e:
+                if not self.should_retry(attempt, e):
+                    raise
+
+                time.sleep(self.get_delay_seconds(attempt, e))
+                attempt += 1
+
+    async def call_async(
+        self, func: Callable[..., Awaitable[T]], *args, **kwargs
+    ) -> T:
+        attempt = 1
+
+        while True:
+            try:
+                return await func(*args, **kwargs)
+
+            except Exception as e:
+                if not self.should_retry(attempt, e):
+                    raise
+
+                await asyncio.sleep(self.get_delay_seconds(attempt, e))
+                attempt += 1
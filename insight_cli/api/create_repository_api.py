@@ -1,14 +1,18 @@
-import requests
-
 from .base.api import API
-from insight_cli import config
+from .base.async_api import AsyncAPI
 
 
 class CreateRepositoryAPI(API):
     @staticmethod
     def make_request() -> dict:
-        response = requests.post(url=f"{config.INSIGHT_API_BASE_URL}/create_repository")
+        response = API._request("POST", "create_repository")
+
+        return response.json()
 
-        response.raise_for_status()
+
+class AsyncCreateRepositoryAPI(AsyncAPI):
+    @staticmethod
+    async def make_request() -> dict:
+        response = await AsyncAPI._request("POST", "create_repository")
 
         return response.json()
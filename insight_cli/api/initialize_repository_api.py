@@ -1,94 +1,148 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import copy, requests
+import asyncio
 
-from insight_cli.utils import FileChunkifier, ChunkedFileEncoder
-from .base.api import API
+from insight_cli.utils import BatchPlanner, File, FileChunkRange
 from insight_cli import config
+from .base.batch_api import BatchAPI
+from .base.batch_journal import BatchJournal
+from .base.api import API
+from .negotiate_blobs_api import AsyncNegotiateBlobsAPI, NegotiateBlobsAPI
 
 
-class InitializeRepositoryAPI(API):
-    @staticmethod
+class InitializeRepositoryAPI(BatchAPI):
+    @classmethod
     def _add_metadata_to_batches(
-        repository_id: str, batched_repository_files: list[dict]
+        cls,
+        repository_id: str,
+        planned_batches: list[list[FileChunkRange]],
+        file_references: dict[str, str] | None = None,
     ) -> list[dict]:
-        for i, batch in enumerate(batched_repository_files):
-            del batch["size_bytes"]
-            batch.update(
+        """
+        File references are sent with the last batch, which is added
+        if every file is referenced.
+        """
+        file_references = file_references or {}
+
+        if file_references and not planned_batches:
+            planned_batches = [[]]
+
+        request_batch_plans = []
+
+        for i, planned_batch in enumerate(planned_batches):
+            batch_file_references = (
+                file_references if i == len(planned_batches) - 1 else {}
+            )
+
+            request_batch_plans.append(
                 {
+                    "planned_files": planned_batch,
+                    "file_references": batch_file_references,
+                    "batch_id": cls._get_batch_id(
+                        repository_id,
+                        i,
+                        len(planned_batches),
+                        planned_batch,
+                        file_references=batch_file_references,
+                    ),
                     "batch_index": i,
-                    "num_total_batches": len(batched_repository_files),
+                    "num_total_batches": len(planned_batches),
                     "repository_id": repository_id,
                 }
             )
 
-        return batched_repository_files
+        return request_batch_plans
 
-    @staticmethod
+    @classmethod
     def _batch_repository_files(
-        repository_files: dict[str, bytes], max_batch_size_bytes: int = 3 * 1024**2
-    ) -> list[dict]:
-        batched_repository_files = []
-        empty_batch = {"files": {}, "size_bytes": 0}
-        current_batch = copy.deepcopy(empty_batch)
-
-        for file_path, file_content in repository_files.items():
-            file_content_chunks = FileChunkifier.chunkify_file_content(
-                file_content,
-                max_batch_size_bytes,
-                max_batch_size_bytes - current_batch["size_bytes"],
-            )
+        cls, repository_files: list[File], max_batch_size_bytes: int = 0
+    ) -> list[list[FileChunkRange]]:
+        return BatchPlanner.plan(
+            [(str(file.path), file.size_bytes) for file in repository_files],
+            max_batch_size_bytes or cls._MAX_BATCH_SIZE_BYTES,
+            config.INSIGHT_API_UPLOAD_FORMAT,
+        )
 
-            encoded_file_content_chunks_with_metadata = (
-                ChunkedFileEncoder.encode_with_metadata(file_content_chunks)
-            )
+    @staticmethod
+    def _make_batch_request(payload: dict) -> None:
+        API._request(
+            "POST",
+            "initialize_repository",
+            compress=True,
+            cookies={"repository_id": payload["repository_id"]},
+            **BatchAPI._get_request_body(
+                {"Idempotency-Key": payload["batch_id"]},
+                {
+                    "batch_index": payload["batch_index"],
+                    "num_total_batches": payload["num_total_batches"],
+                    "file_references": payload["file_references"],
+                },
+                payload["files"],
+            ),
+        )
 
-            for file_content_chunk in encoded_file_content_chunks_with_metadata:
-                if (
-                    current_batch["size_bytes"] + file_content_chunk["size_bytes"]
-                    > max_batch_size_bytes
-                ):
-                    batched_repository_files.append(current_batch)
-                    current_batch = copy.deepcopy(empty_batch)
+    @classmethod
+    def make_request(
+        cls,
+        repository_id: str,
+        repository_files: list[File],
+        journal: BatchJournal | None = None,
+    ) -> None:
+        if not repository_files:
+            return
 
-                current_batch["files"][file_path] = file_content_chunk
-                current_batch["size_bytes"] += file_content_chunk["size_bytes"]
+        file_blob_hashes = cls._get_file_blob_hashes(repository_files)
 
-        if current_batch != empty_batch:
-            batched_repository_files.append(current_batch)
+        negotiated_blobs = NegotiateBlobsAPI.make_request(
+            repository_id, set(file_blob_hashes.values())
+        )
 
-        return batched_repository_files
+        files_to_upload, file_references = cls._deduplicate_files(
+            repository_files,
+            file_blob_hashes,
+            (
+                None
+                if negotiated_blobs is None
+                else negotiated_blobs["wanted_blob_hashes"]
+            ),
+        )
 
-    @staticmethod
-    def _make_batch_request(payload: dict) -> None:
-        response = requests.post(
-            url=f"{config.INSIGHT_API_BASE_URL}/initialize_repository",
-            cookies={"repository_id": payload["repository_id"]},
-            json={
-                "files": payload["files"],
-                "batch_index": payload["batch_index"],
-                "num_total_batches": payload["num_total_batches"],
-            },
-            timeout=None,
+        request_batch_plans = cls._add_metadata_to_batches(
+            repository_id, cls._batch_repository_files(files_to_upload), file_references
         )
 
-        response.raise_for_status()
+        cls._make_batch_requests(request_batch_plans, journal)
 
+
+class AsyncInitializeRepositoryAPI(InitializeRepositoryAPI):
     @classmethod
-    def make_request(
-        cls, repository_id: str, repository_files: dict[str, bytes]
+    async def make_request(
+        cls,
+        repository_id: str,
+        repository_files: list[File],
+        journal: BatchJournal | None = None,
     ) -> None:
         if not repository_files:
             return
-        
-        repository_files_batches = cls._batch_repository_files(repository_files)
-        request_batches = cls._add_metadata_to_batches(
-            repository_id, repository_files_batches
+
+        file_blob_hashes = await asyncio.to_thread(
+            cls._get_file_blob_hashes, repository_files
+        )
+
+        negotiated_blobs = await AsyncNegotiateBlobsAPI.make_request(
+            repository_id, set(file_blob_hashes.values())
+        )
+
+        files_to_upload, file_references = cls._deduplicate_files(
+            repository_files,
+            file_blob_hashes,
+            (
+                None
+                if negotiated_blobs is None
+                else negotiated_blobs["wanted_blob_hashes"]
+            ),
+        )
+
+        request_batch_plans = cls._add_metadata_to_batches(
+            repository_id, cls._batch_repository_files(files_to_upload), file_references
         )
 
-        with ThreadPoolExecutor(max_workers=len(request_batches)) as executor:
-            futures = {
-                executor.submit(cls._make_batch_request, batch): batch
-                for batch in request_batches
-            }
-            for future in as_completed(futures):
-                future.result()
+        await cls._make_batch_requests_async(request_batch_plans, journal)
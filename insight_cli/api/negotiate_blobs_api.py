@@ -0,0 +1,86 @@
+from typing import TypedDict
+import requests
+
+from .base import API, AsyncAPI, RetryPolicy
+
+
+class NegotiatedBlobs(TypedDict):
+    wanted_blob_hashes: set[str]
+    supports_file_deltas: bool
+
+
+class NegotiateBlobsAPI(API):
+    """
+    Sends the hashes (see File.blob_hash) of the blobs an upload is
+    about to send and returns the ones the server does not hold yet,
+    along with whether it accepts updated files as deltas. Returns
+    None when the server does not support negotiation, in which case
+    every blob must be uploaded in full.
+    """
+
+    _UNSUPPORTED_STATUS_CODES = {404, 405, 501}
+
+    @staticmethod
+    def _is_unsupported(exception: requests.exceptions.HTTPError) -> bool:
+        return (
+            exception.response is not None
+            and exception.response.status_code
+            in NegotiateBlobsAPI._UNSUPPORTED_STATUS_CODES
+        )
+
+    @staticmethod
+    def _parse_response(response: requests.Response) -> NegotiatedBlobs:
+        response_data = response.json()
+
+        return {
+            "wanted_blob_hashes": set(response_data["wanted_blob_hashes"]),
+            "supports_file_deltas": response_data.get("supports_file_deltas") is True,
+        }
+
+    @staticmethod
+    def make_request(
+        repository_id: str, blob_hashes: set[str]
+    ) -> NegotiatedBlobs | None:
+        try:
+            response = API._request(
+                "POST",
+                "negotiate_blobs",
+                retry_policy=RetryPolicy(),
+                json={
+                    "repository_id": repository_id,
+                    "blob_hashes": sorted(blob_hashes),
+                },
+            )
+
+        except requests.exceptions.HTTPError as e:
+            if NegotiateBlobsAPI._is_unsupported(e):
+                return None
+
+            raise
+
+        return NegotiateBlobsAPI._parse_response(response)
+
+
+class AsyncNegotiateBlobsAPI(AsyncAPI):
+    @staticmethod
+    async def make_request(
+        repository_id: str, blob_hashes: set[str]
+    ) -> NegotiatedBlobs | None:
+        try:
+            response = await AsyncAPI._request(
+                "POST",
+                "negotiate_blobs",
+                retry_policy=RetryPolicy(),
+                json={
+                    "repository_id": repository_id,
+                    "blob_hashes": sorted(blob_hashes),
+                },
+            )
+
+        except requests.exceptions.HTTPError as e:
+            if NegotiateBlobsAPI._is_unsupported(e):
+                return None
+
+            raise
+
+        return NegotiateBlobsAPI._parse_response(response)
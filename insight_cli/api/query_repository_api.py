@@ -1,14 +1,38 @@
-import requests
+from typing import Iterator
+import json
 
-from .base.api import API
+from insight_cli.utils import LatencyHistogram
 from insight_cli import config
+from .base import API, AsyncAPI, RequestHedger, RetryPolicy
 
 
 class QueryRepositoryAPI(API):
+    _NDJSON_CONTENT_TYPE = "application/x-ndjson"
+    _hedger = RequestHedger("query_repository")
+
+    @staticmethod
+    def _get_hedger() -> RequestHedger | None:
+        """
+        Queries are hedged (see RequestHedger) unless
+        INSIGHT_API_HEDGE_QUERIES is off.
+        """
+        return QueryRepositoryAPI._hedger if config.INSIGHT_API_HEDGE_QUERIES else None
+
+    @staticmethod
+    def add_latency_history(latency_histogram: LatencyHistogram) -> None:
+        """
+        A process usually sends a single query, so the hedge delay is
+        derived from the query latencies of earlier processes.
+        """
+        QueryRepositoryAPI._hedger.add_history(latency_histogram)
+
     @staticmethod
     def make_request(repository_id: str, query_string: str, limit: int) -> list[dict] | None:
-        response = requests.get(
-            url=f"{config.INSIGHT_API_BASE_URL}/query_repository",
+        response = API._request(
+            "GET",
+            "query_repository",
+            retry_policy=RetryPolicy(),
+            hedger=QueryRepositoryAPI._get_hedger(),
             json={
                 "repository_id": repository_id,
                 "query_string": query_string,
@@ -16,6 +40,66 @@ class QueryRepositoryAPI(API):
             },
         )
 
-        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def stream_request(
+        repository_id: str, query_string: str, limit: int
+    ) -> Iterator[dict]:
+        """
+        Asks for the matches as newline delimited JSON and yields each
+        one as soon as its line arrives. Servers that answer with a
+        plain JSON array are read in full before their matches are
+        yielded.
+        """
+        response = API._request(
+            "GET",
+            "query_repository",
+            retry_policy=RetryPolicy(),
+            hedger=QueryRepositoryAPI._get_hedger(),
+            headers={
+                "Accept": f"{QueryRepositoryAPI._NDJSON_CONTENT_TYPE}, application/json"
+            },
+            stream=True,
+            json={
+                "repository_id": repository_id,
+                "query_string": query_string,
+                "limit": limit,
+            },
+        )
+
+        with response:
+            media_type = response.headers.get("Content-Type", "").split(";")[0]
+
+            if media_type.strip() != QueryRepositoryAPI._NDJSON_CONTENT_TYPE:
+                yield from response.json() or []
+                return
+
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+
+class AsyncQueryRepositoryAPI(AsyncAPI):
+    @staticmethod
+    async def make_request(
+        repository_id: str, query_string: str, limit: int, is_hedged: bool = True
+    ) -> list[dict] | None:
+        """
+        Queries that are already sent many at a time, as in a batch,
+        are sent with [is_hedged] off so that hedges do not add to
+        that load.
+        """
+        response = await AsyncAPI._request(
+            "GET",
+            "query_repository",
+            retry_policy=RetryPolicy(),
+            hedger=QueryRepositoryAPI._get_hedger() if is_hedged else None,
+            json={
+                "repository_id": repository_id,
+                "query_string": query_string,
+                "limit": limit,
+            },
+        )
 
         return response.json()
@@ -1,106 +1,472 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import copy, requests
+from typing import Callable, TypedDict
+import asyncio, base64, json, requests
 
-from insight_cli.utils import FileChunkifier, ChunkedFileEncoder
-from .base.api import API
+from insight_cli.utils import BatchPlanner, File, FileChunkRange, FileDelta
 from insight_cli import config
+from .base.batch_api import BatchAPI
+from .base.batch_journal import BatchJournal, RecordingBatchJournal
+from .base.api import API
+from .negotiate_blobs_api import (
+    AsyncNegotiateBlobsAPI,
+    NegotiateBlobsAPI,
+    NegotiatedBlobs,
+)
 
 
-class ReinitializeRepositoryAPI(API):
-    @staticmethod
+class PlannedFileChangesBatch(TypedDict):
+    files: list[FileChunkRange]
+    changes: dict[str, str]
+    file_references: dict[str, str]
+    file_deltas: dict[str, dict]
+
+
+class ReinitializeRepositoryAPI(BatchAPI):
+    """
+    When the server accepts deltas (see NegotiateBlobsAPI), updated
+    files whose last synced content is known (see [get_base_content]
+    of make_request) are sent as line edits of that content when the
+    edits are smaller than the file. Each delta carries the hash of
+    the content it applies to, and the server answers 412 if it holds
+    different content. On a 412, 400 or 422 the files sent as deltas
+    are resent in full along with the batches the server has not
+    acknowledged.
+    """
+
+    _BASE_REJECTED_STATUS_CODES = {400, 412, 422}
+
+    @classmethod
     def _add_metadata_to_batches(
-        batched_repository_file_changes: list[dict], repository_id: str
+        cls, planned_batches: list[PlannedFileChangesBatch], repository_id: str
     ) -> list[dict]:
-        for i, batch in enumerate(batched_repository_file_changes):
-            del batch["size_bytes"]
-            batch.update(
-                {
-                    "batch_index": i,
-                    "num_total_batches": len(batched_repository_file_changes),
-                    "repository_id": repository_id,
-                }
-            )
-
-        return batched_repository_file_changes
+        return [
+            {
+                "planned_files": planned_batch["files"],
+                "changes": planned_batch["changes"],
+                "file_references": planned_batch["file_references"],
+                "file_deltas": planned_batch["file_deltas"],
+                "batch_id": cls._get_batch_id(
+                    repository_id,
+                    i,
+                    len(planned_batches),
+                    planned_batch["files"],
+                    planned_batch["changes"],
+                    planned_batch["file_references"],
+                    planned_batch["file_deltas"],
+                ),
+                "batch_index": i,
+                "num_total_batches": len(planned_batches),
+                "repository_id": repository_id,
+            }
+            for i, planned_batch in enumerate(planned_batches)
+        ]
 
     @staticmethod
+    def _get_header_entry_size_bytes(
+        file_path: str, change: str, entry: str | dict | None = None
+    ) -> int:
+        """
+        Returns the size that [file_path] adds to the header of a batch
+        when it carries no file content: its change and, for a
+        referenced or delta file, its blob hash or delta.
+        """
+        size_bytes = len(json.dumps({file_path: change}))
+
+        if entry is not None:
+            size_bytes += len(json.dumps({file_path: entry}))
+
+        return size_bytes
+
+    @classmethod
     def _batch_repository_file_changes(
-        repository_file_changes: dict[str, list[tuple[str, bytes]]],
-        max_batch_size_bytes: int = 3 * 1024**2,
-    ) -> list[dict]:
-        batched_repository_file_changes = []
-        empty_batch = {"files": {}, "changes": {}, "size_bytes": 0}
-        current_batch = copy.deepcopy(empty_batch)
-
-        for change, files in repository_file_changes.items():
-            for file_path, file_content in files:
-                if change == "delete":
-                    current_batch["changes"][file_path] = change
-                    continue
-
-                file_content_chunks = FileChunkifier.chunkify_file_content(
-                    file_content,
-                    max_batch_size_bytes,
-                    max_batch_size_bytes - current_batch["size_bytes"],
-                )
+        cls,
+        repository_file_changes: dict[str, list[File]],
+        max_batch_size_bytes: int = 0,
+        file_references: dict[str, str] | None = None,
+        file_deltas: dict[str, dict] | None = None,
+    ) -> list[PlannedFileChangesBatch]:
+        """
+        Deletes, referenced files, file deltas and their changes are
+        counted at their encoded size and sent with the last batch
+        that has room for them, which is added if none has.
+        """
+        max_batch_size_bytes = max_batch_size_bytes or cls._MAX_BATCH_SIZE_BYTES
+        file_references = file_references or {}
+        file_deltas = file_deltas or {}
+
+        changed_files = [
+            (change, file)
+            for change, files in repository_file_changes.items()
+            if change != "delete"
+            for file in files
+        ]
+        uploaded_files = [
+            file
+            for _, file in changed_files
+            if str(file.path) not in file_references
+            and str(file.path) not in file_deltas
+        ]
+        file_path_to_change = {
+            str(file.path): change for change, file in changed_files
+        }
+
+        planned_batches: list[PlannedFileChangesBatch] = [
+            {
+                "files": planned_batch,
+                "changes": {
+                    chunk_range["path"]: file_path_to_change[chunk_range["path"]]
+                    for chunk_range in planned_batch
+                },
+                "file_references": {},
+                "file_deltas": {},
+            }
+            for planned_batch in BatchPlanner.plan(
+                [(str(file.path), file.size_bytes) for file in uploaded_files],
+                max_batch_size_bytes,
+                config.INSIGHT_API_UPLOAD_FORMAT,
+            )
+        ]
+        batch_sizes_bytes = [
+            BatchPlanner.get_batch_size_bytes(
+                planned_batch["files"], config.INSIGHT_API_UPLOAD_FORMAT
+            )
+            for planned_batch in planned_batches
+        ]
+
+        header_entries = [
+            *(
+                (file_path, file_path_to_change[file_path], "file_references", entry)
+                for file_path, entry in file_references.items()
+            ),
+            *(
+                (file_path, file_path_to_change[file_path], "file_deltas", entry)
+                for file_path, entry in file_deltas.items()
+            ),
+            *(
+                (str(file.path), "delete", None, None)
+                for file in repository_file_changes.get("delete", [])
+            ),
+        ]
+
+        for file_path, change, key, entry in header_entries:
+            entry_size_bytes = cls._get_header_entry_size_bytes(
+                file_path, change, entry
+            )
+
+            for i in reversed(range(len(planned_batches))):
+                if batch_sizes_bytes[i] + entry_size_bytes <= max_batch_size_bytes:
+                    break
 
-                encoded_file_content_chunks_with_metadata = (
-                    ChunkedFileEncoder.encode_with_metadata(file_content_chunks)
+            else:
+                i = len(planned_batches)
+                planned_batches.append(
+                    {
+                        "files": [],
+                        "changes": {},
+                        "file_references": {},
+                        "file_deltas": {},
+                    }
                 )
+                batch_sizes_bytes.append(BatchPlanner.get_batch_size_bytes([]))
+
+            planned_batches[i]["changes"][file_path] = change
+            batch_sizes_bytes[i] += entry_size_bytes
 
-                for file_content_chunk in encoded_file_content_chunks_with_metadata:
-                    if (
-                        current_batch["size_bytes"] + file_content_chunk["size_bytes"]
-                        > max_batch_size_bytes
-                    ):
-                        batched_repository_file_changes.append(current_batch)
-                        current_batch = copy.deepcopy(empty_batch)
+            if key is not None:
+                planned_batches[i][key][file_path] = entry
 
-                    current_batch["files"][file_path] = file_content_chunk
-                    current_batch["changes"][file_path] = change
-                    current_batch["size_bytes"] += file_content_chunk["size_bytes"]
+        return planned_batches
+
+    @classmethod
+    def _get_changed_files(
+        cls, repository_file_changes: dict[str, list[File]]
+    ) -> list[File]:
+        return [
+            file
+            for change, files in repository_file_changes.items()
+            if change != "delete"
+            for file in files
+        ]
+
+    @classmethod
+    def _create_file_deltas(
+        cls,
+        updated_files: list[File],
+        file_blob_hashes: dict[str, str],
+        get_base_content: Callable[[str], bytes | None],
+    ) -> dict[str, dict]:
+        """
+        A delta is only used when its edits are smaller than the file,
+        and only if it fits in a batch of its own once encoded.
+        """
+        file_deltas = {}
+        max_delta_size_bytes = cls._MAX_BATCH_SIZE_BYTES - (
+            BatchPlanner.get_batch_size_bytes([])
+        )
 
-        if current_batch != empty_batch:
-            batched_repository_file_changes.append(current_batch)
+        for file in updated_files:
+            base_content = get_base_content(str(file.path))
 
-        return batched_repository_file_changes
+            if base_content is None:
+                continue
+
+            content = file.content
+            line_edits = FileDelta.create(base_content, content)
+
+            if FileDelta.get_size_bytes(line_edits) >= len(content):
+                continue
+
+            file_delta = {
+                "base_blob_hash": File.get_blob_hash(base_content),
+                "blob_hash": file_blob_hashes[str(file.path)],
+                "edits": [
+                    {
+                        "start_line": line_edit["start_line"],
+                        "end_line": line_edit["end_line"],
+                        "content": base64.b64encode(line_edit["content"]).decode(
+                            "utf-8"
+                        ),
+                    }
+                    for line_edit in line_edits
+                ],
+            }
+
+            if (
+                cls._get_header_entry_size_bytes(str(file.path), "update", file_delta)
+                <= max_delta_size_bytes
+            ):
+                file_deltas[str(file.path)] = file_delta
+
+        return file_deltas
+
+    @classmethod
+    def _plan_request_batches(
+        cls,
+        repository_id: str,
+        repository_file_changes: dict[str, list[File]],
+        file_blob_hashes: dict[str, str],
+        negotiated_blobs: NegotiatedBlobs | None,
+        get_base_content: Callable[[str], bytes | None] | None,
+    ) -> list[dict]:
+        """
+        Deltas are only created if the server has said it accepts
+        them.
+        """
+        if negotiated_blobs is None or not negotiated_blobs["supports_file_deltas"]:
+            get_base_content = None
+
+        files_to_upload, file_references = cls._deduplicate_files(
+            cls._get_changed_files(repository_file_changes),
+            file_blob_hashes,
+            (
+                None
+                if negotiated_blobs is None
+                else negotiated_blobs["wanted_blob_hashes"]
+            ),
+        )
+        updated_file_paths = {
+            str(file.path) for file in repository_file_changes.get("update", [])
+        }
+
+        file_deltas = (
+            {}
+            if get_base_content is None
+            else cls._create_file_deltas(
+                [
+                    file
+                    for file in files_to_upload
+                    if str(file.path) in updated_file_paths
+                ],
+                file_blob_hashes,
+                get_base_content,
+            )
+        )
+
+        return cls._add_metadata_to_batches(
+            cls._batch_repository_file_changes(
+                repository_file_changes,
+                file_references=file_references,
+                file_deltas=file_deltas,
+            ),
+            repository_id,
+        )
+
+    @classmethod
+    def _plan_base_rejected_request_batches(
+        cls,
+        repository_id: str,
+        repository_file_changes: dict[str, list[File]],
+        request_batch_plans: list[dict],
+        journal: BatchJournal,
+    ) -> list[dict]:
+        """
+        A batch with rejected deltas is not applied at all, so every
+        batch that [journal] does not hold as acknowledged is planned
+        again without its deltas, and the files they were for are
+        planned as full content.
+        """
+        delta_file_paths = {
+            file_path
+            for request_batch_plan in request_batch_plans
+            for file_path in request_batch_plan["file_deltas"]
+        }
+
+        planned_batches: list[PlannedFileChangesBatch] = [
+            {
+                "files": request_batch_plan["planned_files"],
+                "changes": {
+                    file_path: change
+                    for file_path, change in request_batch_plan["changes"].items()
+                    if file_path not in delta_file_paths
+                },
+                "file_references": request_batch_plan["file_references"],
+                "file_deltas": {},
+            }
+            for request_batch_plan in request_batch_plans
+            if not journal.is_acknowledged(request_batch_plan["batch_id"])
+        ]
+        planned_batches = [
+            planned_batch
+            for planned_batch in planned_batches
+            if planned_batch["files"] or planned_batch["changes"]
+        ]
+        planned_batches += cls._batch_repository_file_changes(
+            {
+                "update": [
+                    file
+                    for file in repository_file_changes.get("update", [])
+                    if str(file.path) in delta_file_paths
+                ]
+            }
+        )
+
+        return cls._add_metadata_to_batches(planned_batches, repository_id)
+
+    @classmethod
+    def _is_base_rejected(
+        cls, exception: requests.exceptions.HTTPError, request_batch_plans: list[dict]
+    ) -> bool:
+        return (
+            exception.response is not None
+            and exception.response.status_code in cls._BASE_REJECTED_STATUS_CODES
+            and any(
+                request_batch_plan["file_deltas"]
+                for request_batch_plan in request_batch_plans
+            )
+        )
 
     @staticmethod
     def _make_batch_request(
         payload: dict[str, dict[str, bytes] | dict[str, str] | str]
     ) -> None:
-        response = requests.put(
-            url=f"{config.INSIGHT_API_BASE_URL}/reinitialize_repository",
-            json={
-                "repository_id": payload["repository_id"],
-                "files": payload["files"],
-                "changes": payload["changes"],
-                "batch_index": payload["batch_index"],
-                "num_total_batches": payload["num_total_batches"],
-            },
-            timeout=None,
+        API._request(
+            "PUT",
+            "reinitialize_repository",
+            compress=True,
+            **BatchAPI._get_request_body(
+                {"Idempotency-Key": payload["batch_id"]},
+                {
+                    "repository_id": payload["repository_id"],
+                    "batch_index": payload["batch_index"],
+                    "num_total_batches": payload["num_total_batches"],
+                    "file_references": payload["file_references"],
+                    "file_deltas": payload["file_deltas"],
+                },
+                payload["files"],
+                payload["changes"],
+            ),
         )
 
-        response.raise_for_status()
-
     @classmethod
     def make_request(
         cls,
         repository_id: str,
-        repository_file_changes: dict[str, list[tuple[str, bytes]]],
+        repository_file_changes: dict[str, list[File]],
+        journal: BatchJournal | None = None,
+        get_base_content: Callable[[str], bytes | None] | None = None,
     ) -> None:
-        repository_file_changes_batches = cls._batch_repository_file_changes(
-            repository_file_changes
+        changed_files = cls._get_changed_files(repository_file_changes)
+        file_blob_hashes = cls._get_file_blob_hashes(changed_files)
+        negotiated_blobs = (
+            NegotiateBlobsAPI.make_request(
+                repository_id, set(file_blob_hashes.values())
+            )
+            if changed_files
+            else None
         )
 
-        request_batches = cls._add_metadata_to_batches(
-            repository_file_changes_batches, repository_id
+        request_batch_plans = cls._plan_request_batches(
+            repository_id,
+            repository_file_changes,
+            file_blob_hashes,
+            negotiated_blobs,
+            get_base_content,
         )
 
-        with ThreadPoolExecutor(max_workers=len(request_batches)) as executor:
-            futures = {
-                executor.submit(cls._make_batch_request, batch): batch
-                for batch in request_batches
-            }
-            for future in as_completed(futures):
-                future.result()
+        recording_journal = RecordingBatchJournal(journal)
+
+        try:
+            cls._make_batch_requests(request_batch_plans, recording_journal)
+
+        except requests.exceptions.HTTPError as e:
+            if not cls._is_base_rejected(e, request_batch_plans):
+                raise
+
+            cls._make_batch_requests(
+                cls._plan_base_rejected_request_batches(
+                    repository_id,
+                    repository_file_changes,
+                    request_batch_plans,
+                    recording_journal,
+                ),
+                journal,
+            )
+
+
+class AsyncReinitializeRepositoryAPI(ReinitializeRepositoryAPI):
+    @classmethod
+    async def make_request(
+        cls,
+        repository_id: str,
+        repository_file_changes: dict[str, list[File]],
+        journal: BatchJournal | None = None,
+        get_base_content: Callable[[str], bytes | None] | None = None,
+    ) -> None:
+        changed_files = cls._get_changed_files(repository_file_changes)
+        file_blob_hashes = await asyncio.to_thread(
+            cls._get_file_blob_hashes, changed_files
+        )
+        negotiated_blobs = (
+            await AsyncNegotiateBlobsAPI.make_request(
+                repository_id, set(file_blob_hashes.values())
+            )
+            if changed_files
+            else None
+        )
+
+        request_batch_plans = await asyncio.to_thread(
+            cls._plan_request_batches,
+            repository_id,
+            repository_file_changes,
+            file_blob_hashes,
+            negotiated_blobs,
+            get_base_content,
+        )
+
+        recording_journal = RecordingBatchJournal(journal)
+
+        try:
+            await cls._make_batch_requests_async(request_batch_plans, recording_journal)
+
+        except requests.exceptions.HTTPError as e:
+            if not cls._is_base_rejected(e, request_batch_plans):
+                raise
+
+            await cls._make_batch_requests_async(
+                cls._plan_base_rejected_request_batches(
+                    repository_id,
+                    repository_file_changes,
+                    request_batch_plans,
+                    recording_journal,
+                ),
+                journal,
+            )
@@ -1,16 +1,55 @@
 import requests
 
-from .base import API
-from insight_cli import config
+from .base import API, AsyncAPI, RetryPolicy
 
 
 class UninitializeRepositoryAPI(API):
+    """
+    The DELETE is retried, so a retry whose earlier attempt deleted the
+    repository but lost its response gets a 404. A 404 after a retry
+    is therefore taken as the repository having been deleted.
+    """
+
     @staticmethod
-    def make_request(repository_id: str) -> None:
-        response = requests.delete(
-            url=f"{config.INSIGHT_API_BASE_URL}/uninitialize_repository",
-            json={"repository_id": repository_id},
-            timeout=None,
+    def _is_already_deleted(
+        exception: requests.exceptions.HTTPError, retry_policy: RetryPolicy
+    ) -> bool:
+        return (
+            exception.response is not None
+            and exception.response.status_code == 404
+            and retry_policy.num_retries > 0
         )
 
-        response.raise_for_status()
+    @staticmethod
+    def make_request(repository_id: str) -> None:
+        retry_policy = RetryPolicy()
+
+        try:
+            API._request(
+                "DELETE",
+                "uninitialize_repository",
+                retry_policy=retry_policy,
+                json={"repository_id": repository_id},
+            )
+
+        except requests.exceptions.HTTPError as e:
+            if not UninitializeRepositoryAPI._is_already_deleted(e, retry_policy):
+                raise
+
+
+class AsyncUninitializeRepositoryAPI(AsyncAPI):
+    @staticmethod
+    async def make_request(repository_id: str) -> None:
+        retry_policy = RetryPolicy()
+
+        try:
+            await AsyncAPI._request(
+                "DELETE",
+                "uninitialize_repository",
+                retry_policy=retry_policy,
+                json={"repository_id": repository_id},
+            )
+
+        except requests.exceptions.HTTPError as e:
+            if not UninitializeRepositoryAPI._is_already_deleted(e, retry_policy):
+                raise
@@ -1,17 +1,27 @@
-import requests
-
-from .base.api import API
-from insight_cli import config
+from .base import API, AsyncAPI, RetryPolicy
 
 
 class ValidateRepositoryIdAPI(API):
     @staticmethod
     def make_request(repository_id: str) -> dict[str, bool]:
-        response = requests.post(
-            url=f"{config.INSIGHT_API_BASE_URL}/validate_repository_id",
+        response = API._request(
+            "POST",
+            "validate_repository_id",
+            retry_policy=RetryPolicy(),
             json={"repository_id": repository_id},
         )
 
-        response.raise_for_status()
+        return response.json()
+
+
+class AsyncValidateRepositoryIdAPI(AsyncAPI):
+    @staticmethod
+    async def make_request(repository_id: str) -> dict[str, bool]:
+        response = await AsyncAPI._request(
+            "POST",
+            "validate_repository_id",
+            retry_policy=RetryPolicy(),
+            json={"repository_id": repository_id},
+        )
 
         return response.json()
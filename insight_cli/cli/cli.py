@@ -1,7 +1,10 @@
 from typing import Callable, TypedDict
-import argparse
+import argparse, contextlib, sys
 
+from insight_cli.api.base import Deadline, DeadlineExceededError
 from insight_cli.commands import Command
+from insight_cli.utils import Color, Profiler
+from insight_cli import config
 
 
 class ParsedCommand(TypedDict):
@@ -116,8 +119,22 @@ class CLI:
             ),
         )
         self._add_commands(commands)
+        self._parser.add_argument(
+            "--profile",
+            nargs="?",
+            const=Profiler.DEFAULT_PATH_PREFIX,
+            default=argparse.SUPPRESS,
+            metavar="<path prefix>",
+            help="writes a Chrome trace and a cProfile profile of the invoked commands to <path prefix>.trace.json and <path prefix>.pstats and prints the slowest phases",
+        )
 
     def _add_commands(self, commands: list[Command]) -> None:
+        """
+        Parsed arguments are stored under the command name, as spelled
+        in its flag, rather than under the argparse default (which
+        turns "batch-query" into "batch_query"), so that they match
+        [_parsed_commands] and the time budgets in config.
+        """
         sorted_parsed_commands: list[ParsedCommand] = sorted(
             [CLI._parse_command(command) for command in commands],
             key=lambda parsed_command: parsed_command["name"],
@@ -125,7 +142,9 @@ class CLI:
 
         for parsed_command in sorted_parsed_commands:
             self._parser.add_argument(
-                *parsed_command["flag_strings"], **parsed_command["options"]
+                *parsed_command["flag_strings"],
+                dest=parsed_command["name"],
+                **parsed_command["options"],
             )
             self._parsed_commands[parsed_command["name"]] = parsed_command
 
@@ -133,13 +152,45 @@ class CLI:
         self._arguments: argparse.Namespace = self._parser.parse_args()
 
     def execute_invoked_commands(self) -> None:
-        for command_name, command_args in vars(self._arguments).items():
-            command_is_not_invoked = command_args is None
-            if command_is_not_invoked:
-                continue
+        arguments = dict(vars(self._arguments))
+        profile_path_prefix = arguments.pop("profile", None)
+
+        with (
+            contextlib.nullcontext()
+            if profile_path_prefix is None
+            else Profiler(profile_path_prefix)
+        ):
+            for command_name, command_args in arguments.items():
+                command_is_not_invoked = command_args is None
+                if command_is_not_invoked:
+                    continue
+
+                parsed_command = self._parsed_commands[command_name]
+                command = parsed_command["command"]
+                command_executor_args = parsed_command["get_executor_args"](
+                    command_args
+                )
+
+                CLI._execute_within_time_budget(
+                    command, command_executor_args, parsed_command["name"]
+                )
+
+    @staticmethod
+    def _execute_within_time_budget(
+        command: Command, command_executor_args: list, command_name: str
+    ) -> None:
+        """
+        A command that runs out of its time budget exits with status 1
+        after reporting the stage it was in.
+        """
+        time_budget_seconds = config.INSIGHT_COMMAND_TIME_BUDGETS_SECONDS.get(
+            command_name, config.INSIGHT_COMMAND_DEFAULT_TIME_BUDGET_SECONDS
+        )
 
-            parsed_command = self._parsed_commands[command_name]
-            command = parsed_command["command"]
-            command_executor_args = parsed_command["get_executor_args"](command_args)
+        try:
+            with Deadline(time_budget_seconds):
+                command.execute(*command_executor_args)
 
-            command.execute(*command_executor_args)
+        except DeadlineExceededError as e:
+            print(Color.red(e), file=sys.stderr)
+            sys.exit(1)
@@ -1,6 +1,8 @@
 from .base import Command
+from .batch_query_command import BatchQueryCommand
 from .initialize_command import InitializeCommand
 from .query_command import QueryCommand
+from .stats_command import StatsCommand
 from .status_command import StatusCommand
 from .uninitialize_command import UninitializeCommand
 from .version_command import VersionCommand
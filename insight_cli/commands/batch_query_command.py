@@ -0,0 +1,101 @@
+from pathlib import Path
+import asyncio, json, requests, sys
+
+from .base.command import Command
+from insight_cli.repository import Repository, FileSizeExceededError, InvalidRepositoryError
+from insight_cli.utils import Color, Tracer
+
+
+class BatchQueryCommand(Command):
+    _STDIN_PATH = "-"
+
+    @staticmethod
+    def _parse_queries(lines: list[str], limit: int) -> list[tuple[str, int]]:
+        """
+        Each non-empty line is either a JSON object with a "query" and
+        an optional "limit", a JSON string or the query itself.
+        """
+        queries = []
+
+        for line in lines:
+            if not line.strip():
+                continue
+
+            try:
+                query = json.loads(line)
+            except json.JSONDecodeError:
+                query = line.strip()
+
+            if isinstance(query, dict):
+                queries.append((str(query["query"]), int(query.get("limit", limit))))
+            elif isinstance(query, str):
+                queries.append((query, limit))
+            else:
+                queries.append((line.strip(), limit))
+
+        return queries
+
+    @staticmethod
+    def _read_lines(queries_path: str) -> list[str]:
+        if queries_path == BatchQueryCommand._STDIN_PATH:
+            return sys.stdin.read().splitlines()
+
+        with open(queries_path, "r") as file:
+            return file.read().splitlines()
+
+    @staticmethod
+    async def _print_results(
+        repository: Repository, queries: list[tuple[str, int]]
+    ) -> None:
+        """
+        Results are printed as NDJSON in the order the queries finish.
+        """
+        async for i, matches in repository.query_batch_async(queries):
+            with Tracer.span("render", index=i):
+                print(
+                    json.dumps(
+                        {"index": i, "query": queries[i][0], "matches": matches or []}
+                    ),
+                    flush=True,
+                )
+
+    def __init__(self):
+        super().__init__(
+            flags=["-b", "--batch-query"],
+            description="runs every query in the given file (one per line or JSON lines, - for stdin) against the current insight repository and prints the matches of each as JSON lines",
+        )
+
+    def execute(self, queries_path: str, limit: int) -> None:
+        if limit <= 0:
+            print(Color.red("Limit must be a positive integer"))
+            return
+
+        try:
+            queries = self._parse_queries(self._read_lines(queries_path), limit)
+
+        except OSError as e:
+            print(Color.red(e))
+            return
+
+        except (KeyError, TypeError, ValueError):
+            print(Color.red(f"{queries_path} contains an invalid query"))
+            return
+
+        if any(query_limit <= 0 for _, query_limit in queries):
+            print(Color.red("Limit must be a positive integer"))
+            return
+
+        try:
+            asyncio.run(self._print_results(Repository(Path("")), queries))
+
+        except FileSizeExceededError as e:
+            print(Color.red(e))
+
+        except InvalidRepositoryError as e:
+            print(Color.red(e))
+
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 500:
+                print(Color.red("Internal server error. Try again later or try uninitializing then initializing the current directory as an insight repository."))
+            else:
+                raise
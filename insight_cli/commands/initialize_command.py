@@ -11,6 +11,21 @@ from insight_cli.utils import Color
 
 
 class InitializeCommand(Command):
+    @staticmethod
+    def _reinitialize(repository: Repository) -> bool:
+        """
+        Returns False if the server no longer knows the repository,
+        which a cached validation cannot tell, so that it is
+        initialized again.
+        """
+        try:
+            repository.reinitialize()
+
+        except InvalidRepositoryError:
+            return False
+
+        return True
+
     def __init__(self):
         super().__init__(
             flags=["-i", "--initialize"],
@@ -21,8 +36,7 @@ class InitializeCommand(Command):
         try:
             repository = Repository(Path(""))
 
-            if repository.is_valid:
-                repository.reinitialize()
+            if repository.is_valid and self._reinitialize(repository):
                 terminal_output = f"Reinitialized existing insight repository in {repository.path.resolve()}"
 
             else:
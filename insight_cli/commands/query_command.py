@@ -1,21 +1,23 @@
 from pathlib import Path
+from typing import Iterable
 import requests
 
 from .base.command import Command
 from insight_cli.repository import Repository, FileSizeExceededError, InvalidRepositoryError
-from insight_cli.utils import Color
+from insight_cli.utils import Color, Tracer
 
 
 class QueryCommand(Command):
     @staticmethod
-    def _print_matches(matches) -> None:
-        if matches is None:
-            print(Color.red("No matches found"))
-            
-            return
-            
-        for i, match in enumerate(matches):
-            is_first_match = i == 0
+    def _print_matches(matches: Iterable[dict] | None) -> None:
+        """
+        Each match is printed as soon as [matches] yields it.
+        """
+        num_matches = 0
+
+        for match in matches or []:
+            is_first_match = num_matches == 0
+            num_matches += 1
 
             terminal_output = "" if is_first_match else "\n"
 
@@ -29,7 +31,11 @@ class QueryCommand(Command):
             else:
                 terminal_output += f"Line {match['start_line']} - {match['end_line']}:\n{Color.green(match['content'])}"
 
-            print(terminal_output)
+            with Tracer.span("render"):
+                print(terminal_output, flush=True)
+
+        if num_matches == 0:
+            print(Color.red("No matches found"))
 
     def __init__(self):
         super().__init__(
@@ -44,7 +50,7 @@ class QueryCommand(Command):
             
         try:
             repository = Repository(Path(""))
-            matches = repository.query(query_string, limit)
+            matches = repository.query_stream(query_string, limit)
             self._print_matches(matches)
             
         except FileSizeExceededError as e:
@@ -0,0 +1,124 @@
+from datetime import datetime
+from pathlib import Path
+
+from .base.command import Command
+from insight_cli.repository import OperationRecord, Repository
+from insight_cli.utils import Color, LatencyHistogram
+
+
+class StatsCommand(Command):
+    _PERCENTILES = [50, 90, 99]
+    _SYNC_OPERATIONS = {"initialize", "reinitialize"}
+    _NUM_SYNCS = 10
+
+    @staticmethod
+    def _get_latency_lines(
+        title: str, latency_histograms: dict[str, LatencyHistogram]
+    ) -> list[str]:
+        lines = [
+            f"{title:<32}{'count':>7}"
+            + "".join(
+                f"{f'p{percentile} ms':>11}" for percentile in StatsCommand._PERCENTILES
+            )
+        ]
+
+        for name, latency_histogram in sorted(latency_histograms.items()):
+            lines.append(
+                f"{name[:31]:<32}{latency_histogram.num_samples:>7}"
+                + "".join(
+                    f"{latency_histogram.get_percentile(percentile) * 1000:>11.1f}"
+                    for percentile in StatsCommand._PERCENTILES
+                )
+            )
+
+        return lines
+
+    @staticmethod
+    def _get_sync_lines(records: list[OperationRecord]) -> list[str]:
+        """
+        Throughput is the bytes sent per second of the whole sync,
+        scan and diff included. The concurrency is the one the upload
+        settled on and the ratio is the compression ratio of the
+        request bodies; records made before either was measured show
+        "-".
+        """
+        lines = [
+            f"{'sync':<34}{'batches':>8}{'retries':>8}{'conc':>6}{'MB sent':>9}"
+            f"{'ratio':>7}{'seconds':>9}{'MB/s':>8}"
+        ]
+
+        for record in records[-StatsCommand._NUM_SYNCS :]:
+            mb_sent = (
+                sum(
+                    endpoint_metrics["bytes_sent"]
+                    for endpoint_metrics in record["endpoints"].values()
+                )
+                / 1024**2
+            )
+            start_time = datetime.fromtimestamp(record["start_time"])
+            name = f"{start_time:%Y-%m-%d %H:%M:%S} {record['operation']}"
+            concurrency = record.get("concurrency")
+            compression_ratio = record.get("compression_ratio")
+            lines.append(
+                f"{name[:33]:<34}{record['num_batches']:>8}{record['num_retries']:>8}"
+                f"{'-' if concurrency is None else concurrency:>6}{mb_sent:>9.2f}"
+                f"{'-' if compression_ratio is None else f'{compression_ratio:.2f}':>7}"
+                f"{record['duration_seconds']:>9.2f}"
+                f"{mb_sent / max(record['duration_seconds'], 1e-9):>8.2f}"
+            )
+
+        return lines
+
+    @staticmethod
+    def _get_hedge_lines(records: list[OperationRecord]) -> list[str]:
+        num_hedges = sum(record.get("num_hedges", 0) for record in records)
+
+        if not num_hedges:
+            return []
+
+        num_hedge_wins = sum(record.get("num_hedge_wins", 0) for record in records)
+
+        return [
+            "",
+            f"{'hedged requests':<32}{num_hedges:>7}",
+            f"{'answered first by the hedge':<32}{num_hedge_wins:>7}",
+        ]
+
+    def __init__(self):
+        super().__init__(
+            flags=["--stats"],
+            description="displays the latency percentiles of the recent operations and requests, the hedged requests and the throughput, concurrency and compression ratio of the recent syncs of the insight repository in the current directory",
+        )
+
+    def execute(self) -> None:
+        repository = Repository(Path(""))
+        metrics_log = repository.metrics_log
+
+        if not metrics_log.records:
+            print(
+                Color.red(
+                    f"No operations have been recorded for {repository.path.resolve()}"
+                )
+            )
+            return
+
+        lines = [
+            *StatsCommand._get_latency_lines(
+                "operation", metrics_log.get_operation_latency_histograms()
+            ),
+            "",
+            *StatsCommand._get_latency_lines(
+                "endpoint", metrics_log.get_endpoint_latency_histograms()
+            ),
+            *StatsCommand._get_hedge_lines(metrics_log.records),
+        ]
+        sync_records = [
+            record
+            for record in metrics_log.records
+            if record["operation"] in StatsCommand._SYNC_OPERATIONS
+        ]
+
+        if sync_records:
+            lines += ["", *StatsCommand._get_sync_lines(sync_records)]
+
+        print("\n".join(lines))
@@ -1,2 +1,40 @@
 INSIGHT_VERSION = "0.6.2"
 INSIGHT_API_BASE_URL = "http://5.161.224.41:81"
+INSIGHT_API_MAX_CONCURRENCY = 8
+INSIGHT_API_INITIAL_CONCURRENCY = 2
+INSIGHT_API_MAX_ATTEMPTS = 5
+INSIGHT_API_RETRY_BUDGET = 20
+INSIGHT_API_RETRY_BASE_DELAY_SECONDS = 0.5
+INSIGHT_API_RETRY_MAX_DELAY_SECONDS = 30
+INSIGHT_API_UPLOAD_FORMAT = "json"
+INSIGHT_API_HEDGE_QUERIES = True
+INSIGHT_API_HEDGE_DELAY_SECONDS = None
+INSIGHT_API_HEDGE_PERCENTILE = 90
+INSIGHT_API_REQUEST_COMPRESSION = False
+INSIGHT_API_GZIP_LEVEL = 6
+INSIGHT_API_ZSTD_LEVEL = 3
+INSIGHT_QUERY_CACHE_MAX_SIZE_BYTES = 4 * 1024**2
+INSIGHT_SNAPSHOTS_MAX_SIZE_BYTES = 32 * 1024**2
+INSIGHT_METRICS_MAX_NUM_RECORDS = 256
+INSIGHT_SCAN_NUM_WORKERS = None
+INSIGHT_REPOSITORY_ID_VALIDATION_TTL_SECONDS = 24 * 60 * 60
+INSIGHT_COMMAND_DEFAULT_TIME_BUDGET_SECONDS = 600
+INSIGHT_COMMAND_TIME_BUDGETS_SECONDS = {
+    "batch-query": 3600,
+    "initialize": 3600,
+    "query": 600,
+    "stats": 60,
+    "status": 60,
+    "uninitialize": 300,
+    "version": 60,
+}
+INSIGHT_API_DEFAULT_TIMEOUT = (5, 60)
+INSIGHT_API_TIMEOUTS = {
+    "create_repository": (5, 30),
+    "initialize_repository": (5, 300),
+    "negotiate_blobs": (5, 60),
+    "query_repository": (5, 120),
+    "reinitialize_repository": (5, 300),
+    "uninitialize_repository": (5, 120),
+    "validate_repository_id": (5, 30),
+}
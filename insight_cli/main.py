@@ -1,7 +1,9 @@
 from insight_cli.cli import CLI
 from insight_cli.commands import (
+    BatchQueryCommand,
     InitializeCommand,
     QueryCommand,
+    StatsCommand,
     StatusCommand,
     UninitializeCommand,
     VersionCommand,
@@ -11,8 +13,10 @@ from insight_cli.commands import (
 def main() -> None:
     cli = CLI(
         commands=[
+            BatchQueryCommand(),
             InitializeCommand(),
             QueryCommand(),
+            StatsCommand(),
             StatusCommand(),
             UninitializeCommand(),
             VersionCommand(),
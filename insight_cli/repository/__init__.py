@@ -1 +1,2 @@
+from .metrics_log import MetricsLog, OperationRecord
 from .repository import Repository, FileSizeExceededError, InvalidRepositoryError
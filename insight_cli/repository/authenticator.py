@@ -1,8 +1,9 @@
 from pathlib import Path
 from typing import TypedDict
-import json
+import json, os, time
 
-from insight_cli.api import ValidateRepositoryIdAPI
+from insight_cli.api import AsyncValidateRepositoryIdAPI, ValidateRepositoryIdAPI
+from insight_cli import config
 
 
 class AuthenticatorData(TypedDict):
@@ -10,7 +11,17 @@ class AuthenticatorData(TypedDict):
 
 
 class Authenticator:
+    """
+    A successful validation of the repository id is cached in
+    validation.json for [validation_ttl_seconds], so most commands
+    need no validation request. Once it has expired, the repository
+    id is validated again by the command that next needs it. A
+    repository id found invalid, by a validation or any other request
+    (see invalidate), is never served from the cache.
+    """
+
     _FILE_NAME = "authenticator.json"
+    _VALIDATION_FILE_NAME = "validation.json"
 
     @staticmethod
     def _is_authenticator_data_instance(data):
@@ -23,8 +34,14 @@ class Authenticator:
             )
         )
 
-    def __init__(self, parent_dir_path: Path):
+    def __init__(
+        self,
+        parent_dir_path: Path,
+        validation_ttl_seconds: float = config.INSIGHT_REPOSITORY_ID_VALIDATION_TTL_SECONDS,
+    ):
         self._path = parent_dir_path / Authenticator._FILE_NAME
+        self._validation_path = parent_dir_path / Authenticator._VALIDATION_FILE_NAME
+        self._validation_ttl_seconds = validation_ttl_seconds
 
     def create_file(self, data: AuthenticatorData) -> None:
         if not Authenticator._is_authenticator_data_instance(data):
@@ -47,11 +64,78 @@ class Authenticator:
 
         return data
 
+    def _get_validation_age_seconds(self, repository_id: str) -> float | None:
+        try:
+            with open(self._validation_path, "r") as file:
+                validation = json.load(file)
+
+            if validation["repository_id"] != repository_id:
+                return None
+
+            return time.time() - validation["validated_time"]
+
+        except (FileNotFoundError, KeyError, TypeError, ValueError):
+            return None
+
+    def _record_validation(self, repository_id: str, is_valid: bool) -> None:
+        if not is_valid:
+            self.invalidate()
+            return
+
+        with open(self._validation_path, "w") as file:
+            file.write(
+                json.dumps(
+                    {"repository_id": repository_id, "validated_time": time.time()}
+                )
+            )
+
+    def _is_validation_cached(self, repository_id: str) -> bool:
+        validation_age_seconds = self._get_validation_age_seconds(repository_id)
+
+        return (
+            validation_age_seconds is not None
+            and 0 <= validation_age_seconds < self._validation_ttl_seconds
+        )
+
+    def invalidate(self) -> None:
+        if self._validation_path.is_file():
+            os.remove(self._validation_path)
+
     @property
     def is_valid(self) -> bool:
         try:
+            repository_id = self.data["repository_id"]
+
+            if self._is_validation_cached(repository_id):
+                return True
+
             response_data: dict[str, bool] = ValidateRepositoryIdAPI.make_request(
-                self.data["repository_id"]
+                repository_id
+            )
+            self._record_validation(
+                repository_id, response_data["repository_id_is_valid"]
+            )
+
+            return response_data["repository_id_is_valid"]
+
+        except ValueError:
+            return False
+
+        except FileNotFoundError:
+            return False
+
+    async def is_valid_async(self) -> bool:
+        try:
+            repository_id = self.data["repository_id"]
+
+            if self._is_validation_cached(repository_id):
+                return True
+
+            response_data: dict[str, bool] = (
+                await AsyncValidateRepositoryIdAPI.make_request(repository_id)
+            )
+            self._record_validation(
+                repository_id, response_data["repository_id_is_valid"]
             )
 
             return response_data["repository_id_is_valid"]
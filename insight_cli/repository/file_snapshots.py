@@ -0,0 +1,126 @@
+from collections import Counter
+from pathlib import Path
+import json, os, zlib
+
+from insight_cli.utils import File
+from insight_cli import config
+
+
+class FileSnapshots:
+    """
+    Compressed copies of the contents, as of the last sync, of the
+    files added or updated by a reinitialize, which their next update
+    is diffed against (see FileDelta). Files that have not changed
+    since the repository was initialized have no copy, as most never
+    change. Copies are stored once per blob hash, so identical files
+    share one copy, and the copies of the files saved longest ago are
+    dropped once the copies take more than [max_size_bytes].
+    """
+
+    _DIR_NAME = "snapshots"
+    _INDEX_FILE_NAME = "index.json"
+
+    def __init__(
+        self,
+        parent_dir_path: Path,
+        max_size_bytes: int = config.INSIGHT_SNAPSHOTS_MAX_SIZE_BYTES,
+    ):
+        self._dir_path = parent_dir_path / FileSnapshots._DIR_NAME
+        self._index_path = self._dir_path / FileSnapshots._INDEX_FILE_NAME
+        self._max_size_bytes = max_size_bytes
+        self._index: dict[str, str] = self._read_index()
+
+    def _read_index(self) -> dict[str, str]:
+        if not self._index_path.is_file():
+            return {}
+
+        with open(self._index_path, "r") as file:
+            return json.load(file)
+
+    def _write_index(self) -> None:
+        with open(self._index_path, "w") as file:
+            file.write(json.dumps(self._index))
+
+    def _get_snapshot_path(self, blob_hash: str) -> Path:
+        return self._dir_path / blob_hash
+
+    def _save(self, file_paths: list[Path]) -> None:
+        for file_path in file_paths:
+            content = File(file_path).content
+            blob_hash = File.get_blob_hash(content)
+            snapshot_path = self._get_snapshot_path(blob_hash)
+
+            if not snapshot_path.is_file():
+                snapshot_path.write_bytes(zlib.compress(content))
+
+            self._index.pop(str(file_path), None)
+            self._index[str(file_path)] = blob_hash
+
+    def _drop_oldest_snapshots(self) -> None:
+        """
+        The index is ordered from the file saved longest ago to the
+        one saved last.
+        """
+        snapshot_sizes_bytes = {}
+
+        for blob_hash in set(self._index.values()):
+            try:
+                snapshot_sizes_bytes[blob_hash] = os.path.getsize(
+                    self._get_snapshot_path(blob_hash)
+                )
+            except FileNotFoundError:
+                snapshot_sizes_bytes[blob_hash] = 0
+
+        blob_hash_counts = Counter(self._index.values())
+        size_bytes = sum(snapshot_sizes_bytes.values())
+
+        for file_path, blob_hash in list(self._index.items()):
+            if size_bytes <= self._max_size_bytes:
+                break
+
+            del self._index[file_path]
+            blob_hash_counts[blob_hash] -= 1
+
+            if blob_hash_counts[blob_hash] == 0:
+                size_bytes -= snapshot_sizes_bytes[blob_hash]
+
+    def _delete_unreferenced_snapshots(self) -> None:
+        referenced_blob_hashes = set(self._index.values())
+
+        for entry in os.scandir(self._dir_path):
+            if (
+                entry.name != FileSnapshots._INDEX_FILE_NAME
+                and entry.name not in referenced_blob_hashes
+            ):
+                os.remove(entry.path)
+
+    def create(self) -> None:
+        os.makedirs(self._dir_path, exist_ok=True)
+        self._index = {}
+        self._delete_unreferenced_snapshots()
+        self._write_index()
+
+    def change_file_paths(
+        self, paths_to_save: list[Path], paths_to_delete: list[Path]
+    ) -> None:
+        os.makedirs(self._dir_path, exist_ok=True)
+        self._save(paths_to_save)
+
+        for file_path in paths_to_delete:
+            self._index.pop(str(file_path), None)
+
+        self._drop_oldest_snapshots()
+        self._delete_unreferenced_snapshots()
+        self._write_index()
+
+    def get_content(self, file_path: str) -> bytes | None:
+        blob_hash = self._index.get(str(file_path))
+
+        if blob_hash is None:
+            return None
+
+        try:
+            return zlib.decompress(self._get_snapshot_path(blob_hash).read_bytes())
+
+        except (FileNotFoundError, zlib.error):
+            return None
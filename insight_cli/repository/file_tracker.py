@@ -29,29 +29,51 @@ class FileTracker:
         with open(self._file_path, "r") as file:
             return json.load(file)
 
-    def _add_file_paths_to_data(self, file_paths: list[Path]) -> None:
+    @staticmethod
+    def _get_modified_time(
+        file_path: Path, file_modified_times: dict[Path, datetime] | None
+    ) -> float:
+        """
+        Modified times the caller already scanned are used as they
+        are, without checking or stat'ing the file again.
+        """
+        if file_modified_times is not None and file_path in file_modified_times:
+            return file_modified_times[file_path].timestamp()
+
+        if not file_path.is_file():
+            raise FileNotFoundError(f"cannot find file at {file_path}")
+
+        return os.path.getmtime(file_path)
+
+    def _add_file_paths_to_data(
+        self,
+        file_paths: list[Path],
+        file_modified_times: dict[Path, datetime] | None = None,
+    ) -> None:
         for file_path in file_paths:
-            if not file_path.is_file():
-                raise FileNotFoundError(f"cannot find file at {file_path}")
-
             if str(file_path) in self._data:
                 raise ValueError(
                     f"cannot add file path that already exists: {file_path}"
                 )
 
-            self._data[str(file_path)] = os.path.getmtime(file_path)
+            self._data[str(file_path)] = FileTracker._get_modified_time(
+                file_path, file_modified_times
+            )
 
-    def _update_file_paths_in_data(self, file_paths: list[Path]) -> None:
+    def _update_file_paths_in_data(
+        self,
+        file_paths: list[Path],
+        file_modified_times: dict[Path, datetime] | None = None,
+    ) -> None:
         for file_path in file_paths:
-            if not file_path.is_file():
-                raise FileNotFoundError(f"cannot find file at {file_path}")
-
             if str(file_path) not in self._data:
                 raise ValueError(
                     f"cannot update file path that does not exist: {file_path}"
                 )
 
-            self._data[str(file_path)] = os.path.getmtime(file_path)
+            self._data[str(file_path)] = FileTracker._get_modified_time(
+                file_path, file_modified_times
+            )
 
     def _delete_file_paths_from_data(self, file_paths: list[Path]) -> None:
         for file_path in file_paths:
@@ -62,9 +84,13 @@ class FileTracker:
 
             del self._data[str(file_path)]
 
-    def create_file(self, file_paths: list[Path]) -> None:
+    def create_file(
+        self,
+        file_paths: list[Path],
+        file_modified_times: dict[Path, datetime] | None = None,
+    ) -> None:
         self._raise_if_file_exists()
-        self._add_file_paths_to_data(file_paths)
+        self._add_file_paths_to_data(file_paths, file_modified_times)
         self._write_data_to_file()
 
     def change_file_paths(
@@ -72,10 +98,11 @@ class FileTracker:
         paths_to_add: list[Path],
         paths_to_update: list[Path],
         paths_to_delete: list[Path],
+        file_modified_times: dict[Path, datetime] | None = None,
     ) -> None:
         self._raise_if_file_missing()
-        self._add_file_paths_to_data(paths_to_add)
-        self._update_file_paths_in_data(paths_to_update)
+        self._add_file_paths_to_data(paths_to_add, file_modified_times)
+        self._update_file_paths_in_data(paths_to_update, file_modified_times)
         self._delete_file_paths_from_data(paths_to_delete)
         self._write_data_to_file()
 
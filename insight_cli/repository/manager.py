@@ -3,7 +3,11 @@ from pathlib import Path
 import os, shutil
 
 from .authenticator import Authenticator
+from .file_snapshots import FileSnapshots
 from .file_tracker import FileTracker
+from .metrics_log import MetricsLog
+from .query_cache import QueryCache
+from .sync_journal import SyncJournal
 
 
 class Manager:
@@ -17,22 +21,47 @@ class Manager:
         self._path = parent_dir_path / Manager._DIR_NAME
         self._authenticator = Authenticator(self._path)
         self._file_tracker = FileTracker(self._path)
+        self._file_snapshots = FileSnapshots(self._path)
+        self._metrics_log = MetricsLog(self._path)
+        self._query_cache = QueryCache(self._path)
+        self._sync_journal = SyncJournal(self._path)
 
     def create(
-        self, repository_id: str, nested_repository_file_paths: list[Path]
+        self,
+        repository_id: str,
+        nested_repository_file_paths: list[Path],
+        file_modified_times: dict[Path, datetime] | None = None,
     ) -> None:
+        """
+        The modified times of a scan of the files, if given, are
+        tracked instead of stat'ing the files again.
+        """
         self.delete()
         os.makedirs(self._path)
         self._authenticator.create_file({"repository_id": repository_id})
-        self._file_tracker.create_file(nested_repository_file_paths)
+        self._file_tracker.create_file(
+            nested_repository_file_paths, file_modified_times
+        )
+        self._file_snapshots.create()
 
     def update(
-        self, repository_file_changes: dict[str, list[tuple[str, bytes]]]
+        self,
+        repository_file_changes: dict[str, list[tuple[str, bytes]]],
+        file_modified_times: dict[Path, datetime] | None = None,
     ) -> None:
         self._file_tracker.change_file_paths(
             paths_to_add=[Path(path) for path in repository_file_changes["add"]],
             paths_to_update=[Path(path) for path in repository_file_changes["update"]],
             paths_to_delete=[Path(path) for path in repository_file_changes["delete"]],
+            file_modified_times=file_modified_times,
+        )
+        self._file_snapshots.change_file_paths(
+            paths_to_save=[
+                Path(path)
+                for path in repository_file_changes["add"]
+                + repository_file_changes["update"]
+            ],
+            paths_to_delete=[Path(path) for path in repository_file_changes["delete"]],
         )
 
     def delete(self) -> None:
@@ -42,15 +71,41 @@ class Manager:
         shutil.rmtree(self._path)
         self._authenticator = Authenticator(self._path)
         self._file_tracker = FileTracker(self._path)
+        self._file_snapshots = FileSnapshots(self._path)
+        self._metrics_log = MetricsLog(self._path)
+        self._query_cache = QueryCache(self._path)
+        self._sync_journal = SyncJournal(self._path)
 
     @property
     def is_valid(self) -> bool:
         return self._authenticator.is_valid
 
+    async def is_valid_async(self) -> bool:
+        return await self._authenticator.is_valid_async()
+
+    def invalidate(self) -> None:
+        self._authenticator.invalidate()
+
     @property
     def repository_id(self) -> str:
         return self._authenticator.data["repository_id"]
 
+    @property
+    def file_snapshots(self) -> FileSnapshots:
+        return self._file_snapshots
+
+    @property
+    def metrics_log(self) -> MetricsLog:
+        return self._metrics_log
+
+    @property
+    def query_cache(self) -> QueryCache:
+        return self._query_cache
+
+    @property
+    def sync_journal(self) -> SyncJournal:
+        return self._sync_journal
+
     @property
     def tracked_file_modified_times(self) -> dict[Path, datetime]:
         return self._file_tracker.tracked_file_modified_times
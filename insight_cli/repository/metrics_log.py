@@ -0,0 +1,92 @@
+from pathlib import Path
+from typing import TypedDict
+import json, os
+
+from insight_cli.api.base import EndpointMetrics
+from insight_cli.utils import LatencyHistogram
+from insight_cli import config
+
+
+class OperationRecord(TypedDict):
+    operation: str
+    start_time: float
+    duration_seconds: float
+    endpoints: dict[str, EndpointMetrics]
+    num_batches: int
+    num_retries: int
+    concurrency: int | None
+    compression_ratio: float | None
+    num_hedges: int
+    num_hedge_wins: int
+
+
+class MetricsLog:
+    """
+    Ring buffer of the [max_num_records] latest operations run on the
+    repository (initialize, reinitialize, query, ...), each with how
+    long it took, its batch, retry and hedge counts, the upload
+    concurrency and compression ratio and, per endpoint, a latency
+    histogram and the bytes sent and received (see RequestMetrics).
+    The log is written whole to a single JSON file and the oldest
+    records are dropped once it is full.
+    """
+
+    _FILE_NAME = "metrics.json"
+
+    def __init__(
+        self,
+        parent_dir_path: Path,
+        max_num_records: int = config.INSIGHT_METRICS_MAX_NUM_RECORDS,
+    ):
+        self._parent_dir_path = parent_dir_path
+        self._path = parent_dir_path / MetricsLog._FILE_NAME
+        self._max_num_records = max_num_records
+        self._records: list[OperationRecord] | None = None
+
+    @property
+    def records(self) -> list[OperationRecord]:
+        if self._records is None:
+            try:
+                with open(self._path, "r") as file:
+                    self._records = list(json.load(file))
+
+            except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError):
+                self._records = []
+
+        return self._records
+
+    def append(self, record: OperationRecord) -> None:
+        records = self.records
+        records.append(record)
+        del records[: max(0, len(records) - self._max_num_records)]
+
+        if not os.path.isdir(self._parent_dir_path):
+            return
+
+        temp_path = self._path.with_suffix(".tmp")
+
+        with open(temp_path, "w") as file:
+            json.dump(records, file, separators=(",", ":"))
+
+        os.replace(temp_path, self._path)
+
+    def get_operation_latency_histograms(self) -> dict[str, LatencyHistogram]:
+        latency_histograms: dict[str, LatencyHistogram] = {}
+
+        for record in self.records:
+            latency_histograms.setdefault(
+                record["operation"], LatencyHistogram()
+            ).record(record["duration_seconds"])
+
+        return latency_histograms
+
+    def get_endpoint_latency_histograms(self) -> dict[str, LatencyHistogram]:
+        latency_histograms: dict[str, LatencyHistogram] = {}
+
+        for record in self.records:
+            for endpoint, endpoint_metrics in record["endpoints"].items():
+                latency_histograms.setdefault(endpoint, LatencyHistogram()).merge(
+                    LatencyHistogram.from_dict(endpoint_metrics["latency_histogram"])
+                )
+
+        return latency_histograms
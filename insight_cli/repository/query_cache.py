@@ -0,0 +1,184 @@
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+import hashlib, json, os
+
+from insight_cli import config
+
+
+class QueryCache:
+    """
+    Least recently used cache of query results, kept so that a query
+    repeated on an unchanged repository is answered without contacting
+    the server. Entries are keyed by the normalized query string, the
+    limit and a fingerprint of the set of tracked file paths, so adding
+    or deleting a file misses every entry. An entry also records the
+    modified times of the files its matches refer to and is dropped as
+    soon as one of them changes. The cache is written whole to a single
+    JSON file and entries are evicted once it exceeds
+    [max_size_bytes].
+    """
+
+    _FILE_NAME = "query_cache.json"
+
+    @staticmethod
+    def _normalize_query_string(query_string: str) -> str:
+        return " ".join(query_string.split())
+
+    @staticmethod
+    def _get_file_set_fingerprint(file_paths: list[Path]) -> str:
+        fingerprint = hashlib.blake2b(digest_size=16)
+
+        for file_path in sorted(str(file_path) for file_path in file_paths):
+            fingerprint.update(file_path.encode("utf-8") + b"\0")
+
+        return fingerprint.hexdigest()
+
+    @staticmethod
+    def _get_key(
+        query_string: str, limit: int, file_modified_times: dict[Path, datetime]
+    ) -> str:
+        return json.dumps(
+            [
+                QueryCache._normalize_query_string(query_string),
+                limit,
+                QueryCache._get_file_set_fingerprint(list(file_modified_times)),
+            ]
+        )
+
+    @staticmethod
+    def _get_match_file_modified_times(
+        matches: list[dict], file_modified_times: dict[Path, datetime]
+    ) -> dict[str, float | None]:
+        return {
+            match["path"]: (
+                file_modified_times[Path(match["path"])].timestamp()
+                if Path(match["path"]) in file_modified_times
+                else None
+            )
+            for match in matches
+        }
+
+    def __init__(
+        self,
+        parent_dir_path: Path,
+        max_size_bytes: int = config.INSIGHT_QUERY_CACHE_MAX_SIZE_BYTES,
+    ):
+        self._parent_dir_path = parent_dir_path
+        self._path = parent_dir_path / QueryCache._FILE_NAME
+        self._max_size_bytes = max_size_bytes
+        self._entries: OrderedDict[str, dict] | None = None
+
+    def _read_entries(self) -> OrderedDict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self._path, "r") as file:
+                    self._entries = OrderedDict(json.load(file))
+
+            except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError):
+                self._entries = OrderedDict()
+
+        return self._entries
+
+    def _write_entries(self) -> None:
+        """
+        The least recently used entries are evicted until the cache
+        fits in [max_size_bytes].
+        """
+        entries = self._read_entries()
+        entry_sizes_bytes = {
+            key: len(json.dumps([key, entry])) + len(", ")
+            for key, entry in entries.items()
+        }
+        size_bytes = len("[]") + sum(entry_sizes_bytes.values())
+
+        while entries and size_bytes > self._max_size_bytes:
+            key, _ = entries.popitem(last=False)
+            size_bytes -= entry_sizes_bytes[key]
+
+        content = json.dumps(list(entries.items()))
+
+        if not os.path.isdir(self._parent_dir_path):
+            return
+
+        temp_path = self._path.with_suffix(".tmp")
+
+        with open(temp_path, "w") as file:
+            file.write(content)
+
+        os.replace(temp_path, self._path)
+
+    def get_all(
+        self,
+        queries: list[tuple[str, int]],
+        file_modified_times: dict[Path, datetime],
+    ) -> list[list[dict] | None]:
+        """
+        Returns the cached matches of each (query string, limit) pair
+        of [queries], or None for those that are not cached, with a
+        single write of the cache.
+        """
+        entries = self._read_entries()
+        cached_matches = []
+        entries_are_changed = False
+
+        for query_string, limit in queries:
+            key = QueryCache._get_key(query_string, limit, file_modified_times)
+            entry = entries.get(key)
+            entries_are_changed = entries_are_changed or entry is not None
+
+            if entry is not None and (
+                QueryCache._get_match_file_modified_times(
+                    entry["matches"], file_modified_times
+                )
+                != entry["file_modified_times"]
+            ):
+                del entries[key]
+                entry = None
+
+            if entry is not None:
+                entries.move_to_end(key)
+
+            cached_matches.append(None if entry is None else entry["matches"])
+
+        if entries_are_changed:
+            self._write_entries()
+
+        return cached_matches
+
+    def get(
+        self,
+        query_string: str,
+        limit: int,
+        file_modified_times: dict[Path, datetime],
+    ) -> list[dict] | None:
+        return self.get_all([(query_string, limit)], file_modified_times)[0]
+
+    def put_all(
+        self,
+        query_matches: list[tuple[str, int, list[dict]]],
+        file_modified_times: dict[Path, datetime],
+    ) -> None:
+        entries = self._read_entries()
+
+        for query_string, limit, matches in query_matches:
+            key = QueryCache._get_key(query_string, limit, file_modified_times)
+            entries[key] = {
+                "matches": matches,
+                "file_modified_times": QueryCache._get_match_file_modified_times(
+                    matches, file_modified_times
+                ),
+            }
+            entries.move_to_end(key)
+
+        if query_matches:
+            self._write_entries()
+
+    def put(
+        self,
+        query_string: str,
+        limit: int,
+        file_modified_times: dict[Path, datetime],
+        matches: list[dict],
+    ) -> None:
+        self.put_all([(query_string, limit, matches)], file_modified_times)
@@ -1,14 +1,21 @@
+from datetime import datetime
 from pathlib import Path
+from typing import AsyncIterator, Iterator
+import asyncio, contextlib, requests, time
 
 from insight_cli.api import (
-    CreateRepositoryAPI,
-    InitializeRepositoryAPI,
+    AsyncCreateRepositoryAPI,
+    AsyncInitializeRepositoryAPI,
+    AsyncQueryRepositoryAPI,
+    AsyncReinitializeRepositoryAPI,
+    AsyncUninitializeRepositoryAPI,
     QueryRepositoryAPI,
-    ReinitializeRepositoryAPI,
-    UninitializeRepositoryAPI,
 )
-from insight_cli.utils import Directory, File, FileChangesDetector
+from insight_cli.api.base import Deadline, RequestMetrics
+from insight_cli.utils import Directory, File, FileChangesDetector, Tracer
+from insight_cli import config
 from .manager import Manager
+from .metrics_log import MetricsLog
 from .pattern_ignorer import PatternIgnorer
 
 
@@ -28,13 +35,20 @@ class FileSizeExceededError(Exception):
 
 
 class Repository:
+    """
+    Every operation is a coroutine so that validation, directory
+    scanning, change detection and uploads can run together on one
+    event loop. The synchronous methods used by the CLI commands are
+    thin wrappers that run the coroutine to completion.
+    """
+
     def __init__(self, path: Path):
         self._ALLOWED_FILE_EXTENSIONS = {".py"}
         self._MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024  # 10MB
         self._path = path
         self._manager = Manager(path)
         self._pattern_ignorer = PatternIgnorer(path)
-        self._is_valid = self._manager.is_valid
+        self._is_valid: bool | None = None
 
     @property
     def _id(self) -> str:
@@ -42,79 +56,360 @@ class Repository:
 
     @property
     def is_valid(self) -> bool:
+        if self._is_valid is None:
+            with Tracer.span("validation"):
+                self._is_valid = self._manager.is_valid
+
         return self._is_valid
 
     @property
     def path(self) -> Path:
         return self._path
 
-    def _raise_for_invalid_repository(self) -> None:
-        if not self.is_valid:
-            raise InvalidRepositoryError(self._path)
+    @property
+    def metrics_log(self) -> MetricsLog:
+        return self._manager.metrics_log
 
-    def _raise_for_file_size_exceeded(self, file: File | None) -> None:
-        if file is not None and file.size_bytes > self._MAX_FILE_SIZE_BYTES:
-            raise FileSizeExceededError(file, self._MAX_FILE_SIZE_BYTES)
+    async def _validate_async(self) -> bool:
+        if self._is_valid is None:
+            with Tracer.span("validation"):
+                self._is_valid = await self._manager.is_valid_async()
 
-    def initialize(self) -> None:
-        repository_dir: Directory = Directory(
-            path=self._path,
-            ignorable_regex_patterns=self._pattern_ignorer.regex_patterns,
-            allowed_file_extensions=self._ALLOWED_FILE_EXTENSIONS,
-        )
+        return self._is_valid
 
-        self._raise_for_file_size_exceeded(repository_dir.largest_file_by_size)
+    @contextlib.contextmanager
+    def _invalidate_if_not_found(self) -> Iterator[None]:
+        """
+        A 404 answer to a request about the repository means its id is
+        no longer valid, so the cached validation is dropped and an
+        InvalidRepositoryError is raised.
+        """
+        try:
+            yield
+
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+
+            self._manager.invalidate()
+            self._is_valid = False
+
+            raise InvalidRepositoryError(self._path) from e
+
+    @contextlib.contextmanager
+    def _record_metrics(self, operation: str) -> Iterator[None]:
+        """
+        Appends how long [operation] took and what its requests cost
+        (see RequestMetrics) to the metrics log if it succeeds. Only
+        the outermost operation is recorded, so a query that first
+        initializes the repository is recorded once, as a query.
+        """
+        if RequestMetrics.is_started():
+            yield
+            return
 
-        response_data = CreateRepositoryAPI.make_request()
+        start_time = time.time()
+        start_perf_counter = time.perf_counter()
+        RequestMetrics.start()
 
-        InitializeRepositoryAPI.make_request(
-            response_data["repository_id"], repository_dir.file_paths_to_content
-        )
+        try:
+            yield
 
-        self._manager.create(response_data["repository_id"], repository_dir.file_paths)
+        finally:
+            operation_metrics = RequestMetrics.stop()
 
-        self._is_valid = True
+        self._manager.metrics_log.append(
+            {
+                "operation": operation,
+                "start_time": start_time,
+                "duration_seconds": time.perf_counter() - start_perf_counter,
+                **operation_metrics,
+            }
+        )
 
-    def reinitialize(self) -> None:
-        self._raise_for_invalid_repository()
+    def _raise_for_file_size_exceeded(self, file: File | None) -> None:
+        if file is not None and file.size_bytes > self._MAX_FILE_SIZE_BYTES:
+            raise FileSizeExceededError(file, self._MAX_FILE_SIZE_BYTES)
 
-        repository_dir: Directory = Directory(
-            path=self._path,
-            ignorable_regex_patterns=self._pattern_ignorer.regex_patterns,
-            allowed_file_extensions=self._ALLOWED_FILE_EXTENSIONS,
-        )
+    def _scan_directory(
+        self,
+    ) -> tuple[Directory, dict[Path, datetime], File | None]:
+        Deadline.check("directory scan")
+
+        with Tracer.span("scan"):
+            repository_dir: Directory = Directory(
+                path=self._path,
+                ignorable_regex_patterns=self._pattern_ignorer.regex_patterns,
+                allowed_file_extensions=self._ALLOWED_FILE_EXTENSIONS,
+                num_workers=config.INSIGHT_SCAN_NUM_WORKERS,
+            )
+
+            return (
+                repository_dir,
+                repository_dir.file_modified_times,
+                repository_dir.largest_file_by_size,
+            )
+
+    async def initialize_async(self) -> None:
+        with self._record_metrics("initialize"):
+            repository_dir, file_modified_times, largest_file = await asyncio.to_thread(
+                self._scan_directory
+            )
+
+            self._raise_for_file_size_exceeded(largest_file)
+
+            repository_id = self._manager.sync_journal.get_resumable_repository_id(
+                "initialize", file_modified_times
+            )
+
+            if repository_id is None:
+                repository_id = (await AsyncCreateRepositoryAPI.make_request())[
+                    "repository_id"
+                ]
+
+            self._manager.sync_journal.begin(
+                "initialize", repository_id, file_modified_times
+            )
+
+            await AsyncInitializeRepositoryAPI.make_request(
+                repository_id, repository_dir.files, self._manager.sync_journal
+            )
+
+            self._manager.create(
+                repository_id, repository_dir.file_paths, file_modified_times
+            )
+
+            self._manager.sync_journal.complete()
+
+            self._is_valid = True
+
+    async def reinitialize_async(self) -> None:
+        """
+        The repository id is validated while the directory is scanned.
+        """
+        with self._record_metrics("reinitialize"):
+            is_valid, (_, file_modified_times, largest_file) = await asyncio.gather(
+                self._validate_async(), asyncio.to_thread(self._scan_directory)
+            )
+
+            await self._reinitialize_scanned_async(
+                is_valid, file_modified_times, largest_file
+            )
+
+    async def _reinitialize_scanned_async(
+        self,
+        is_valid: bool,
+        file_modified_times: dict[Path, datetime],
+        largest_file: File | None,
+    ) -> None:
+        if not is_valid:
+            raise InvalidRepositoryError(self._path)
 
-        self._raise_for_file_size_exceeded(repository_dir.largest_file_by_size)
+        self._raise_for_file_size_exceeded(largest_file)
 
-        file_changes_detector = FileChangesDetector(
-            previous_file_modified_times=self._manager.tracked_file_modified_times,
-            current_file_modified_times=repository_dir.file_modified_times,
-        )
+        Deadline.check("file change detection")
+
+        with Tracer.span("diff"):
+            file_changes_detector = await asyncio.to_thread(
+                FileChangesDetector,
+                previous_file_modified_times=self._manager.tracked_file_modified_times,
+                current_file_modified_times=file_modified_times,
+            )
 
         if file_changes_detector.no_files_changes_exist:
             return
 
-        ReinitializeRepositoryAPI.make_request(
-            repository_id=self._id,
-            repository_file_changes=file_changes_detector.file_changes,
+        file_path_changes = file_changes_detector.file_path_changes
+
+        self._manager.sync_journal.begin(
+            "reinitialize",
+            self._id,
+            {
+                file_path: file_modified_times[file_path]
+                for file_path in file_path_changes["add"] + file_path_changes["update"]
+            },
         )
 
-        self._manager.update(file_changes_detector.file_path_changes)
+        with self._invalidate_if_not_found():
+            await AsyncReinitializeRepositoryAPI.make_request(
+                repository_id=self._id,
+                repository_file_changes=file_changes_detector.file_changes,
+                journal=self._manager.sync_journal,
+                get_base_content=self._manager.file_snapshots.get_content,
+            )
+
+        self._manager.update(file_path_changes, file_modified_times)
+
+        self._manager.sync_journal.complete()
 
         self._is_valid = True
 
-    def uninitialize(self) -> None:
-        self._raise_for_invalid_repository()
+    async def uninitialize_async(self) -> None:
+        if not await self._validate_async():
+            raise InvalidRepositoryError(self._path)
 
-        UninitializeRepositoryAPI.make_request(self._id)
+        with self._invalidate_if_not_found():
+            await AsyncUninitializeRepositoryAPI.make_request(self._id)
 
         self._manager.delete()
 
         self._is_valid = False
 
-    def query(self, query_string: str, limit: int) -> list[dict] | None:
-        self._raise_for_invalid_repository()
+    async def _prepare_queries_async(
+        self, queries: list[tuple[str, int]]
+    ) -> tuple[list[list[dict] | None], dict[Path, datetime]]:
+        """
+        Returns the cached matches of each (query string, limit) pair,
+        or None for those that are not cached. Results cached for the
+        same query on the same tracked files are returned without
+        validating, reinitializing or querying the repository (see
+        QueryCache). Otherwise the repository is reinitialized once so
+        that it can be queried. The query latencies recorded in the
+        MetricsLog are loaded into the query hedger.
+        """
+        query_latency_histogram = (
+            self._manager.metrics_log.get_endpoint_latency_histograms().get(
+                "query_repository"
+            )
+        )
+
+        if query_latency_histogram is not None:
+            QueryRepositoryAPI.add_latency_history(query_latency_histogram)
 
-        self.reinitialize()
+        if (
+            self._manager.sync_journal.pending_operation == "initialize"
+            and not await self._validate_async()
+        ):
+            await self.initialize_async()
+
+        _, file_modified_times, largest_file = await asyncio.to_thread(
+            self._scan_directory
+        )
 
-        return QueryRepositoryAPI.make_request(self._id, query_string, limit)
+        cached_matches = self._manager.query_cache.get_all(
+            queries, file_modified_times
+        )
+
+        if any(matches is None for matches in cached_matches):
+            await self._reinitialize_scanned_async(
+                await self._validate_async(), file_modified_times, largest_file
+            )
+
+        return cached_matches, file_modified_times
+
+    async def query_async(self, query_string: str, limit: int) -> list[dict] | None:
+        with self._record_metrics("query"):
+            (matches,), file_modified_times = await self._prepare_queries_async(
+                [(query_string, limit)]
+            )
+
+            if matches is not None:
+                return matches
+
+            with self._invalidate_if_not_found(), Tracer.span("query"):
+                matches = await AsyncQueryRepositoryAPI.make_request(
+                    self._id, query_string, limit
+                )
+
+            if matches is not None:
+                self._manager.query_cache.put(
+                    query_string, limit, file_modified_times, matches
+                )
+
+            return matches
+
+    async def query_batch_async(
+        self, queries: list[tuple[str, int]]
+    ) -> AsyncIterator[tuple[int, list[dict] | None]]:
+        """
+        Runs every (query string, limit) pair of [queries] after a
+        single reinitialize, concurrently on the Client's worker
+        threads, and yields the index of each query with its matches
+        as soon as they are available. Cached results come first. At
+        most config.INSIGHT_API_MAX_CONCURRENCY queries are in flight,
+        they are not hedged, and those still pending are cancelled if
+        one fails.
+        """
+        with self._record_metrics("query_batch"):
+            cached_matches, file_modified_times = await self._prepare_queries_async(
+                queries
+            )
+
+            for i, matches in enumerate(cached_matches):
+                if matches is not None:
+                    yield i, matches
+
+            semaphore = asyncio.Semaphore(config.INSIGHT_API_MAX_CONCURRENCY)
+
+            async def query(i: int) -> tuple[int, list[dict] | None]:
+                async with semaphore:
+                    with Tracer.span("query", index=i):
+                        return i, await AsyncQueryRepositoryAPI.make_request(
+                            self._id, *queries[i], is_hedged=False
+                        )
+
+            query_tasks = [
+                asyncio.ensure_future(query(i))
+                for i, matches in enumerate(cached_matches)
+                if matches is None
+            ]
+            query_matches = []
+
+            try:
+                for completed_query in asyncio.as_completed(query_tasks):
+                    with self._invalidate_if_not_found():
+                        i, matches = await completed_query
+
+                    if matches is not None:
+                        query_matches.append((*queries[i], matches))
+
+                    yield i, matches
+
+            finally:
+                for query_task in query_tasks:
+                    query_task.cancel()
+
+                await asyncio.gather(*query_tasks, return_exceptions=True)
+
+                self._manager.query_cache.put_all(query_matches, file_modified_times)
+
+    def initialize(self) -> None:
+        asyncio.run(self.initialize_async())
+
+    def reinitialize(self) -> None:
+        asyncio.run(self.reinitialize_async())
+
+    def uninitialize(self) -> None:
+        asyncio.run(self.uninitialize_async())
+
+    def query(self, query_string: str, limit: int) -> list[dict] | None:
+        return asyncio.run(self.query_async(query_string, limit))
+
+    def query_stream(self, query_string: str, limit: int) -> Iterator[dict]:
+        """
+        Yields each match as soon as the server sends it, so the query
+        span and the recorded duration also cover what the caller does
+        with each match. The matches are cached once all of them have
+        arrived.
+        """
+        with self._record_metrics("query"):
+            (matches,), file_modified_times = asyncio.run(
+                self._prepare_queries_async([(query_string, limit)])
+            )
+
+            if matches is not None:
+                yield from matches
+                return
+
+            matches = []
+
+            with self._invalidate_if_not_found(), Tracer.span("query"):
+                for match in QueryRepositoryAPI.stream_request(
+                    self._id, query_string, limit
+                ):
+                    matches.append(match)
+                    yield match
+
+            self._manager.query_cache.put(
+                query_string, limit, file_modified_times, matches
+            )
@@ -0,0 +1,157 @@
+from datetime import datetime
+from pathlib import Path
+import json, os, threading
+
+from insight_cli.api.base import BatchJournal
+
+
+class SyncJournal(BatchJournal):
+    """
+    Write-ahead journal of an initialize or reinitialize upload. It is
+    started before the first batch is sent and every batch the server
+    acknowledges is appended to it immediately, so an upload that is
+    interrupted can be resumed by the next command. An upload is only
+    resumed if the files it covers are unchanged since it started;
+    otherwise the journal is discarded and the upload starts over.
+
+    The journal is a JSON lines file. The first line describes the
+    upload, the second lists the planned batch ids and every later line
+    holds one acknowledged batch id. A partially written last line left
+    by a crash is ignored.
+    """
+
+    _FILE_NAME = "sync_journal.jsonl"
+
+    @staticmethod
+    def _serialize_file_modified_times(
+        file_modified_times: dict[Path, datetime]
+    ) -> dict[str, float]:
+        return {
+            str(file_path): modified_time.timestamp()
+            for file_path, modified_time in file_modified_times.items()
+        }
+
+    def __init__(self, parent_dir_path: Path):
+        self._parent_dir_path = parent_dir_path
+        self._path = parent_dir_path / SyncJournal._FILE_NAME
+        self._lock = threading.Lock()
+        self._header: dict | None = None
+        self._planned_batch_ids: list[str] | None = None
+        self._acknowledged_batch_ids: set[str] = set()
+        self._read_from_file()
+
+    def _read_from_file(self) -> None:
+        if not self._path.is_file():
+            return
+
+        records = []
+
+        with open(self._path, "r") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+
+        if not records or "operation" not in records[0]:
+            return
+
+        self._header = records[0]
+
+        for record in records[1:]:
+            if "planned_batch_ids" in record:
+                self._planned_batch_ids = record["planned_batch_ids"]
+                self._acknowledged_batch_ids = set()
+
+            elif "acknowledged_batch_id" in record:
+                self._acknowledged_batch_ids.add(record["acknowledged_batch_id"])
+
+    def _append_to_file(self, record: dict) -> None:
+        with open(self._path, "a") as file:
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _matches(
+        self, operation: str, file_modified_times: dict[Path, datetime]
+    ) -> bool:
+        return (
+            self._header is not None
+            and self._header["operation"] == operation
+            and self._header["file_modified_times"]
+            == SyncJournal._serialize_file_modified_times(file_modified_times)
+        )
+
+    def get_resumable_repository_id(
+        self, operation: str, file_modified_times: dict[Path, datetime]
+    ) -> str | None:
+        if not self._matches(operation, file_modified_times):
+            return None
+
+        return self._header["repository_id"]
+
+    @property
+    def pending_operation(self) -> str | None:
+        return None if self._header is None else self._header["operation"]
+
+    def begin(
+        self,
+        operation: str,
+        repository_id: str,
+        file_modified_times: dict[Path, datetime],
+    ) -> None:
+        """
+        Keeps the existing journal if it records the same upload of
+        the same unchanged files, and starts a new one otherwise.
+        """
+        with self._lock:
+            if (
+                self._matches(operation, file_modified_times)
+                and self._header["repository_id"] == repository_id
+            ):
+                return
+
+            self._header = {
+                "operation": operation,
+                "repository_id": repository_id,
+                "file_modified_times": SyncJournal._serialize_file_modified_times(
+                    file_modified_times
+                ),
+            }
+            self._planned_batch_ids = None
+            self._acknowledged_batch_ids = set()
+
+            os.makedirs(self._parent_dir_path, exist_ok=True)
+
+            with open(self._path, "w") as file:
+                file.write(json.dumps(self._header) + "\n")
+
+    def plan(self, batch_ids: list[str]) -> None:
+        with self._lock:
+            if self._planned_batch_ids == batch_ids:
+                return
+
+            self._planned_batch_ids = batch_ids
+            self._acknowledged_batch_ids = set()
+            self._append_to_file({"planned_batch_ids": batch_ids})
+
+    def is_acknowledged(self, batch_id: str) -> bool:
+        with self._lock:
+            return batch_id in self._acknowledged_batch_ids
+
+    def acknowledge(self, batch_id: str) -> None:
+        with self._lock:
+            if batch_id in self._acknowledged_batch_ids:
+                return
+
+            self._acknowledged_batch_ids.add(batch_id)
+            self._append_to_file({"acknowledged_batch_id": batch_id})
+
+    def complete(self) -> None:
+        with self._lock:
+            self._header = None
+            self._planned_batch_ids = None
+            self._acknowledged_batch_ids = set()
+
+            if self._path.is_file():
+                os.remove(self._path)
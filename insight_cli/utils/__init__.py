@@ -1,6 +1,15 @@
+from .batch_frame_codec import BatchFrameCodec
+from .batch_json_encoder import BatchJsonEncoder
+from .batch_planner import BatchPlanner, FileChunkRange
 from .color import Color
-from .directory import Directory
-from .file import File
+from .cpu_limit import CpuLimit
+from .diagnostics import Diagnostics
+from .directory import Directory, ScannedDir
+from .file import File, ScanRecord
 from .file_changes_detector import FileChangesDetector
+from .file_delta import FileDelta, LineEdit
 from .file_chunkifier import FileChunkifier
-from .chunked_file_encoder import ChunkedFileEncoder
+from .latency_histogram import LatencyHistogram
+from .pipeline import Pipeline
+from .profiler import Profiler
+from .tracer import Tracer
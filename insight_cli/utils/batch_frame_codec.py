@@ -0,0 +1,115 @@
+import json, struct
+
+
+class BatchFrameCodec:
+    """
+    Length-prefixed binary framing of an upload batch, an alternative
+    to base64 file contents inside a JSON body. A body is a magic
+    number and a version byte followed by frames. Each frame is a
+    4-byte big-endian header length, a UTF-8 JSON header, an 8-byte
+    big-endian content length and the raw content. The first frame
+    describes the batch and has no content; every other frame carries
+    one file chunk.
+    """
+
+    CONTENT_TYPE = "application/vnd.insight.batch"
+
+    _MAGIC = b"INSB"
+    _VERSION = 1
+    _PREAMBLE = struct.Struct(">4sB")
+    _HEADER_LENGTH = struct.Struct(">I")
+    _CONTENT_LENGTH = struct.Struct(">Q")
+
+    @staticmethod
+    def encode(
+        batch_header: dict, file_chunks: list[tuple[dict, bytes | memoryview]]
+    ) -> bytearray:
+        """
+        The body is written into a single buffer allocated at its
+        final size, so each file chunk is copied exactly once.
+        """
+        frames = [(json.dumps(batch_header).encode("utf-8"), b"")] + [
+            (json.dumps(file_chunk_header).encode("utf-8"), file_chunk_content)
+            for file_chunk_header, file_chunk_content in file_chunks
+        ]
+
+        body = bytearray(
+            BatchFrameCodec._PREAMBLE.size
+            + sum(
+                BatchFrameCodec._HEADER_LENGTH.size
+                + len(header)
+                + BatchFrameCodec._CONTENT_LENGTH.size
+                + len(content)
+                for header, content in frames
+            )
+        )
+
+        # Slices of a bytearray copy what is assigned to them before
+        # writing it unless it is a bytearray, slices of a view do not.
+        body_view = memoryview(body)
+        BatchFrameCodec._PREAMBLE.pack_into(
+            body, 0, BatchFrameCodec._MAGIC, BatchFrameCodec._VERSION
+        )
+        offset = BatchFrameCodec._PREAMBLE.size
+
+        for header, content in frames:
+            BatchFrameCodec._HEADER_LENGTH.pack_into(body, offset, len(header))
+            offset += BatchFrameCodec._HEADER_LENGTH.size
+            body_view[offset : offset + len(header)] = header
+            offset += len(header)
+
+            BatchFrameCodec._CONTENT_LENGTH.pack_into(body, offset, len(content))
+            offset += BatchFrameCodec._CONTENT_LENGTH.size
+            body_view[offset : offset + len(content)] = content
+            offset += len(content)
+
+        body_view.release()
+
+        return body
+
+    @staticmethod
+    def decode(body: bytes | bytearray) -> tuple[dict, list[tuple[dict, memoryview]]]:
+        """
+        File chunk contents are returned as views into [body] rather
+        than copies.
+        """
+        view = memoryview(body)
+
+        if len(view) < BatchFrameCodec._PREAMBLE.size:
+            raise ValueError("Batch body is truncated")
+
+        magic, version = BatchFrameCodec._PREAMBLE.unpack_from(view, 0)
+
+        if magic != BatchFrameCodec._MAGIC or version != BatchFrameCodec._VERSION:
+            raise ValueError("Batch body has an unsupported format")
+
+        offset = BatchFrameCodec._PREAMBLE.size
+        frames = []
+
+        while offset < len(view):
+            try:
+                (header_length,) = BatchFrameCodec._HEADER_LENGTH.unpack_from(
+                    view, offset
+                )
+                offset += BatchFrameCodec._HEADER_LENGTH.size
+                header = json.loads(bytes(view[offset : offset + header_length]))
+                offset += header_length
+
+                (content_length,) = BatchFrameCodec._CONTENT_LENGTH.unpack_from(
+                    view, offset
+                )
+                offset += BatchFrameCodec._CONTENT_LENGTH.size
+
+            except (struct.error, ValueError):
+                raise ValueError("Batch body is truncated")
+
+            if offset + content_length > len(view):
+                raise ValueError("Batch body is truncated")
+
+            frames.append((header, view[offset : offset + content_length]))
+            offset += content_length
+
+        if not frames:
+            raise ValueError("Batch body has no batch header")
+
+        return frames[0][0], frames[1:]
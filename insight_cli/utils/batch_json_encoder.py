@@ -0,0 +1,96 @@
+import binascii, json
+
+
+class BatchJsonEncoder:
+    """
+    Writes the JSON body of an upload batch, with base64 file contents,
+    straight into a single buffer allocated at its final size. Only the
+    small envelope goes through the json module, and contents are
+    base64 encoded a block at a time into the buffer, so building a
+    batch allocates little besides the body itself.
+    """
+
+    CONTENT_TYPE = "application/json"
+
+    _BASE64_BLOCK_SIZE_BYTES = 3 * 16 * 1024
+
+    @staticmethod
+    def _get_base64_size_bytes(size_bytes: int) -> int:
+        return 4 * ((size_bytes + 2) // 3)
+
+    @staticmethod
+    def _write_base64(
+        body_view: memoryview, offset: int, content: bytes | memoryview
+    ) -> int:
+        """
+        Returns the offset after the encoded [content].
+        """
+        content_view = memoryview(content)
+        block_size_bytes = BatchJsonEncoder._BASE64_BLOCK_SIZE_BYTES
+
+        for start in range(0, len(content_view), block_size_bytes):
+            encoded_block = binascii.b2a_base64(
+                content_view[start : start + block_size_bytes], newline=False
+            )
+            body_view[offset : offset + len(encoded_block)] = encoded_block
+            offset += len(encoded_block)
+
+        return offset
+
+    @staticmethod
+    def encode(batch_header: dict, files: dict[str, dict]) -> bytearray:
+        """
+        Returns the JSON encoding of [batch_header] with [files] under
+        "files". Each file holds its raw "content" alongside metadata
+        that is written as is.
+        """
+        envelope = json.dumps(batch_header)[:-1]
+        envelope += ', "files": {' if batch_header else '"files": {'
+
+        file_parts = []
+
+        for i, (file_path, file) in enumerate(files.items()):
+            separator = ", " if i else ""
+            metadata = json.dumps(
+                {key: value for key, value in file.items() if key != "content"}
+            )[1:-1]
+            metadata_separator = ", " if metadata else ""
+            file_parts.append(
+                (
+                    f'{separator}{json.dumps(file_path)}: {{"content": "'.encode(
+                        "utf-8"
+                    ),
+                    file["content"],
+                    f'"{metadata_separator}{metadata}}}'.encode("utf-8"),
+                )
+            )
+
+        envelope_start = envelope.encode("utf-8")
+        envelope_end = b"}}"
+
+        body = bytearray(
+            len(envelope_start)
+            + sum(
+                len(prefix)
+                + BatchJsonEncoder._get_base64_size_bytes(len(content))
+                + len(suffix)
+                for prefix, content, suffix in file_parts
+            )
+            + len(envelope_end)
+        )
+        body_view = memoryview(body)
+
+        body_view[: len(envelope_start)] = envelope_start
+        offset = len(envelope_start)
+
+        for prefix, content, suffix in file_parts:
+            body_view[offset : offset + len(prefix)] = prefix
+            offset += len(prefix)
+            offset = BatchJsonEncoder._write_base64(body_view, offset, content)
+            body_view[offset : offset + len(suffix)] = suffix
+            offset += len(suffix)
+
+        body_view[offset:] = envelope_end
+        body_view.release()
+
+        return body
@@ -0,0 +1,185 @@
+from typing import Iterable, TypedDict
+import json
+
+from .file_chunkifier import FileChunkifier
+
+
+class FileChunkRange(TypedDict):
+    path: str
+    start: int
+    end: int
+    chunk_index: int
+    num_total_chunks: int
+
+
+class BatchPlanner:
+    """
+    Plans upload batches by the size they take on the wire rather than
+    by raw content size. In the JSON upload format contents are base64
+    encoded, which grows them by a third, and every chunk also carries
+    its path and metadata. Small files are kept whole and packed first
+    fit decreasing, only files larger than a batch are split, and the
+    batches are ordered largest first so that the slowest uploads start
+    first.
+    """
+
+    _BATCH_OVERHEAD_BYTES = 512
+    _CHUNK_OVERHEAD_BYTES = 128
+
+    @staticmethod
+    def get_content_size_bytes(size_bytes: int, upload_format: str = "json") -> int:
+        """
+        Returns the size of [size_bytes] of content once encoded.
+        """
+        if upload_format == "binary":
+            return size_bytes
+
+        return 4 * ((size_bytes + 2) // 3)
+
+    @staticmethod
+    def get_chunk_size_bytes(
+        path: str, size_bytes: int, upload_format: str = "json"
+    ) -> int:
+        """
+        Returns an upper bound on the size a chunk of [size_bytes] of
+        [path] adds to a batch. In the JSON upload format the escaped
+        path is sent twice, as the key of the chunk and of its change.
+        """
+        path_size_bytes = len(json.dumps(path))
+
+        if upload_format != "binary":
+            path_size_bytes *= 2
+
+        return (
+            path_size_bytes
+            + BatchPlanner._CHUNK_OVERHEAD_BYTES
+            + BatchPlanner.get_content_size_bytes(size_bytes, upload_format)
+        )
+
+    @staticmethod
+    def get_batch_size_bytes(
+        planned_batch: list[FileChunkRange], upload_format: str = "json"
+    ) -> int:
+        """
+        Returns an upper bound on the size of [planned_batch] once
+        encoded, before anything other than its chunks is added to it.
+        """
+        return BatchPlanner._BATCH_OVERHEAD_BYTES + sum(
+            BatchPlanner.get_chunk_size_bytes(
+                chunk_range["path"],
+                chunk_range["end"] - chunk_range["start"],
+                upload_format,
+            )
+            for chunk_range in planned_batch
+        )
+
+    @staticmethod
+    def _get_max_chunk_content_size_bytes(
+        path: str, max_chunk_size_bytes: int, upload_format: str
+    ) -> int:
+        """
+        Returns the most content of [path] that fits in a chunk of
+        [max_chunk_size_bytes], and at least one byte so that every
+        file can be planned.
+        """
+        content_size_bytes = max_chunk_size_bytes - (
+            BatchPlanner.get_chunk_size_bytes(path, 0, upload_format)
+        )
+
+        if upload_format != "binary":
+            content_size_bytes = 3 * (content_size_bytes // 4)
+
+        return max(1, content_size_bytes)
+
+    @staticmethod
+    def _chunk_files(
+        file_sizes: Iterable[tuple[str, int]],
+        max_chunk_size_bytes: int,
+        upload_format: str,
+    ) -> list[tuple[int, FileChunkRange]]:
+        """
+        Returns every chunk to plan with its size on the wire. A file
+        is a single chunk unless it does not fit in an empty batch.
+        An empty file is a single chunk with no content, so that it
+        still reaches the server.
+        """
+        chunks = []
+
+        for file_path, file_size_bytes in file_sizes:
+            if (
+                file_size_bytes == 0
+                or BatchPlanner.get_chunk_size_bytes(
+                    file_path, file_size_bytes, upload_format
+                )
+                <= max_chunk_size_bytes
+            ):
+                chunk_ranges = [(0, file_size_bytes)]
+            else:
+                chunk_ranges = FileChunkifier.chunk_ranges(
+                    file_size_bytes,
+                    BatchPlanner._get_max_chunk_content_size_bytes(
+                        file_path, max_chunk_size_bytes, upload_format
+                    ),
+                )
+
+            for i, (start, end) in enumerate(chunk_ranges):
+                chunks.append(
+                    (
+                        BatchPlanner.get_chunk_size_bytes(
+                            file_path, end - start, upload_format
+                        ),
+                        {
+                            "path": file_path,
+                            "start": start,
+                            "end": end,
+                            "chunk_index": i,
+                            "num_total_chunks": len(chunk_ranges),
+                        },
+                    )
+                )
+
+        return chunks
+
+    @staticmethod
+    def plan(
+        file_sizes: Iterable[tuple[str, int]],
+        max_batch_size_bytes: int,
+        upload_format: str = "json",
+    ) -> list[list[FileChunkRange]]:
+        """
+        Plans batches from file sizes alone so that the number of
+        batches is known before any file content is read. Each batch
+        fits in [max_batch_size_bytes] once encoded in
+        [upload_format].
+        """
+        max_chunk_size_bytes = max(
+            1, max_batch_size_bytes - BatchPlanner._BATCH_OVERHEAD_BYTES
+        )
+        chunks = BatchPlanner._chunk_files(
+            file_sizes, max_chunk_size_bytes, upload_format
+        )
+        chunks.sort(
+            key=lambda chunk: (-chunk[0], chunk[1]["path"], chunk[1]["chunk_index"])
+        )
+
+        planned_batches: list[list[FileChunkRange]] = []
+        batch_sizes_bytes: list[int] = []
+
+        for chunk_size_bytes, chunk_range in chunks:
+            for i, batch_size_bytes in enumerate(batch_sizes_bytes):
+                if batch_size_bytes + chunk_size_bytes <= max_chunk_size_bytes:
+                    planned_batches[i].append(chunk_range)
+                    batch_sizes_bytes[i] += chunk_size_bytes
+                    break
+
+            else:
+                planned_batches.append([chunk_range])
+                batch_sizes_bytes.append(chunk_size_bytes)
+
+        return [
+            planned_batch
+            for _, planned_batch in sorted(
+                zip(batch_sizes_bytes, planned_batches),
+                key=lambda sized_batch: -sized_batch[0],
+            )
+        ]
@@ -0,0 +1,52 @@
+from pathlib import Path
+import math, os
+
+
+class CpuLimit:
+    """
+    Number of CPUs the process may actually run on: the CPUs it is
+    pinned to, further limited by the CPU quota of its cgroup (v2
+    cpu.max or v1 cpu.cfs_quota_us), as set by container runtimes.
+    """
+
+    _CGROUP_V2_CPU_MAX_PATH = Path("/sys/fs/cgroup/cpu.max")
+    _CGROUP_V1_QUOTA_PATH = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    _CGROUP_V1_PERIOD_PATH = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+    @staticmethod
+    def _get_num_cgroup_cpus() -> int | None:
+        try:
+            quota, period = CpuLimit._CGROUP_V2_CPU_MAX_PATH.read_text().split()[:2]
+
+        except (OSError, ValueError):
+            try:
+                quota = CpuLimit._CGROUP_V1_QUOTA_PATH.read_text().strip()
+                period = CpuLimit._CGROUP_V1_PERIOD_PATH.read_text().strip()
+
+            except OSError:
+                return None
+
+        try:
+            quota, period = int(quota), int(period)
+
+        except ValueError:
+            return None
+
+        if quota <= 0 or period <= 0:
+            return None
+
+        return max(1, math.ceil(quota / period))
+
+    @staticmethod
+    def get_num_available_cpus() -> int:
+        if hasattr(os, "sched_getaffinity"):
+            num_cpus = len(os.sched_getaffinity(0))
+        else:
+            num_cpus = os.cpu_count() or 1
+
+        num_cgroup_cpus = CpuLimit._get_num_cgroup_cpus()
+
+        if num_cgroup_cpus is not None:
+            num_cpus = min(num_cpus, num_cgroup_cpus)
+
+        return max(1, num_cpus)
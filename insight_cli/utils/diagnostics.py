@@ -0,0 +1,37 @@
+import threading
+
+
+class Diagnostics:
+    """
+    Process-wide registry of named measurements (e.g. the upload
+    concurrency the batch scheduler settled on) that is read when
+    reporting on how a command ran.
+    """
+
+    _values: dict[str, float] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, name: str, value: float) -> None:
+        with cls._lock:
+            cls._values[name] = value
+
+    @classmethod
+    def increment(cls, name: str, amount: float = 1) -> None:
+        with cls._lock:
+            cls._values[name] = cls._values.get(name, 0) + amount
+
+    @classmethod
+    def get(cls, name: str, default: float | None = None) -> float | None:
+        with cls._lock:
+            return cls._values.get(name, default)
+
+    @classmethod
+    def snapshot(cls) -> dict[str, float]:
+        with cls._lock:
+            return dict(cls._values)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._values.clear()
@@ -1,50 +1,148 @@
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
+from typing import TypedDict
 import os
 
-from .file import File
+from .cpu_limit import CpuLimit
+from .file import File, ScanRecord
 from .string_matcher import StringMatcher
 
 
+class ScannedDir(TypedDict):
+    files: list[tuple[str, ScanRecord]]
+    sub_dir_paths: list[str]
+
+
 class Directory:
     def __init__(
         self,
         path: Path,
         ignorable_regex_patterns: dict[str, set],
         allowed_file_extensions: set[str],
+        num_workers: int | None = None,
     ):
+        """
+        The tree is scanned by [num_workers] threads, by default as
+        many as the process has CPUs (see CpuLimit).
+        """
         self._path: Path = path
         self._ignorable_regex_patterns = ignorable_regex_patterns
         self._allowed_file_extensions = allowed_file_extensions
+        self._num_workers = num_workers or CpuLimit.get_num_available_cpus()
         self._files: list[File] = self._get_files(self._path)
 
-    def _entry_path_is_ignorable(self, entry_path: Path, pattern_scope: str) -> bool:
+    def _entry_path_is_ignorable(self, entry_path: str, pattern_scope: str) -> bool:
         if pattern_scope == "file":
             _, file_extension = os.path.splitext(entry_path)
             if file_extension not in self._allowed_file_extensions:
                 return True
 
         return StringMatcher.matches_any_regex_pattern(
-            str(entry_path), self._ignorable_regex_patterns[pattern_scope]
+            entry_path, self._ignorable_regex_patterns[pattern_scope]
         )
 
+    def _scan_dir(self, dir_path: str) -> ScannedDir:
+        """
+        Lists [dir_path] with os.scandir, which tells files from
+        directories without stat'ing them, in name order. Entry paths
+        are matched as strings spelled as pathlib spells them, and
+        each file that is not ignored is stat'ed exactly once, into
+        its ScanRecord. Links to directories are not followed, and
+        files that vanish during the scan or are broken links are
+        skipped.
+        """
+        prefix = "" if dir_path == "." else os.path.join(dir_path, "")
+        scanned_dir: ScannedDir = {"files": [], "sub_dir_paths": []}
+
+        try:
+            with os.scandir(dir_path) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+
+        except OSError:
+            return scanned_dir
+
+        for entry in entries:
+            entry_path = prefix + entry.name
+
+            try:
+                is_dir = entry.is_dir()
+
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                if not entry.is_symlink() and not self._entry_path_is_ignorable(
+                    entry_path, "directory"
+                ):
+                    scanned_dir["sub_dir_paths"].append(entry_path)
+
+                continue
+
+            if self._entry_path_is_ignorable(entry_path, "file"):
+                continue
+
+            try:
+                stat_result = entry.stat()
+
+            except OSError:
+                continue
+
+            scanned_dir["files"].append((entry_path, File.get_scan_record(stat_result)))
+
+        return scanned_dir
+
     def _get_files(self, dir_path: Path) -> list[File]:
-        files = []
+        """
+        Directories are scanned from a work queue by [num_workers]
+        threads, since os.scandir and stat release the GIL while they
+        wait on the filesystem. Ignored directories are pruned as they
+        are found. The files are put together afterwards in the order
+        of a sequential top-down walk with every directory listed in
+        name order, whatever order the directories were scanned in.
+        """
+        root = str(dir_path)
+        scanned_dirs: dict[str, ScannedDir] = {}
+
+        if self._num_workers == 1:
+            dir_paths = [root]
+
+            while dir_paths:
+                path = dir_paths.pop()
+                scanned_dirs[path] = self._scan_dir(path)
+                dir_paths.extend(scanned_dirs[path]["sub_dir_paths"])
+
+            return self._collect_files(root, scanned_dirs)
+
+        with ThreadPoolExecutor(
+            max_workers=self._num_workers, thread_name_prefix="insight-scan"
+        ) as executor:
+            futures = {executor.submit(self._scan_dir, root): root}
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
 
-        for root, directories, file_names in os.walk(dir_path):
-            root_path = Path(root)
+                for future in done:
+                    scanned_dir = scanned_dirs[futures.pop(future)] = future.result()
 
-            directories[:] = [
-                directory
-                for directory in directories
-                if not self._entry_path_is_ignorable(root_path / directory, "directory")
-            ]
+                    for sub_dir_path in scanned_dir["sub_dir_paths"]:
+                        sub_dir_future = executor.submit(self._scan_dir, sub_dir_path)
+                        futures[sub_dir_future] = sub_dir_path
 
-            for file_name in file_names:
-                file_path = root_path / file_name
-                if not self._entry_path_is_ignorable(file_path, "file"):
-                    files.append(File(file_path))
+        return self._collect_files(root, scanned_dirs)
+
+    @staticmethod
+    def _collect_files(root: str, scanned_dirs: dict[str, ScannedDir]) -> list[File]:
+        files = []
+        dir_paths = [root]
+
+        while dir_paths:
+            scanned_dir = scanned_dirs[dir_paths.pop()]
+            files.extend(
+                File(Path(file_path), scan_record)
+                for file_path, scan_record in scanned_dir["files"]
+            )
+            dir_paths.extend(reversed(scanned_dir["sub_dir_paths"]))
 
         return files
 
@@ -58,18 +156,7 @@ class Directory:
 
     @property
     def file_modified_times(self) -> dict[Path, datetime]:
-        return {
-            file_path: datetime.fromtimestamp(os.path.getmtime(file_path))
-            for file_path in self.file_paths
-        }
-
-    @property
-    def file_paths_to_content(self) -> dict[str, bytes]:
-        with ThreadPoolExecutor() as executor:
-            path_content_pairs = executor.map(
-                lambda file: (file.path, file.content), self._files
-            )
-            return {str(path): content for path, content in path_content_pairs}
+        return {file.path: file.modified_time for file in self._files}
 
     @property
     def is_empty(self) -> bool:
@@ -80,4 +167,4 @@ class Directory:
         if self.is_empty:
             return None
         
-        return max(self._files, key=lambda file: os.path.getsize(file.path))
+        return max(self._files, key=lambda file: file.size_bytes)
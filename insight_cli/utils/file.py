@@ -1,37 +1,137 @@
+from datetime import datetime
 from pathlib import Path
-import functools, os
+from typing import TypedDict
+import hashlib, os
+
+
+class ScanRecord(TypedDict):
+    size_bytes: int
+    modified_time_ns: int
+    inode: int
 
 
 class File:
     _instances: dict[Path, "File"] = {}
+    _HASH_BLOCK_SIZE_BYTES = 1024**2
 
-    def __new__(cls, path: Path):
+    def __new__(cls, path: Path, scan_record: ScanRecord | None = None):
         """
         The __new__ method ensures a Singleton pattern per unique
         path. If an instance A is created with a path used by
         another instance B, A is not a new instance but is B itself.
         """
         if path not in cls._instances:
-            cls._instances[path] = super(File, cls).__new__(cls)
+            instance = super(File, cls).__new__(cls)
+            instance._scan_record = None
+            cls._instances[path] = instance
 
         return cls._instances[path]
 
-    def __init__(self, path: Path):
+    @staticmethod
+    def get_blob_hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=32).hexdigest()
+
+    @staticmethod
+    def get_scan_record(stat_result: os.stat_result) -> ScanRecord:
+        return {
+            "size_bytes": stat_result.st_size,
+            "modified_time_ns": stat_result.st_mtime_ns,
+            "inode": stat_result.st_ino,
+        }
+
+    def __init__(self, path: Path, scan_record: ScanRecord | None = None):
         self._path: Path = path
 
+        if scan_record is not None:
+            self._scan_record = scan_record
+
     @property
     def path(self) -> Path:
         return self._path
 
+    @property
+    def scan_record(self) -> ScanRecord:
+        """
+        The stat results of the latest scan that found the file (see
+        Directory), so that they are read once per scan. A file that
+        was not scanned is stat'ed on every access.
+        """
+        if self._scan_record is None:
+            return File.get_scan_record(os.stat(self._path))
+
+        return self._scan_record
+
     @property
     def size_bytes(self) -> int:
-        return os.path.getsize(self._path)
+        return self.scan_record["size_bytes"]
+
+    @property
+    def modified_time(self) -> datetime:
+        """
+        Equal to the datetime of os.path.getmtime, which is computed
+        from the seconds and nanoseconds in the same way.
+        """
+        seconds, nanoseconds = divmod(self.scan_record["modified_time_ns"], 10**9)
+
+        return datetime.fromtimestamp(seconds + nanoseconds * 1e-9)
 
     @property
-    @functools.lru_cache(maxsize=None)
     def content(self) -> bytes:
-        if not self._path.is_file():
+        return self.read_range(0)
+
+    @property
+    def blob_hash(self) -> str:
+        """
+        BLAKE2b digest of the content. It identifies the content on
+        the server independently of the path it is stored at.
+        """
+        blob_hash = hashlib.blake2b(digest_size=32)
+
+        try:
+            with open(self._path, "rb") as file:
+                while block := file.read(File._HASH_BLOCK_SIZE_BYTES):
+                    blob_hash.update(block)
+
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+
+        return blob_hash.hexdigest()
+
+    def read_range(self, start: int, end: int | None = None) -> bytes:
+        """
+        Content is read from disk on every call rather than cached
+        so that only the bytes currently being uploaded are held in
+        memory. A missing file reads as empty.
+        """
+        try:
+            with open(self._path, "rb") as file:
+                file.seek(start)
+                return file.read() if end is None else file.read(end - start)
+
+        except (FileNotFoundError, IsADirectoryError):
             return b""
 
-        with open(self._path, "rb") as file:
-            return file.read()
+    def read_range_into(self, start: int, buffer: memoryview) -> int:
+        """
+        Reads content from [start] straight into [buffer], without an
+        intermediate bytes object, until it is full or the file ends.
+        Returns the number of bytes read.
+        """
+        num_read_bytes = 0
+
+        try:
+            with open(self._path, "rb", buffering=0) as file:
+                file.seek(start)
+
+                while num_read_bytes < len(buffer):
+                    num_bytes = file.readinto(buffer[num_read_bytes:])
+
+                    if not num_bytes:
+                        break
+
+                    num_read_bytes += num_bytes
+
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+
+        return num_read_bytes
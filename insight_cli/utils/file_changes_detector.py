@@ -1,25 +1,11 @@
 from datetime import datetime
 from pathlib import Path
-import concurrent, functools
+import functools
 
 from .file import File
 
 
 class FileChangesDetector:
-    @staticmethod
-    def _get_file_content(change, path) -> tuple[str, bytes]:
-        match change:
-            case "add":
-                content = File(path).content
-            case "update":
-                content = File(path).content
-            case "delete":
-                content = b""
-            case _:
-                raise ValueError(f"Invalid change: {change}")
-
-        return str(path), content
-
     def __init__(
         self,
         previous_file_modified_times: dict[Path, datetime],
@@ -73,18 +59,16 @@ class FileChangesDetector:
         }
 
     @property
-    def file_changes(self) -> dict[str, list[tuple[str, bytes]]]:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            return {
-                change: list(
-                    executor.map(
-                        FileChangesDetector._get_file_content,
-                        [change] * len(paths),
-                        paths,
-                    )
-                )
-                for change, paths in self.file_path_changes.items()
-            }
+    def file_changes(self) -> dict[str, list[File]]:
+        """
+        Changed files are returned as File handles rather than their
+        content. Content is read lazily, one batch at a time, by the
+        upload pipeline.
+        """
+        return {
+            change: [File(path) for path in paths]
+            for change, paths in self.file_path_changes.items()
+        }
 
     @property
     def no_files_changes_exist(self) -> bool:
@@ -0,0 +1,132 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import TypedDict
+import bisect
+
+
+class LineEdit(TypedDict):
+    start_line: int
+    end_line: int
+    content: bytes
+
+
+class FileDelta:
+    """
+    Line-level difference between two versions of a file. Each edit
+    replaces the lines [start_line, end_line) of the base version,
+    counted from 0, with [content]. Edits are ordered and refer to
+    line numbers of the base version.
+
+    Versions are first aligned on the lines that occur once in each
+    (patience diff), which takes O(n log n) in the number of lines.
+    Only the gaps between those lines that are small enough are
+    compared line by line, as that comparison is quadratic; larger
+    gaps are replaced whole.
+    """
+
+    _MAX_GAP_NUM_COMPARISONS = 64 * 64
+
+    @staticmethod
+    def _get_unique_line_matches(
+        base_lines: list[bytes], new_lines: list[bytes]
+    ) -> list[tuple[int, int]]:
+        """
+        Returns the longest sequence of (base line, new line) index
+        pairs, increasing in both, of the lines that occur once in
+        each version.
+        """
+        base_line_counts = Counter(base_lines)
+        new_line_counts = Counter(new_lines)
+        base_line_indices = {
+            line: i for i, line in enumerate(base_lines) if base_line_counts[line] == 1
+        }
+        matches = [
+            (base_line_indices[line], j)
+            for j, line in enumerate(new_lines)
+            if new_line_counts[line] == 1 and line in base_line_indices
+        ]
+
+        pile_tops: list[int] = []
+        pile_top_matches: list[int] = []
+        previous_matches: list[int] = []
+
+        for k, (i, _) in enumerate(matches):
+            pile = bisect.bisect_left(pile_tops, i)
+            previous_matches.append(pile_top_matches[pile - 1] if pile else -1)
+
+            if pile == len(pile_tops):
+                pile_tops.append(i)
+                pile_top_matches.append(k)
+            else:
+                pile_tops[pile] = i
+                pile_top_matches[pile] = k
+
+        longest_matches = []
+        k = pile_top_matches[-1] if pile_top_matches else -1
+
+        while k >= 0:
+            longest_matches.append(matches[k])
+            k = previous_matches[k]
+
+        return longest_matches[::-1]
+
+    @staticmethod
+    def create(base_content: bytes, content: bytes) -> list[LineEdit]:
+        base_lines = base_content.splitlines(keepends=True)
+        new_lines = content.splitlines(keepends=True)
+        line_edits: list[LineEdit] = []
+        base_start_line, new_start_line = 0, 0
+
+        for base_end_line, new_end_line in [
+            *FileDelta._get_unique_line_matches(base_lines, new_lines),
+            (len(base_lines), len(new_lines)),
+        ]:
+            base_gap_lines = base_lines[base_start_line:base_end_line]
+            new_gap_lines = new_lines[new_start_line:new_end_line]
+
+            if base_gap_lines == new_gap_lines:
+                pass
+
+            elif (
+                len(base_gap_lines) * len(new_gap_lines)
+                <= FileDelta._MAX_GAP_NUM_COMPARISONS
+            ):
+                line_edits += [
+                    {
+                        "start_line": base_start_line + i1,
+                        "end_line": base_start_line + i2,
+                        "content": b"".join(new_gap_lines[j1:j2]),
+                    }
+                    for tag, i1, i2, j1, j2 in SequenceMatcher(
+                        None, base_gap_lines, new_gap_lines, autojunk=False
+                    ).get_opcodes()
+                    if tag != "equal"
+                ]
+
+            else:
+                line_edits.append(
+                    {
+                        "start_line": base_start_line,
+                        "end_line": base_end_line,
+                        "content": b"".join(new_gap_lines),
+                    }
+                )
+
+            base_start_line, new_start_line = base_end_line + 1, new_end_line + 1
+
+        return line_edits
+
+    @staticmethod
+    def apply(base_content: bytes, line_edits: list[LineEdit]) -> bytes:
+        lines = base_content.splitlines(keepends=True)
+
+        for line_edit in reversed(line_edits):
+            lines[line_edit["start_line"] : line_edit["end_line"]] = [
+                line_edit["content"]
+            ]
+
+        return b"".join(lines)
+
+    @staticmethod
+    def get_size_bytes(line_edits: list[LineEdit]) -> int:
+        return sum(len(line_edit["content"]) for line_edit in line_edits)
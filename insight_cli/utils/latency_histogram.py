@@ -0,0 +1,90 @@
+import math
+
+
+class LatencyHistogram:
+    """
+    Compact histogram of latencies in log-scaled buckets, 8 per
+    doubling, so that any percentile is reported within about 9% of
+    the latency it stands for whatever the number of samples. Only
+    the non-empty buckets are stored, as a bucket index to count map
+    that can be written to and read from JSON.
+    """
+
+    _BUCKETS_PER_DOUBLING = 8
+    _MIN_LATENCY_SECONDS = 1e-6
+
+    @staticmethod
+    def _get_bucket_index(latency_seconds: float) -> int:
+        return math.ceil(
+            math.log2(max(latency_seconds, LatencyHistogram._MIN_LATENCY_SECONDS))
+            * LatencyHistogram._BUCKETS_PER_DOUBLING
+        )
+
+    @staticmethod
+    def _get_bucket_latency_seconds(bucket_index: int) -> float:
+        """
+        The upper bound of the bucket.
+        """
+        return 2 ** (bucket_index / LatencyHistogram._BUCKETS_PER_DOUBLING)
+
+    @staticmethod
+    def from_dict(counts: dict[str, int]) -> "LatencyHistogram":
+        histogram = LatencyHistogram()
+        histogram._counts = {
+            int(bucket_index): count for bucket_index, count in counts.items()
+        }
+
+        return histogram
+
+    def __init__(self):
+        self._counts: dict[int, int] = {}
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            str(bucket_index): count
+            for bucket_index, count in sorted(self._counts.items())
+        }
+
+    @property
+    def num_samples(self) -> int:
+        return sum(self._counts.values())
+
+    def record(self, latency_seconds: float) -> None:
+        bucket_index = LatencyHistogram._get_bucket_index(latency_seconds)
+        self._counts[bucket_index] = self._counts.get(bucket_index, 0) + 1
+
+    def merge(self, histogram: "LatencyHistogram") -> None:
+        for bucket_index, count in histogram._counts.items():
+            self._counts[bucket_index] = self._counts.get(bucket_index, 0) + count
+
+    def get_latencies_seconds(self) -> list[float]:
+        """
+        Returns the upper bound of the bucket of every sample, in
+        increasing order.
+        """
+        return [
+            LatencyHistogram._get_bucket_latency_seconds(bucket_index)
+            for bucket_index, count in sorted(self._counts.items())
+            for _ in range(count)
+        ]
+
+    def get_percentile(self, percentile: float) -> float | None:
+        """
+        Returns the upper bound of the bucket holding the sample of
+        rank [percentile]% by the nearest-rank method, or None if
+        there are no samples.
+        """
+        num_samples = self.num_samples
+
+        if num_samples == 0:
+            return None
+
+        rank = max(1, math.ceil(num_samples * percentile / 100))
+
+        for bucket_index, count in sorted(self._counts.items()):
+            rank -= count
+
+            if rank <= 0:
+                return LatencyHistogram._get_bucket_latency_seconds(bucket_index)
+
+        return LatencyHistogram._get_bucket_latency_seconds(max(self._counts))
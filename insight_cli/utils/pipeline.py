@@ -0,0 +1,61 @@
+from typing import Iterable, Iterator, TypeVar
+import queue, threading
+
+T = TypeVar("T")
+
+
+class Pipeline:
+    _DONE = object()
+    _PUT_TIMEOUT_SECONDS = 0.1
+
+    @classmethod
+    def _put(cls, buffer: queue.Queue, item: tuple, stopped: threading.Event) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=cls._PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    @classmethod
+    def stage(cls, iterable: Iterable[T], max_size: int) -> Iterator[T]:
+        """
+        Consumes [iterable] on a background thread and yields its
+        items through a queue holding at most [max_size] items, so a
+        fast producer can run ahead of its consumer by a bounded
+        amount only. Exceptions raised by the producer are re-raised
+        in the consumer. Closing the returned generator stops the
+        producer.
+        """
+        buffer = queue.Queue(maxsize=max_size)
+        stopped = threading.Event()
+
+        def produce() -> None:
+            try:
+                for item in iterable:
+                    if not cls._put(buffer, (True, item), stopped):
+                        return
+
+                cls._put(buffer, (True, cls._DONE), stopped)
+
+            except BaseException as e:
+                cls._put(buffer, (False, e), stopped)
+
+        threading.Thread(target=produce, daemon=True).start()
+
+        try:
+            while True:
+                is_item, item = buffer.get()
+
+                if not is_item:
+                    raise item
+
+                if item is cls._DONE:
+                    return
+
+                yield item
+
+        finally:
+            stopped.set()
@@ -0,0 +1,37 @@
+import cProfile, sys
+
+from .tracer import Tracer
+
+
+class Profiler:
+    """
+    Records the spans of a command (see Tracer) and a cProfile profile
+    of its main thread while entered. On exit, the spans are written to
+    [path_prefix].trace.json and the profile to [path_prefix].pstats,
+    and a summary of the slowest phases is printed to stderr.
+    """
+
+    DEFAULT_PATH_PREFIX = "insight-profile"
+
+    def __init__(self, path_prefix: str = DEFAULT_PATH_PREFIX):
+        self._trace_path = f"{path_prefix}.trace.json"
+        self._pstats_path = f"{path_prefix}.pstats"
+        self._profile = cProfile.Profile()
+
+    def __enter__(self) -> "Profiler":
+        Tracer.start()
+        self._profile.enable()
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._profile.disable()
+        events = Tracer.stop()
+
+        Tracer.write_chrome_trace(events, self._trace_path)
+        self._profile.dump_stats(self._pstats_path)
+
+        for line in Tracer.get_summary(events):
+            print(line, file=sys.stderr)
+
+        print(f"Wrote {self._trace_path} and {self._pstats_path}", file=sys.stderr)
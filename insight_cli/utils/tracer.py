@@ -0,0 +1,98 @@
+from typing import Iterator
+import asyncio, contextlib, json, os, threading, time
+
+
+class Tracer:
+    """
+    Process-wide recorder of timed spans around the phases of a command
+    (validation, scan, diff, read, encode, requests, query, render), as
+    Chrome trace events that Perfetto and chrome://tracing can open.
+    Spans are only recorded between start and stop, and otherwise cost
+    a single check.
+    """
+
+    _events: list[dict] | None = None
+    _start_time_ns = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _get_track_id() -> int:
+        """
+        Spans of asyncio tasks that run concurrently on one thread are
+        put on separate tracks.
+        """
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+
+        return threading.get_ident() if task is None else id(task)
+
+    @staticmethod
+    def start() -> None:
+        with Tracer._lock:
+            Tracer._events = []
+            Tracer._start_time_ns = time.perf_counter_ns()
+
+    @staticmethod
+    def stop() -> list[dict]:
+        with Tracer._lock:
+            events, Tracer._events = Tracer._events or [], None
+
+        return events
+
+    @staticmethod
+    @contextlib.contextmanager
+    def span(name: str, **args) -> Iterator[None]:
+        if Tracer._events is None:
+            yield
+            return
+
+        start_time_ns = time.perf_counter_ns()
+
+        try:
+            yield
+
+        finally:
+            end_time_ns = time.perf_counter_ns()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start_time_ns - Tracer._start_time_ns) / 1000,
+                "dur": (end_time_ns - start_time_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": Tracer._get_track_id(),
+                "args": args,
+            }
+
+            with Tracer._lock:
+                if Tracer._events is not None:
+                    Tracer._events.append(event)
+
+    @staticmethod
+    def write_chrome_trace(events: list[dict], path: str) -> None:
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    @staticmethod
+    def get_summary(events: list[dict], num_phases: int = 10) -> list[str]:
+        """
+        Returns a line for each of the [num_phases] phases with the
+        longest total duration, with their count and longest span.
+        """
+        phases: dict[str, list[float]] = {}
+
+        for event in events:
+            phases.setdefault(event["name"], []).append(event["dur"] / 1000)
+
+        lines = [f"{'phase':<40}{'count':>7}{'total ms':>12}{'max ms':>12}"]
+
+        for name, durations_ms in sorted(
+            phases.items(), key=lambda phase: -sum(phase[1])
+        )[:num_phases]:
+            lines.append(
+                f"{name[:39]:<40}{len(durations_ms):>7}"
+                f"{sum(durations_ms):>12.1f}{max(durations_ms):>12.1f}"
+            )
+
+        return lines
@@ -0,0 +1,11 @@
+#!/bin/bash
+
+# run an insight-cli benchmark module (end_to_end by default) with the
+# given arguments, e.g. ./run-benchmarks.sh filesystem_scan --num-files 1000
+
+cd ..
+
+benchmark=${1:-end_to_end}
+shift
+
+python -m "benchmarks.$benchmark" "$@"
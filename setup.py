@@ -11,7 +11,7 @@ def main():
     setuptools.setup(
         name="insight-cli",
         version=config.INSIGHT_VERSION,
-        packages=setuptools.find_packages(),
+        packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*"]),
         entry_points={
             "console_scripts": ["insight = insight_cli:main"],
         },
@@ -19,6 +19,9 @@ def main():
             "colorama==0.4.6",
             "requests==2.31.0",
         ],
+        extras_require={
+            "zstd": ["zstandard"],
+        },
         python_requires=">=3.10.0",
         long_description=get_readme(),
         long_description_content_type="text/markdown"
@@ -0,0 +1,69 @@
+from unittest.mock import patch, MagicMock
+import asyncio, requests, threading, unittest
+
+from insight_cli.api.base import AsyncAPI, Client, RetryPolicy
+from insight_cli.config import config
+
+
+class TestAsyncAPI(unittest.TestCase):
+    @patch("requests.Session.request")
+    def test_request(self, mock_session_request) -> None:
+        response = MagicMock()
+        mock_session_request.return_value = response
+
+        self.assertIs(
+            asyncio.run(AsyncAPI._request("POST", "create_repository")), response
+        )
+        mock_session_request.assert_called_once_with(
+            "POST",
+            url=f"{config.INSIGHT_API_BASE_URL}/create_repository",
+            timeout=config.INSIGHT_API_TIMEOUTS["create_repository"],
+        )
+
+    @patch("requests.Session.request")
+    def test_request_with_retry_policy(self, mock_session_request) -> None:
+        response = MagicMock()
+        mock_session_request.side_effect = [
+            requests.exceptions.ConnectionError(),
+            response,
+        ]
+
+        self.assertIs(
+            asyncio.run(
+                AsyncAPI._request(
+                    "GET",
+                    "query_repository",
+                    retry_policy=RetryPolicy(base_delay_seconds=0.001),
+                )
+            ),
+            response,
+        )
+        self.assertEqual(mock_session_request.call_count, 2)
+
+    @patch("requests.Session.request")
+    def test_requests_run_concurrently_on_one_event_loop(
+        self, mock_session_request
+    ) -> None:
+        barrier = threading.Barrier(3, timeout=5)
+
+        def request(*args, **kwargs) -> MagicMock:
+            barrier.wait()
+            return MagicMock()
+
+        mock_session_request.side_effect = request
+
+        async def make_requests() -> None:
+            await asyncio.gather(
+                *(AsyncAPI._request("POST", "create_repository") for _ in range(3))
+            )
+
+        asyncio.run(make_requests())
+
+        self.assertEqual(mock_session_request.call_count, 3)
+
+    def test_requests_share_client_executor(self) -> None:
+        self.assertIs(Client().executor, Client().executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+from unittest.mock import MagicMock
+import asyncio, requests, threading, time, unittest
+
+from insight_cli.api.base import BatchScheduler, RetryPolicy
+from insight_cli.utils import Diagnostics
+
+
+def http_error(status_code: int) -> requests.exceptions.HTTPError:
+    return requests.exceptions.HTTPError(
+        response=MagicMock(status_code=status_code, headers={})
+    )
+
+
+class TestBatchScheduler(unittest.TestCase):
+    def test_init_with_invalid_max_concurrency(self) -> None:
+        with self.assertRaises(ValueError):
+            BatchScheduler(max_concurrency=0)
+
+    def test_init_clamps_initial_concurrency(self) -> None:
+        self.assertEqual(BatchScheduler(4, 10).concurrency, 4)
+        self.assertEqual(BatchScheduler(4, 0).concurrency, 1)
+
+    def test_is_congestion_error(self) -> None:
+        self.assertTrue(
+            BatchScheduler.is_congestion_error(requests.exceptions.ReadTimeout())
+        )
+        self.assertTrue(
+            BatchScheduler.is_congestion_error(requests.exceptions.ConnectionError())
+        )
+        self.assertTrue(BatchScheduler.is_congestion_error(http_error(429)))
+        self.assertTrue(BatchScheduler.is_congestion_error(http_error(503)))
+        self.assertFalse(BatchScheduler.is_congestion_error(http_error(404)))
+        self.assertFalse(BatchScheduler.is_congestion_error(ValueError()))
+
+    def test_run_calls_every_batch(self) -> None:
+        completed_batches = []
+
+        BatchScheduler(4, 1).run(range(50), completed_batches.append)
+
+        self.assertEqual(sorted(completed_batches), list(range(50)))
+
+    def test_run_grows_concurrency_while_latency_is_flat(self) -> None:
+        scheduler = BatchScheduler(8, 1)
+
+        scheduler.run(range(100), lambda batch: time.sleep(0.005))
+
+        self.assertEqual(scheduler.concurrency, 8)
+        self.assertEqual(Diagnostics.get("batch_scheduler.concurrency"), 8)
+
+    def test_run_never_exceeds_max_concurrency(self) -> None:
+        lock = threading.Lock()
+        num_in_flight, max_num_in_flight = 0, 0
+
+        def make_batch_request(batch) -> None:
+            nonlocal num_in_flight, max_num_in_flight
+            with lock:
+                num_in_flight += 1
+                max_num_in_flight = max(max_num_in_flight, num_in_flight)
+            time.sleep(0.002)
+            with lock:
+                num_in_flight -= 1
+
+        BatchScheduler(3, 1).run(range(60), make_batch_request)
+
+        self.assertLessEqual(max_num_in_flight, 3)
+
+    def test_on_success_holds_concurrency_when_latency_grows(self) -> None:
+        scheduler = BatchScheduler(8, 4)
+        scheduler._on_success(1.0)
+        concurrency = scheduler._concurrency
+
+        scheduler._on_success(10.0)
+
+        self.assertEqual(scheduler._concurrency, concurrency)
+
+    def test_on_congestion_halves_concurrency_once_per_event(self) -> None:
+        scheduler = BatchScheduler(8, 8)
+        start_time = time.monotonic()
+
+        scheduler._on_congestion(start_time)
+        scheduler._on_congestion(start_time)
+
+        self.assertEqual(scheduler.concurrency, 4)
+
+        scheduler._on_congestion(time.monotonic())
+
+        self.assertEqual(scheduler.concurrency, 2)
+
+    def test_run_backs_off_and_raises_on_congestion(self) -> None:
+        scheduler = BatchScheduler(8, 8)
+
+        def make_batch_request(batch) -> None:
+            raise http_error(503)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            scheduler.run(range(1), make_batch_request)
+
+        self.assertEqual(scheduler.concurrency, 4)
+
+    def test_run_raises_non_congestion_error_without_backing_off(self) -> None:
+        scheduler = BatchScheduler(8, 8)
+
+        def make_batch_request(batch) -> None:
+            raise http_error(400)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            scheduler.run(range(1), make_batch_request)
+
+        self.assertEqual(scheduler.concurrency, 8)
+
+    def test_run_retries_failed_batches(self) -> None:
+        attempts = {}
+
+        def make_batch_request(batch) -> None:
+            attempts[batch] = attempts.get(batch, 0) + 1
+            if attempts[batch] == 1:
+                raise http_error(503)
+
+        retry_policy = RetryPolicy(max_attempts=2, base_delay_seconds=0.001)
+
+        BatchScheduler(4, 4).run(range(5), make_batch_request, retry_policy)
+
+        self.assertEqual(attempts, {batch: 2 for batch in range(5)})
+
+    def test_run_raises_when_retries_are_exhausted(self) -> None:
+        make_batch_request = MagicMock(side_effect=http_error(503))
+        retry_policy = RetryPolicy(max_attempts=3, base_delay_seconds=0.001)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            BatchScheduler(4, 1).run(range(1), make_batch_request, retry_policy)
+
+        self.assertEqual(make_batch_request.call_count, 3)
+
+    def test_run_async_calls_every_batch(self) -> None:
+        completed_batches = []
+
+        asyncio.run(BatchScheduler(4, 1).run_async(range(50), completed_batches.append))
+
+        self.assertEqual(sorted(completed_batches), list(range(50)))
+
+    def test_run_async_retries_failed_batches(self) -> None:
+        attempts = {}
+
+        def make_batch_request(batch) -> None:
+            attempts[batch] = attempts.get(batch, 0) + 1
+            if attempts[batch] == 1:
+                raise http_error(503)
+
+        retry_policy = RetryPolicy(max_attempts=2, base_delay_seconds=0.001)
+
+        asyncio.run(
+            BatchScheduler(4, 4).run_async(range(5), make_batch_request, retry_policy)
+        )
+
+        self.assertEqual(attempts, {batch: 2 for batch in range(5)})
+
+    def test_run_async_raises_non_retryable_error(self) -> None:
+        make_batch_request = MagicMock(side_effect=http_error(404))
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            asyncio.run(BatchScheduler(4, 1).run_async(range(3), make_batch_request))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+from unittest.mock import patch, MagicMock
+import unittest
+
+from insight_cli.api.base import (
+    Client,
+    Deadline,
+    DeadlineExceededError,
+    RequestBodyCompressor,
+    RequestMetrics,
+)
+from insight_cli.config import config
+
+
+class TestClient(unittest.TestCase):
+    def test_singleton_pattern(self) -> None:
+        self.assertIs(Client(), Client())
+        self.assertIs(Client()._session, Client()._session)
+
+    def test_session_pool_size_matches_max_concurrency(self) -> None:
+        adapter = Client()._session.get_adapter(config.INSIGHT_API_BASE_URL)
+
+        self.assertEqual(adapter._pool_maxsize, config.INSIGHT_API_MAX_CONCURRENCY)
+
+    def test_session_default_headers(self) -> None:
+        headers = Client()._session.headers
+
+        self.assertEqual(headers["User-Agent"], f"insight-cli/{config.INSIGHT_VERSION}")
+        self.assertEqual(headers["Accept"], "application/json")
+        self.assertIn("gzip", headers["Accept-Encoding"])
+
+    def test_get_timeout(self) -> None:
+        self.assertEqual(
+            Client.get_timeout("query_repository"),
+            config.INSIGHT_API_TIMEOUTS["query_repository"],
+        )
+        self.assertEqual(
+            Client.get_timeout("unknown_endpoint"), config.INSIGHT_API_DEFAULT_TIMEOUT
+        )
+
+    @patch("requests.Session.request")
+    def test_request(self, mock_session_request) -> None:
+        mock_raise_for_status = MagicMock()
+        mock_session_request.return_value = MagicMock(
+            raise_for_status=mock_raise_for_status
+        )
+
+        Client().request("POST", "validate_repository_id", json={})
+
+        mock_session_request.assert_called_once_with(
+            "POST",
+            url=f"{config.INSIGHT_API_BASE_URL}/validate_repository_id",
+            json={},
+            timeout=config.INSIGHT_API_TIMEOUTS["validate_repository_id"],
+        )
+        mock_raise_for_status.assert_called_once()
+
+    @patch("requests.Session.request")
+    def test_request_with_explicit_timeout(self, mock_session_request) -> None:
+        Client().request("GET", "query_repository", timeout=1)
+
+        mock_session_request.assert_called_once_with(
+            "GET",
+            url=f"{config.INSIGHT_API_BASE_URL}/query_repository",
+            timeout=1,
+        )
+
+    @patch("requests.Session.request")
+    def test_request_within_deadline(self, mock_session_request) -> None:
+        with Deadline(1):
+            Client().request("GET", "query_repository")
+
+        connect_timeout, read_timeout = mock_session_request.call_args.kwargs[
+            "timeout"
+        ]
+        self.assertLessEqual(connect_timeout, 1)
+        self.assertLessEqual(read_timeout, 1)
+
+    @patch("requests.Session.request")
+    def test_request_after_deadline(self, mock_session_request) -> None:
+        with Deadline(0), self.assertRaises(DeadlineExceededError) as context:
+            Client().request("GET", "query_repository")
+
+        self.assertEqual(context.exception.stage, "query_repository")
+        mock_session_request.assert_not_called()
+
+    @patch("insight_cli.config.INSIGHT_API_REQUEST_COMPRESSION", True)
+    @patch("insight_cli.api.base.request_body_compressor.zstandard", None)
+    @patch("requests.Session.request")
+    def test_request_with_compressed_json(self, mock_session_request) -> None:
+        mock_session_request.return_value = MagicMock(status_code=200)
+
+        with patch.object(Client(), "_request_body_compressor", RequestBodyCompressor()):
+            Client().request("POST", "initialize_repository", compress=True, json={})
+
+        mock_session_request.assert_called_once_with(
+            "POST",
+            url=f"{config.INSIGHT_API_BASE_URL}/initialize_repository",
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            data=RequestBodyCompressor().compress(b"{}")[0],
+            timeout=config.INSIGHT_API_TIMEOUTS["initialize_repository"],
+        )
+
+    @patch("insight_cli.config.INSIGHT_API_REQUEST_COMPRESSION", True)
+    @patch("insight_cli.api.base.request_body_compressor.zstandard", None)
+    @patch("requests.Session.request")
+    def test_request_with_rejected_compression(self, mock_session_request) -> None:
+        for status_code in [415, 400]:
+            with self.subTest(status_code=status_code):
+                mock_session_request.reset_mock()
+                mock_session_request.side_effect = [
+                    MagicMock(status_code=status_code),
+                    MagicMock(status_code=200),
+                ]
+
+                with patch.object(
+                    Client(), "_request_body_compressor", RequestBodyCompressor()
+                ):
+                    Client().request(
+                        "POST", "initialize_repository", compress=True, json={}
+                    )
+
+                    self.assertEqual(
+                        Client()._request_body_compressor.encoding,
+                        RequestBodyCompressor.IDENTITY,
+                    )
+
+                self.assertEqual(mock_session_request.call_count, 2)
+                self.assertEqual(
+                    mock_session_request.call_args.kwargs["headers"],
+                    {"Content-Type": "application/json"},
+                )
+                self.assertEqual(mock_session_request.call_args.kwargs["data"], b"{}")
+
+    @patch("requests.Session.request")
+    def test_request_is_uncompressed_by_default(self, mock_session_request) -> None:
+        mock_session_request.return_value = MagicMock(status_code=200)
+
+        with patch.object(
+            Client(), "_request_body_compressor", RequestBodyCompressor()
+        ):
+            Client().request("POST", "initialize_repository", compress=True, json={})
+
+        self.assertNotIn(
+            "Content-Encoding", mock_session_request.call_args.kwargs["headers"]
+        )
+        self.assertEqual(mock_session_request.call_args.kwargs["data"], b"{}")
+
+    @patch("requests.Session.request")
+    def test_request_is_measured(self, mock_session_request) -> None:
+        mock_session_request.return_value = MagicMock(
+            request=MagicMock(body=b"{}"), headers={"Content-Length": "5"}
+        )
+
+        RequestMetrics.start()
+        Client().request("POST", "validate_repository_id", json={})
+        Client().request("POST", "validate_repository_id", json={})
+        endpoint_metrics = RequestMetrics.stop()["endpoints"]["validate_repository_id"]
+
+        self.assertEqual(endpoint_metrics["num_requests"], 2)
+        self.assertEqual(endpoint_metrics["bytes_sent"], 4)
+        self.assertEqual(endpoint_metrics["bytes_received"], 10)
+        self.assertEqual(sum(endpoint_metrics["latency_histogram"].values()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
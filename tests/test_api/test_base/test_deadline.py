@@ -0,0 +1,53 @@
+from unittest.mock import patch
+import unittest
+
+from insight_cli.api.base import Deadline, DeadlineExceededError
+
+
+class TestDeadline(unittest.TestCase):
+    def test_get_remaining_seconds(self) -> None:
+        self.assertIsNone(Deadline.get_remaining_seconds())
+
+        with Deadline(10):
+            self.assertLessEqual(Deadline.get_remaining_seconds(), 10)
+            self.assertGreater(Deadline.get_remaining_seconds(), 9)
+
+        self.assertIsNone(Deadline.get_remaining_seconds())
+
+    def test_nested_deadlines(self) -> None:
+        with Deadline(10):
+            with Deadline(1):
+                self.assertLessEqual(Deadline.get_remaining_seconds(), 1)
+
+            self.assertGreater(Deadline.get_remaining_seconds(), 1)
+
+    def test_check(self) -> None:
+        Deadline.check("directory scan")
+
+        with Deadline(0):
+            with self.assertRaises(DeadlineExceededError) as context:
+                Deadline.check("directory scan")
+
+        self.assertEqual(context.exception.stage, "directory scan")
+        self.assertEqual(
+            str(context.exception),
+            "Ran out of the 0s time budget during directory scan",
+        )
+
+    def test_cap_timeout(self) -> None:
+        self.assertEqual(Deadline.cap_timeout("query_repository", (5, 120)), (5, 120))
+
+        with Deadline(10), patch.object(
+            Deadline, "remaining_seconds", new_callable=lambda: 7.5
+        ):
+            self.assertEqual(
+                Deadline.cap_timeout("query_repository", (5, 120)), (5, 7.5)
+            )
+            self.assertEqual(Deadline.cap_timeout("query_repository", 60), 7.5)
+            self.assertEqual(
+                Deadline.cap_timeout("query_repository", None), (7.5, 7.5)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+import gzip, unittest
+
+from insight_cli.api.base import RequestBodyCompressor
+from insight_cli.utils import Diagnostics
+
+
+class TestRequestBodyCompressor(unittest.TestCase):
+    def setUp(self) -> None:
+        Diagnostics.reset()
+
+    def tearDown(self) -> None:
+        Diagnostics.reset()
+
+    @patch("insight_cli.config.INSIGHT_API_REQUEST_COMPRESSION", True)
+    def test_compress_round_trip(self) -> None:
+        body = b'{"content": "' + b"def main(): pass\n" * 1000 + b'"}'
+
+        compressed_body, encoding = RequestBodyCompressor().compress(body)
+
+        self.assertNotEqual(encoding, RequestBodyCompressor.IDENTITY)
+        self.assertLess(len(compressed_body), len(body))
+        self.assertEqual(
+            RequestBodyCompressor.decompress(compressed_body, encoding), body
+        )
+
+    @patch("insight_cli.config.INSIGHT_API_REQUEST_COMPRESSION", True)
+    @patch("insight_cli.api.base.request_body_compressor.zstandard", None)
+    def test_gzip_without_zstandard(self) -> None:
+        request_body_compressor = RequestBodyCompressor(gzip_level=9)
+
+        compressed_body, encoding = request_body_compressor.compress(b"a" * 1000)
+
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(gzip.decompress(compressed_body), b"a" * 1000)
+
+    @patch("insight_cli.config.INSIGHT_API_REQUEST_COMPRESSION", False)
+    def test_compression_disabled(self) -> None:
+        self.assertEqual(
+            RequestBodyCompressor().compress(b"a" * 1000),
+            (b"a" * 1000, RequestBodyCompressor.IDENTITY),
+        )
+
+    @patch("insight_cli.config.INSIGHT_API_REQUEST_COMPRESSION", True)
+    @patch("insight_cli.api.base.request_body_compressor.zstandard", None)
+    def test_reject(self) -> None:
+        request_body_compressor = RequestBodyCompressor()
+
+        self.assertTrue(request_body_compressor.reject("gzip"))
+        self.assertEqual(
+            request_body_compressor.encoding, RequestBodyCompressor.IDENTITY
+        )
+        self.assertFalse(
+            request_body_compressor.reject(RequestBodyCompressor.IDENTITY)
+        )
+
+    def test_record_compression(self) -> None:
+        RequestBodyCompressor.record_compression(1000, 100)
+        RequestBodyCompressor.record_compression(3000, 400)
+
+        self.assertEqual(
+            Diagnostics.get("request_compression.uncompressed_bytes"), 4000
+        )
+        self.assertEqual(Diagnostics.get("request_compression.compressed_bytes"), 500)
+        self.assertEqual(Diagnostics.get("request_compression.ratio"), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, PropertyMock, patch
+import asyncio, itertools, threading, time, unittest
+
+from insight_cli.api.base import Client, RequestHedger
+from insight_cli.utils import Diagnostics, LatencyHistogram
+
+
+class TestRequestHedger(unittest.TestCase):
+    def setUp(self) -> None:
+        Diagnostics.reset()
+        self.first_request_is_released = threading.Event()
+        self.first_response = MagicMock(name="first_response")
+        self.second_response = MagicMock(name="second_response")
+
+    def tearDown(self) -> None:
+        self.first_request_is_released.set()
+        Diagnostics.reset()
+
+    def _create_request(self, first_request_is_slow: bool) -> MagicMock:
+        request_counter = itertools.count()
+
+        def request(*args, **kwargs):
+            if next(request_counter) > 0:
+                return self.second_response
+
+            if first_request_is_slow:
+                self.first_request_is_released.wait(5)
+
+            return self.first_response
+
+        return MagicMock(side_effect=request)
+
+    def test_call_without_hedge(self) -> None:
+        request = self._create_request(first_request_is_slow=False)
+
+        self.assertIs(
+            RequestHedger("test", initial_delay_seconds=5).call(request, "GET"),
+            self.first_response,
+        )
+        request.assert_called_once_with("GET")
+        self.assertIsNone(Diagnostics.get("request_hedger.test.hedges"))
+
+    def test_call_with_hedge(self) -> None:
+        request = self._create_request(first_request_is_slow=True)
+
+        self.assertIs(
+            RequestHedger("test", initial_delay_seconds=0.01).call(request, "GET"),
+            self.second_response,
+        )
+
+        self.first_request_is_released.set()
+
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(Diagnostics.get("request_hedger.test.hedges"), 1)
+        self.assertEqual(Diagnostics.get("request_hedger.test.hedge_wins"), 1)
+
+    def test_call_with_hedge_closes_late_response(self) -> None:
+        request = self._create_request(first_request_is_slow=True)
+        self.first_response.close.side_effect = lambda: response_is_closed.set()
+        response_is_closed = threading.Event()
+
+        RequestHedger("test", initial_delay_seconds=0.01).call(request)
+        self.first_request_is_released.set()
+
+        self.assertTrue(response_is_closed.wait(5))
+
+    def test_call_raises_if_every_request_fails(self) -> None:
+        request = MagicMock(side_effect=ConnectionError())
+
+        with self.assertRaises(ConnectionError):
+            RequestHedger("test", initial_delay_seconds=0.01).call(request)
+
+    def test_call_async_with_hedge(self) -> None:
+        request = self._create_request(first_request_is_slow=True)
+
+        self.assertIs(
+            asyncio.run(
+                RequestHedger("test", initial_delay_seconds=0.01).call_async(request)
+            ),
+            self.second_response,
+        )
+        self.assertEqual(Diagnostics.get("request_hedger.test.hedge_wins"), 1)
+
+    def test_delay_seconds_follows_percentile(self) -> None:
+        request_hedger = RequestHedger(
+            "test", initial_delay_seconds=5, percentile=90, min_num_samples=10
+        )
+
+        for latency_seconds in range(9):
+            request_hedger._record_latency(latency_seconds)
+
+        self.assertEqual(request_hedger.delay_seconds, 5)
+
+        request_hedger._record_latency(9)
+
+        self.assertEqual(request_hedger.delay_seconds, 9)
+
+    def _patch_executor(self, executor: ThreadPoolExecutor):
+        self.addCleanup(executor.shutdown)
+
+        return patch.object(
+            Client, "executor", new_callable=PropertyMock, return_value=executor
+        )
+
+    def test_call_does_not_count_queueing_as_latency(self) -> None:
+        executor = ThreadPoolExecutor(max_workers=1)
+        request = self._create_request(first_request_is_slow=False)
+        request_hedger = RequestHedger("test", initial_delay_seconds=0.05)
+
+        with self._patch_executor(executor):
+            executor.submit(time.sleep, 0.2)
+
+            self.assertIs(request_hedger.call(request), self.first_response)
+
+        request.assert_called_once()
+        self.assertIsNone(Diagnostics.get("request_hedger.test.hedges"))
+        self.assertLess(request_hedger._latencies_seconds[0], 0.1)
+
+    def test_call_cancels_queued_hedge(self) -> None:
+        executor = ThreadPoolExecutor(max_workers=1)
+        request = self._create_request(first_request_is_slow=True)
+        threading.Timer(0.1, self.first_request_is_released.set).start()
+
+        with self._patch_executor(executor):
+            self.assertIs(
+                RequestHedger("test", initial_delay_seconds=0.01).call(request),
+                self.first_response,
+            )
+
+        executor.shutdown()
+        request.assert_called_once()
+        self.assertEqual(Diagnostics.get("request_hedger.test.hedges"), 1)
+
+    def test_call_without_initial_delay_is_not_hedged(self) -> None:
+        request = self._create_request(first_request_is_slow=True)
+        threading.Timer(0.05, self.first_request_is_released.set).start()
+
+        self.assertIs(
+            RequestHedger("test", initial_delay_seconds=None).call(request),
+            self.first_response,
+        )
+        request.assert_called_once()
+        self.assertIsNone(Diagnostics.get("request_hedger.test.hedges"))
+
+    def test_add_history(self) -> None:
+        latency_histogram = LatencyHistogram()
+
+        for latency_seconds in [0.1] * 90 + [2.0] * 10:
+            latency_histogram.record(latency_seconds)
+
+        request_hedger = RequestHedger(
+            "test",
+            initial_delay_seconds=None,
+            percentile=90,
+            min_num_samples=20,
+            max_num_samples=50,
+        )
+        request_hedger.add_history(latency_histogram)
+
+        self.assertEqual(len(request_hedger._latencies_seconds), 50)
+        self.assertAlmostEqual(request_hedger.delay_seconds, 2.0, delta=0.2)
+
+        request_hedger.add_history(LatencyHistogram())
+
+        self.assertEqual(len(request_hedger._latencies_seconds), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
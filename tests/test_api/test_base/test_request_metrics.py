@@ -0,0 +1,83 @@
+import unittest
+
+from insight_cli.api.base import RequestMetrics
+from insight_cli.utils import Diagnostics
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def tearDown(self) -> None:
+        RequestMetrics.stop()
+
+    def test_record_is_ignored_when_not_started(self) -> None:
+        RequestMetrics.record("query_repository", 0.5, 10, 20)
+
+        self.assertFalse(RequestMetrics.is_started())
+        self.assertEqual(RequestMetrics.stop()["endpoints"], {})
+
+    def test_record_per_endpoint(self) -> None:
+        RequestMetrics.start()
+
+        RequestMetrics.record("query_repository", 0.5, 10, 20)
+        RequestMetrics.record("query_repository", 2, 1, 2)
+        RequestMetrics.record("validate_repository_id", 0.5, 3, 4)
+
+        self.assertEqual(
+            RequestMetrics.stop()["endpoints"],
+            {
+                "query_repository": {
+                    "latency_histogram": {"-8": 1, "8": 1},
+                    "num_requests": 2,
+                    "bytes_sent": 11,
+                    "bytes_received": 22,
+                },
+                "validate_repository_id": {
+                    "latency_histogram": {"-8": 1},
+                    "num_requests": 1,
+                    "bytes_sent": 3,
+                    "bytes_received": 4,
+                },
+            },
+        )
+
+    def test_counts_batches_and_retries_since_start(self) -> None:
+        Diagnostics.increment("retry_policy.retries")
+        RequestMetrics.start()
+
+        Diagnostics.increment("batch_api.batches", 3)
+        Diagnostics.increment("retry_policy.retries")
+        operation_metrics = RequestMetrics.stop()
+
+        self.assertEqual(operation_metrics["num_batches"], 3)
+        self.assertEqual(operation_metrics["num_retries"], 1)
+
+    def test_reports_diagnostics_since_start(self) -> None:
+        Diagnostics.increment("request_compression.uncompressed_bytes", 100)
+        Diagnostics.increment("request_compression.compressed_bytes", 100)
+        Diagnostics.increment("request_hedger.query_repository.hedges")
+        RequestMetrics.start()
+
+        Diagnostics.increment("batch_api.batches", 2)
+        Diagnostics.record("batch_scheduler.concurrency", 6)
+        Diagnostics.increment("request_compression.uncompressed_bytes", 300)
+        Diagnostics.increment("request_compression.compressed_bytes", 100)
+        Diagnostics.increment("request_hedger.query_repository.hedges", 2)
+        Diagnostics.increment("request_hedger.query_repository.hedge_wins")
+        operation_metrics = RequestMetrics.stop()
+
+        self.assertEqual(operation_metrics["concurrency"], 6)
+        self.assertEqual(operation_metrics["compression_ratio"], 3)
+        self.assertEqual(operation_metrics["num_hedges"], 2)
+        self.assertEqual(operation_metrics["num_hedge_wins"], 1)
+
+    def test_reports_no_concurrency_or_compression_without_uploads(self) -> None:
+        Diagnostics.record("batch_scheduler.concurrency", 6)
+        RequestMetrics.start()
+        operation_metrics = RequestMetrics.stop()
+
+        self.assertIsNone(operation_metrics["concurrency"])
+        self.assertIsNone(operation_metrics["compression_ratio"])
+        self.assertEqual(operation_metrics["num_hedges"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
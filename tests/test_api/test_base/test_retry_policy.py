@@ -0,0 +1,127 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock
+import requests, unittest
+
+from insight_cli.api.base import Deadline, RetryPolicy
+
+
+def http_error(status_code: int, headers: dict | None = None):
+    return requests.exceptions.HTTPError(
+        response=MagicMock(status_code=status_code, headers=headers or {})
+    )
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_is_retryable(self) -> None:
+        self.assertTrue(RetryPolicy.is_retryable(requests.exceptions.ConnectionError()))
+        self.assertTrue(RetryPolicy.is_retryable(requests.exceptions.ReadTimeout()))
+
+        for status_code in [429, 502, 503, 504]:
+            self.assertTrue(RetryPolicy.is_retryable(http_error(status_code)))
+
+        for status_code in [400, 404, 500]:
+            self.assertFalse(RetryPolicy.is_retryable(http_error(status_code)))
+
+        self.assertFalse(RetryPolicy.is_retryable(ValueError()))
+
+    def test_should_retry_respects_max_attempts(self) -> None:
+        retry_policy = RetryPolicy(max_attempts=3, retry_budget=10)
+        error = requests.exceptions.ConnectionError()
+
+        self.assertTrue(retry_policy.should_retry(1, error))
+        self.assertTrue(retry_policy.should_retry(2, error))
+        self.assertFalse(retry_policy.should_retry(3, error))
+
+    def test_should_retry_respects_retry_budget(self) -> None:
+        retry_policy = RetryPolicy(max_attempts=10, retry_budget=2)
+        error = requests.exceptions.ConnectionError()
+
+        self.assertTrue(retry_policy.should_retry(1, error))
+        self.assertTrue(retry_policy.should_retry(1, error))
+        self.assertFalse(retry_policy.should_retry(1, error))
+        self.assertEqual(retry_policy.remaining_retry_budget, 0)
+        self.assertEqual(retry_policy.num_retries, 2)
+
+    def test_should_retry_does_not_consume_budget_for_non_retryable_errors(
+        self,
+    ) -> None:
+        retry_policy = RetryPolicy(max_attempts=10, retry_budget=1)
+
+        self.assertFalse(retry_policy.should_retry(1, http_error(400)))
+        self.assertEqual(retry_policy.remaining_retry_budget, 1)
+
+    def test_should_retry_respects_deadline(self) -> None:
+        retry_policy = RetryPolicy(max_attempts=10, retry_budget=10)
+
+        with Deadline(0):
+            self.assertFalse(
+                retry_policy.should_retry(1, requests.exceptions.ConnectionError())
+            )
+
+        self.assertEqual(retry_policy.remaining_retry_budget, 10)
+
+    def test_get_delay_seconds_respects_deadline(self) -> None:
+        retry_policy = RetryPolicy(max_delay_seconds=30)
+        error = http_error(503, {"Retry-After": "20"})
+
+        with Deadline(1):
+            self.assertLessEqual(retry_policy.get_delay_seconds(1, error), 1)
+
+    def test_get_delay_seconds_grows_exponentially_with_jitter(self) -> None:
+        retry_policy = RetryPolicy(base_delay_seconds=1, max_delay_seconds=5)
+        error = requests.exceptions.ConnectionError()
+
+        with patch("random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual(
+                [retry_policy.get_delay_seconds(attempt, error) for attempt in range(1, 6)],
+                [1, 2, 4, 5, 5],
+            )
+
+        for _ in range(100):
+            self.assertTrue(0 <= retry_policy.get_delay_seconds(3, error) <= 4)
+
+    def test_get_delay_seconds_with_retry_after_seconds(self) -> None:
+        retry_policy = RetryPolicy(max_delay_seconds=30)
+
+        self.assertEqual(
+            retry_policy.get_delay_seconds(1, http_error(429, {"Retry-After": "7"})), 7
+        )
+        self.assertEqual(
+            retry_policy.get_delay_seconds(1, http_error(429, {"Retry-After": "120"})),
+            30,
+        )
+
+    def test_get_delay_seconds_with_retry_after_date(self) -> None:
+        retry_policy = RetryPolicy(max_delay_seconds=30)
+        retry_after = format_datetime(
+            datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True
+        )
+
+        delay_seconds = retry_policy.get_delay_seconds(
+            1, http_error(503, {"Retry-After": retry_after})
+        )
+
+        self.assertTrue(8 <= delay_seconds <= 10)
+
+    @patch("time.sleep")
+    def test_call_retries_until_success(self, mock_sleep) -> None:
+        func = MagicMock(side_effect=[requests.exceptions.ReadTimeout(), "result"])
+
+        self.assertEqual(RetryPolicy().call(func, "arg", key="value"), "result")
+        self.assertEqual(func.call_count, 2)
+        func.assert_called_with("arg", key="value")
+        mock_sleep.assert_called_once()
+
+    @patch("time.sleep")
+    def test_call_raises_after_max_attempts(self, mock_sleep) -> None:
+        func = MagicMock(side_effect=requests.exceptions.ReadTimeout())
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            RetryPolicy(max_attempts=3).call(func)
+
+        self.assertEqual(func.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
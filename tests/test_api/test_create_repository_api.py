@@ -6,7 +6,7 @@ from insight_cli.config import config
 
 
 class TestCreateRepositoryAPI(unittest.TestCase):
-    @patch("requests.post")
+    @patch("requests.Session.request")
     def test_make_request(self, mock_request_post):
         expected_response = {"repository_id": "mock_repository_id"}
         
@@ -21,7 +21,9 @@ class TestCreateRepositoryAPI(unittest.TestCase):
         )
 
         mock_request_post.assert_called_once_with(
-            url=f"{config.INSIGHT_API_BASE_URL}/create_repository"
+            "POST",
+            url=f"{config.INSIGHT_API_BASE_URL}/create_repository",
+            timeout=config.INSIGHT_API_TIMEOUTS["create_repository"],
         )
 
 
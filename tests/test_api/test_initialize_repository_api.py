@@ -1,32 +1,81 @@
-from unittest.mock import patch, MagicMock
-import unittest
+from pathlib import Path
+from unittest.mock import ANY, patch, MagicMock
+import base64, json, requests, tempfile, unittest
 
 from insight_cli.api import InitializeRepositoryAPI
+from insight_cli.api.base import RequestBodyCompressor
 from insight_cli.config import config
+from insight_cli.utils import File
 
 
 class TestInitializeRepositoryAPI(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+
+        negotiate_blobs_patcher = patch(
+            "insight_cli.api.NegotiateBlobsAPI.make_request", return_value=None
+        )
+        self.mock_negotiate_blobs_request = negotiate_blobs_patcher.start()
+        self.addCleanup(negotiate_blobs_patcher.stop)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _get_request_json(call) -> dict:
+        return json.loads(
+            RequestBodyCompressor.decompress(
+                call.kwargs["data"],
+                call.kwargs["headers"].get(
+                    "Content-Encoding", RequestBodyCompressor.IDENTITY
+                ),
+            )
+        )
+
+    def _create_files(self, file_sizes: dict[str, int]) -> list[File]:
+        files = []
+
+        for file_name, file_size_bytes in file_sizes.items():
+            file_path = self.temp_dir_path / file_name
+            file_path.write_bytes(bytes(range(256)) * (file_size_bytes // 256))
+            files.append(File(file_path))
+
+        return files
+
     def test_batch_repository_files(self) -> None:
-        repository_files = {
-            "file1": bytes(10 * 1024**2),
-            "file2": bytes(5 * 1024**2),
-            "file3": bytes(5 * 1024**2),
-            "file4": bytes(4 * 1024**2),
-            "file5": bytes(4 * 1024**2),
-            "file6": bytes(4 * 1024**2),
-        }
+        repository_files = self._create_files(
+            {
+                "file1": 10 * 1024,
+                "file2": 5 * 1024,
+                "file3": 5 * 1024,
+                "file4": 4 * 1024,
+                "file5": 4 * 1024,
+                "file6": 4 * 1024,
+            }
+        )
 
-        batched_repository_files = InitializeRepositoryAPI._batch_repository_files(
-            repository_files
+        planned_batches = InitializeRepositoryAPI._batch_repository_files(
+            repository_files, 16 * 1024
         )
 
-        self.assertEqual(len(batched_repository_files), 4)
+        self.assertEqual(len(planned_batches), 4)
         self.assertEqual(
-            [sorted(batch["files"].keys()) for batch in batched_repository_files],
-            [["file1"], ["file2", "file3"], ["file4", "file5", "file6"], ["file6"]],
+            [
+                sorted(Path(chunk_range["path"]).name for chunk_range in batch)
+                for batch in planned_batches
+            ],
+            [["file2", "file3"], ["file1"], ["file4", "file5"], ["file6"]],
+        )
+        self.assertTrue(
+            all(
+                chunk_range["num_total_chunks"] == 1
+                for batch in planned_batches
+                for chunk_range in batch
+            )
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.request")
     def test_make_batch_request(self, mock_request_post) -> None:
         mock_request_post.return_value = MagicMock(
             json=lambda: None,
@@ -36,17 +85,19 @@ class TestInitializeRepositoryAPI(unittest.TestCase):
         payload = {
             "files": {
                 "file2": {
-                    "content": bytes(5 * 1024**2),
+                    "content": b"a" * 5 * 1024**2,
                     "chunk_index": 1,
                     "num_total_chunks": 1,
                 },
                 "file3": {
-                    "content": bytes(5 * 1024**2),
+                    "content": b"a" * 5 * 1024**2,
                     "chunk_index": 1,
                     "num_total_chunks": 1,
                 },
             },
             "repository_id": "1234asdfdasfas",
+            "batch_id": "batch_id",
+            "file_references": {},
             "batch_index": "2",
             "num_total_batches": "4",
         }
@@ -54,19 +105,35 @@ class TestInitializeRepositoryAPI(unittest.TestCase):
         result = InitializeRepositoryAPI._make_batch_request(payload)
 
         mock_request_post.assert_called_once_with(
+            "POST",
             url=f"{config.INSIGHT_API_BASE_URL}/initialize_repository",
+            headers={
+                "Idempotency-Key": payload["batch_id"],
+                "Content-Type": "application/json",
+            },
+            data=ANY,
             cookies={"repository_id": payload["repository_id"]},
-            json={
-                "files": payload["files"],
+            timeout=config.INSIGHT_API_TIMEOUTS["initialize_repository"],
+        )
+        self.assertEqual(
+            self._get_request_json(mock_request_post.call_args),
+            {
+                "files": {
+                    file_path: {
+                        **file,
+                        "content": base64.b64encode(file["content"]).decode("utf-8"),
+                    }
+                    for file_path, file in payload["files"].items()
+                },
                 "batch_index": payload["batch_index"],
                 "num_total_batches": payload["num_total_batches"],
+                "file_references": payload["file_references"],
             },
-            timeout=None
         )
 
         self.assertIsNone(result)
 
-    @patch("requests.post")
+    @patch("requests.Session.request")
     def test_make_request(self, mock_post):
         mock_post.return_value = MagicMock(
             json=lambda: None,
@@ -75,16 +142,137 @@ class TestInitializeRepositoryAPI(unittest.TestCase):
 
         repository_id = "mock_repository_id"
 
-        repository_files = {
-            "file1.txt": b"File content 1",
-            "file2.txt": b"File content 2",
-        }
+        file1_path = self.temp_dir_path / "file1.txt"
+        file1_path.write_bytes(b"File content 1")
+        file2_path = self.temp_dir_path / "file2.txt"
+        file2_path.write_bytes(b"File content 2")
 
         self.assertIsNone(
-            InitializeRepositoryAPI().make_request(repository_id, repository_files)
+            InitializeRepositoryAPI().make_request(
+                repository_id, [File(file1_path), File(file2_path)]
+            )
         )
-        
+
         mock_post.assert_called_once()
+        self.assertEqual(
+            self._get_request_json(mock_post.call_args)["files"][str(file1_path)][
+                "content"
+            ],
+            base64.b64encode(b"File content 1").decode("utf-8"),
+        )
+
+    @patch("insight_cli.api.InitializeRepositoryAPI._make_batch_request")
+    def test_make_request_streams_batches_in_order(self, mock_make_batch_request):
+        repository_files = self._create_files(
+            {f"file{i}": 8 * 1024 for i in range(20)}
+        )
+
+        with patch.object(InitializeRepositoryAPI, "_MAX_BATCH_SIZE_BYTES", 24 * 1024):
+            InitializeRepositoryAPI.make_request("repository_id", repository_files)
+
+        payloads = [call.args[0] for call in mock_make_batch_request.call_args_list]
+
+        self.assertEqual(
+            sorted(payload["batch_index"] for payload in payloads), list(range(10))
+        )
+        self.assertTrue(all(payload["num_total_batches"] == 10 for payload in payloads))
+        self.assertEqual(
+            sum(len(payload["files"]) for payload in payloads), len(repository_files)
+        )
+
+    @patch("insight_cli.api.InitializeRepositoryAPI._make_batch_request")
+    def test_make_request_with_failed_batch(self, mock_make_batch_request):
+        repository_files = self._create_files({"file1": 1024})
+        mock_make_batch_request.side_effect = ValueError("error message")
+
+        with self.assertRaises(ValueError):
+            InitializeRepositoryAPI.make_request("repository_id", repository_files)
+
+        mock_make_batch_request.assert_called_once()
+
+    @patch("insight_cli.api.base.retry_policy.random.uniform", return_value=0)
+    @patch("insight_cli.api.InitializeRepositoryAPI._make_batch_request")
+    def test_make_request_retries_transient_failures(
+        self, mock_make_batch_request, mock_uniform
+    ):
+        repository_files = self._create_files({"file1": 1024})
+        mock_make_batch_request.side_effect = [
+            requests.exceptions.ConnectionError("error message"),
+            None,
+        ]
+
+        InitializeRepositoryAPI.make_request("repository_id", repository_files)
+
+        self.assertEqual(mock_make_batch_request.call_count, 2)
+        first_payload, second_payload = [
+            call.args[0] for call in mock_make_batch_request.call_args_list
+        ]
+        self.assertEqual(first_payload["batch_id"], second_payload["batch_id"])
+
+    @patch("insight_cli.api.InitializeRepositoryAPI._make_batch_request")
+    def test_make_request_uploads_only_wanted_blobs_once(
+        self, mock_make_batch_request
+    ):
+        file1, file2 = self._create_files({"file1": 1024, "file2": 1024})
+        file3, file4 = self._create_files({"file3": 2048, "file4": 4096})
+        self.mock_negotiate_blobs_request.return_value = {
+            "wanted_blob_hashes": {file1.blob_hash, file4.blob_hash},
+            "supports_file_deltas": False,
+        }
+
+        InitializeRepositoryAPI.make_request(
+            "repository_id", [file1, file2, file3, file4]
+        )
+
+        payloads = [call.args[0] for call in mock_make_batch_request.call_args_list]
+
+        self.assertEqual(
+            set().union(*(payload["files"] for payload in payloads)),
+            {str(file1.path), str(file4.path)},
+        )
+        self.assertEqual(
+            payloads[-1]["file_references"],
+            {str(file2.path): file1.blob_hash, str(file3.path): file3.blob_hash},
+        )
+
+    @patch("insight_cli.api.InitializeRepositoryAPI._make_batch_request")
+    def test_make_request_uploads_empty_files(self, mock_make_batch_request):
+        file1, file2, file3 = self._create_files({"file1": 0, "file2": 0, "file3": 0})
+        self.mock_negotiate_blobs_request.return_value = {
+            "wanted_blob_hashes": set(),
+            "supports_file_deltas": False,
+        }
+
+        InitializeRepositoryAPI.make_request("repository_id", [file1, file2, file3])
+
+        self.mock_negotiate_blobs_request.assert_called_once_with(
+            "repository_id", set()
+        )
+        payloads = [call.args[0] for call in mock_make_batch_request.call_args_list]
+
+        self.assertEqual(
+            set().union(*(payload["files"] for payload in payloads)),
+            {str(file1.path), str(file2.path), str(file3.path)},
+        )
+        self.assertEqual(payloads[-1]["file_references"], {})
+
+    @patch("insight_cli.api.InitializeRepositoryAPI._make_batch_request")
+    def test_make_request_with_only_known_blobs(self, mock_make_batch_request):
+        repository_files = self._create_files({"file1": 1024})
+        self.mock_negotiate_blobs_request.return_value = {
+            "wanted_blob_hashes": set(),
+            "supports_file_deltas": False,
+        }
+
+        InitializeRepositoryAPI.make_request("repository_id", repository_files)
+
+        mock_make_batch_request.assert_called_once()
+        payload = mock_make_batch_request.call_args.args[0]
+        self.assertEqual(payload["files"], {})
+        self.assertEqual(
+            payload["file_references"],
+            {str(repository_files[0].path): repository_files[0].blob_hash},
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+from unittest.mock import patch, MagicMock
+import requests, unittest
+
+from insight_cli.api import NegotiateBlobsAPI
+from insight_cli.config import config
+
+
+class TestNegotiateBlobsAPI(unittest.TestCase):
+    @patch("requests.Session.request")
+    def test_make_request(self, mock_request_post):
+        mock_request_post.return_value = MagicMock(
+            json=lambda: {"wanted_blob_hashes": ["hash2"], "supports_file_deltas": True}
+        )
+
+        self.assertEqual(
+            NegotiateBlobsAPI.make_request("test_repo_id", {"hash2", "hash1"}),
+            {"wanted_blob_hashes": {"hash2"}, "supports_file_deltas": True},
+        )
+        mock_request_post.assert_called_once_with(
+            "POST",
+            url=f"{config.INSIGHT_API_BASE_URL}/negotiate_blobs",
+            json={"repository_id": "test_repo_id", "blob_hashes": ["hash1", "hash2"]},
+            timeout=config.INSIGHT_API_TIMEOUTS["negotiate_blobs"],
+        )
+
+    @patch("requests.Session.request")
+    def test_make_request_without_file_deltas(self, mock_request_post):
+        mock_request_post.return_value = MagicMock(
+            json=lambda: {"wanted_blob_hashes": []}
+        )
+
+        self.assertEqual(
+            NegotiateBlobsAPI.make_request("test_repo_id", {"hash1"}),
+            {"wanted_blob_hashes": set(), "supports_file_deltas": False},
+        )
+
+    @patch("requests.Session.request")
+    def test_make_request_with_unsupported_server(self, mock_request_post):
+        mock_request_post.return_value = MagicMock(
+            raise_for_status=MagicMock(
+                side_effect=requests.exceptions.HTTPError(
+                    response=MagicMock(status_code=404)
+                )
+            )
+        )
+
+        self.assertIsNone(NegotiateBlobsAPI.make_request("test_repo_id", {"hash1"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
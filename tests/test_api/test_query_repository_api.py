@@ -6,7 +6,7 @@ from insight_cli.config import config
 
 
 class TestQueryRepositoryAPI(unittest.TestCase):
-    @patch("requests.get")
+    @patch("requests.Session.request")
     def test_make_request(self, mock_request_get):
         expected_response = []
         mock_request_get.return_value = MagicMock(
@@ -24,14 +24,52 @@ class TestQueryRepositoryAPI(unittest.TestCase):
         )
 
         mock_request_get.assert_called_once_with(
+            "GET",
             url=f"{config.INSIGHT_API_BASE_URL}/query_repository",
             json={
                 "repository_id": repository_id,
                 "query_string": query_string,
                 "limit": limit,
             },
+            timeout=config.INSIGHT_API_TIMEOUTS["query_repository"],
         )
 
+    @patch("requests.Session.request")
+    def test_stream_request(self, mock_request_get):
+        matches = [{"path": "file1.py"}, {"path": "file2.py"}]
+        response = MagicMock(headers={"Content-Type": "application/x-ndjson"})
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = [
+            b'{"path": "file1.py"}',
+            b"",
+            b'{"path": "file2.py"}',
+        ]
+        mock_request_get.return_value = response
+
+        self.assertEqual(
+            list(QueryRepositoryAPI.stream_request("test_repo_id", "water", 2)),
+            matches,
+        )
+        self.assertIn(
+            "application/x-ndjson",
+            mock_request_get.call_args.kwargs["headers"]["Accept"],
+        )
+        self.assertTrue(mock_request_get.call_args.kwargs["stream"])
+
+    @patch("requests.Session.request")
+    def test_stream_request_with_buffered_response(self, mock_request_get):
+        matches = [{"path": "file1.py"}]
+        response = MagicMock(headers={"Content-Type": "application/json"})
+        response.__enter__.return_value = response
+        response.json.return_value = matches
+        mock_request_get.return_value = response
+
+        self.assertEqual(
+            list(QueryRepositoryAPI.stream_request("test_repo_id", "water", 1)),
+            matches,
+        )
+        response.iter_lines.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
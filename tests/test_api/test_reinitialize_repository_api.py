@@ -1,115 +1,142 @@
-from unittest.mock import patch
-import base64, unittest
+from pathlib import Path
+from unittest.mock import ANY, patch, MagicMock
+import base64, json, requests, tempfile, unittest
 
 from insight_cli.api import ReinitializeRepositoryAPI
+from insight_cli.api.base import RequestBodyCompressor
 from insight_cli.config import config
+from insight_cli.utils import File
 
 
 class TestReinitializeRepositoryAPI(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+
+        negotiate_blobs_patcher = patch(
+            "insight_cli.api.NegotiateBlobsAPI.make_request", return_value=None
+        )
+        self.mock_negotiate_blobs_request = negotiate_blobs_patcher.start()
+        self.addCleanup(negotiate_blobs_patcher.stop)
+
+        file_sizes = {
+            "file1": 11 * 1024,
+            "file2": 10 * 1024,
+            "file3": 5 * 1024,
+            "file4": 2 * 1024,
+        }
+
+        self.file_contents = {}
+        for file_name, file_size_bytes in file_sizes.items():
+            file_path = self.temp_dir_path / file_name
+            file_path.write_bytes(bytes(range(256)) * (file_size_bytes // 256))
+            self.file_contents[file_name] = file_path.read_bytes()
+
+        self.repository_file_changes = {
+            "add": [self._file("file1"), self._file("file2")],
+            "update": [self._file("file3"), self._file("file4")],
+            "delete": [self._file("file5"), self._file("file6")],
+        }
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _file(self, file_name: str) -> File:
+        return File(self.temp_dir_path / file_name)
+
+    def _path(self, file_name: str) -> str:
+        return str(self.temp_dir_path / file_name)
+
+    def _support_file_deltas(self) -> None:
+        self.mock_negotiate_blobs_request.return_value = {
+            "wanted_blob_hashes": {
+                self._file(file_name).blob_hash for file_name in self.file_contents
+            },
+            "supports_file_deltas": True,
+        }
+
+    def _file_chunk(
+        self, file_name: str, start: int, end: int, chunk_index: int, num_chunks: int
+    ) -> dict:
+        return {
+            "content": self.file_contents[file_name][start:end],
+            "size_bytes": end - start,
+            "chunk_index": chunk_index,
+            "num_total_chunks": num_chunks,
+        }
+
     def test_batch_repository_file_changes(self) -> None:
         repository_id = "123"
-        repository_file_changes = {
-            "add": [
-                ("file1", bytes(11 * 1024**2)),
-                ("file2", bytes(10 * 1024**2)),
-            ],
-            "update": [
-                ("file3", bytes(5 * 1024**2)),
-                ("file4", bytes(2 * 1024**2)),
-            ],
-            "delete": [
-                ("file5", bytes(0)),
-                ("file6", bytes(0)),
-            ],
-        }
+        planned_batches = ReinitializeRepositoryAPI._batch_repository_file_changes(
+            self.repository_file_changes, 16 * 1024
+        )
+
+        with patch.object(
+            ReinitializeRepositoryAPI, "_make_batch_request"
+        ) as mock_make_batch_request:
+            ReinitializeRepositoryAPI._make_batch_requests(
+                ReinitializeRepositoryAPI._add_metadata_to_batches(
+                    planned_batches, repository_id
+                )
+            )
 
+        request_batches = sorted(
+            (call.args[0] for call in mock_make_batch_request.call_args_list),
+            key=lambda request_batch: request_batch["batch_index"],
+        )
+        batch_ids = [request_batch.pop("batch_id") for request_batch in request_batches]
+
+        self.assertEqual(len(set(batch_ids)), len(batch_ids))
         self.assertEqual(
-            ReinitializeRepositoryAPI._add_metadata_to_batches(
-                ReinitializeRepositoryAPI._batch_repository_file_changes(
-                    repository_file_changes
-                ),
-                repository_id,
-            ),
+            request_batches,
             [
                 {
                     "files": {
-                        "file1": {
-                            "content": base64.b64encode(
-                                repository_file_changes["add"][0][1][: 10 * 1024**2]
-                            ).decode("utf-8"),
-                            "size_bytes": 10 * 1024**2,
-                            "chunk_index": 0,
-                            "num_total_chunks": 2,
-                        }
+                        self._path("file1"): self._file_chunk(
+                            "file1", 0, 11 * 1024, 0, 1
+                        ),
                     },
                     "changes": {
-                        "file1": "add",
+                        self._path("file1"): "add",
                     },
+                    "file_references": {},
+                    "file_deltas": {},
                     "repository_id": repository_id,
                     "batch_index": 0,
                     "num_total_batches": 3,
                 },
                 {
                     "files": {
-                        "file1": {
-                            "content": base64.b64encode(
-                                repository_file_changes["add"][0][1][10 * 1024**2 :]
-                            ).decode("utf-8"),
-                            "size_bytes": 1 * 1024**2,
-                            "chunk_index": 1,
-                            "num_total_chunks": 2,
-                        },
-                        "file2": {
-                            "content": base64.b64encode(
-                                repository_file_changes["add"][1][1][: 9 * 1024**2]
-                            ).decode("utf-8"),
-                            "size_bytes": 9 * 1024**2,
-                            "chunk_index": 0,
-                            "num_total_chunks": 2,
-                        },
+                        self._path("file2"): self._file_chunk(
+                            "file2", 0, 10 * 1024, 0, 1
+                        ),
                     },
                     "changes": {
-                        "file1": "add",
-                        "file2": "add",
+                        self._path("file2"): "add",
                     },
+                    "file_references": {},
+                    "file_deltas": {},
                     "repository_id": repository_id,
                     "batch_index": 1,
                     "num_total_batches": 3,
                 },
                 {
                     "files": {
-                        "file2": {
-                            "content": base64.b64encode(
-                                repository_file_changes["add"][1][1][9 * 1024**2 :]
-                            ).decode("utf-8"),
-                            "size_bytes": 1 * 1024**2,
-                            "chunk_index": 1,
-                            "num_total_chunks": 2,
-                        },
-                        "file3": {
-                            "content": base64.b64encode(
-                                repository_file_changes["update"][0][1]
-                            ).decode("utf-8"),
-                            "size_bytes": 5 * 1024**2,
-                            "chunk_index": 0,
-                            "num_total_chunks": 1,
-                        },
-                        "file4": {
-                            "content": base64.b64encode(
-                                repository_file_changes["update"][1][1]
-                            ).decode("utf-8"),
-                            "size_bytes": 2 * 1024**2,
-                            "chunk_index": 0,
-                            "num_total_chunks": 1,
-                        },
+                        self._path("file3"): self._file_chunk(
+                            "file3", 0, 5 * 1024, 0, 1
+                        ),
+                        self._path("file4"): self._file_chunk(
+                            "file4", 0, 2 * 1024, 0, 1
+                        ),
                     },
                     "changes": {
-                        "file2": "add",
-                        "file3": "update",
-                        "file4": "update",
-                        "file5": "delete",
-                        "file6": "delete",
+                        self._path("file3"): "update",
+                        self._path("file4"): "update",
+                        self._path("file5"): "delete",
+                        self._path("file6"): "delete",
                     },
+                    "file_references": {},
+                    "file_deltas": {},
                     "repository_id": repository_id,
                     "batch_index": 2,
                     "num_total_batches": 3,
@@ -117,14 +144,248 @@ class TestReinitializeRepositoryAPI(unittest.TestCase):
             ],
         )
 
-    @patch("requests.put")
+    def test_batch_ids_are_stable(self) -> None:
+        def get_batch_ids() -> list[str]:
+            planned_batches = ReinitializeRepositoryAPI._batch_repository_file_changes(
+                self.repository_file_changes, 10 * 1024
+            )
+
+            return [
+                request_batch["batch_id"]
+                for request_batch in ReinitializeRepositoryAPI._add_metadata_to_batches(
+                    planned_batches, "123"
+                )
+            ]
+
+        self.assertEqual(get_batch_ids(), get_batch_ids())
+
+    def test_batch_repository_file_changes_with_only_deletes(self) -> None:
+        self.assertEqual(
+            ReinitializeRepositoryAPI._batch_repository_file_changes(
+                {"add": [], "update": [], "delete": [self._file("file5")]}
+            ),
+            [
+                {
+                    "files": [],
+                    "changes": {self._path("file5"): "delete"},
+                    "file_references": {},
+                    "file_deltas": {},
+                }
+            ],
+        )
+
+    def test_batch_repository_file_changes_counts_deletes(self) -> None:
+        deleted_files = [self._file(f"deleted{i}") for i in range(100)]
+
+        planned_batches = ReinitializeRepositoryAPI._batch_repository_file_changes(
+            {"add": [], "update": [self._file("file4")], "delete": deleted_files},
+            4 * 1024,
+        )
+
+        self.assertGreater(len(planned_batches), 1)
+        self.assertEqual(
+            {
+                file_path
+                for planned_batch in planned_batches
+                for file_path in planned_batch["changes"]
+            },
+            {self._path("file4"), *(str(file.path) for file in deleted_files)},
+        )
+
+        for planned_batch in planned_batches:
+            self.assertLessEqual(
+                len(
+                    json.dumps(
+                        {
+                            "files": {
+                                chunk_range["path"]: {
+                                    "content": base64.b64encode(
+                                        bytes(chunk_range["end"])
+                                    ).decode("utf-8"),
+                                }
+                                for chunk_range in planned_batch["files"]
+                            },
+                            "changes": planned_batch["changes"],
+                        }
+                    )
+                ),
+                4 * 1024,
+            )
+
+    def test_batch_repository_file_changes_with_file_references(self) -> None:
+        file_references = {
+            self._path("file2"): self._file("file2").blob_hash,
+            self._path("file3"): self._file("file3").blob_hash,
+        }
+
+        planned_batches = ReinitializeRepositoryAPI._batch_repository_file_changes(
+            self.repository_file_changes, 10 * 1024, file_references
+        )
+
+        self.assertEqual(
+            {
+                chunk_range["path"]
+                for planned_batch in planned_batches
+                for chunk_range in planned_batch["files"]
+            },
+            {self._path("file1"), self._path("file4")},
+        )
+        self.assertEqual(planned_batches[-1]["file_references"], file_references)
+        self.assertEqual(planned_batches[-1]["changes"][self._path("file2")], "add")
+        self.assertEqual(
+            planned_batches[-1]["changes"][self._path("file3")], "update"
+        )
+
+    def test_create_file_deltas(self) -> None:
+        base_content = self.file_contents["file3"]
+        self._file("file3").path.write_bytes(b"header\n" + base_content)
+        file_blob_hashes = ReinitializeRepositoryAPI._get_file_blob_hashes(
+            [self._file("file3"), self._file("file4")]
+        )
+
+        file_deltas = ReinitializeRepositoryAPI._create_file_deltas(
+            [self._file("file3"), self._file("file4")],
+            file_blob_hashes,
+            lambda file_path: base_content if file_path == self._path("file3") else None,
+        )
+
+        self.assertEqual(
+            file_deltas,
+            {
+                self._path("file3"): {
+                    "base_blob_hash": File.get_blob_hash(base_content),
+                    "blob_hash": file_blob_hashes[self._path("file3")],
+                    "edits": [
+                        {
+                            "start_line": 0,
+                            "end_line": 0,
+                            "content": base64.b64encode(b"header\n").decode("utf-8"),
+                        }
+                    ],
+                }
+            },
+        )
+
+    def test_create_file_deltas_skips_larger_deltas(self) -> None:
+        self.assertEqual(
+            ReinitializeRepositoryAPI._create_file_deltas(
+                [self._file("file4")],
+                {self._path("file4"): self._file("file4").blob_hash},
+                lambda file_path: b"",
+            ),
+            {},
+        )
+
+    @patch("insight_cli.api.ReinitializeRepositoryAPI._make_batch_request")
+    def test_make_request_without_file_deltas_support(
+        self, mock_make_batch_request
+    ) -> None:
+        base_content = self.file_contents["file3"]
+        self._file("file3").path.write_bytes(b"header\n" + base_content)
+
+        ReinitializeRepositoryAPI().make_request(
+            "123",
+            {"add": [], "update": [self._file("file3")], "delete": []},
+            get_base_content=lambda file_path: base_content,
+        )
+
+        (payload,) = [call.args[0] for call in mock_make_batch_request.call_args_list]
+
+        self.assertEqual(payload["file_deltas"], {})
+        self.assertEqual(set(payload["files"]), {self._path("file3")})
+
+    @patch("requests.Session.request")
+    def test_make_request_with_rejected_file_deltas(self, mock_put) -> None:
+        base_content = self.file_contents["file3"]
+        self._file("file3").path.write_bytes(b"header\n" + base_content)
+        self._support_file_deltas()
+
+        for status_code in [400, 412, 422]:
+            with self.subTest(status_code=status_code):
+                mock_put.reset_mock()
+                base_rejected_response = MagicMock(status_code=status_code)
+                base_rejected_response.raise_for_status.side_effect = (
+                    requests.exceptions.HTTPError(response=base_rejected_response)
+                )
+                mock_put.side_effect = [
+                    base_rejected_response,
+                    MagicMock(status_code=200),
+                ]
+
+                ReinitializeRepositoryAPI().make_request(
+                    "123",
+                    {"add": [], "update": [self._file("file3")], "delete": []},
+                    get_base_content=lambda file_path: base_content,
+                )
+
+                self.assertEqual(mock_put.call_count, 2)
+
+    @patch("insight_cli.api.ReinitializeRepositoryAPI._make_batch_request")
+    def test_make_request_with_rejected_file_deltas_keeps_acknowledged_batches(
+        self, mock_make_batch_request
+    ) -> None:
+        base_content = self.file_contents["file3"]
+        self._file("file3").path.write_bytes(b"header\n" + base_content)
+        self._support_file_deltas()
+        base_rejected_response = MagicMock(status_code=412)
+        payloads = []
+
+        def make_batch_request(payload: dict) -> None:
+            payloads.append(payload)
+
+            if payload["file_deltas"]:
+                raise requests.exceptions.HTTPError(response=base_rejected_response)
+
+        mock_make_batch_request.side_effect = make_batch_request
+
+        with patch.object(ReinitializeRepositoryAPI, "_MAX_BATCH_SIZE_BYTES", 16 * 1024):
+            ReinitializeRepositoryAPI().make_request(
+                "123",
+                {
+                    "add": [self._file("file1"), self._file("file2")],
+                    "update": [self._file("file3")],
+                    "delete": [self._file("file5")],
+                },
+                get_base_content=lambda file_path: base_content,
+            )
+
+        self.assertEqual(len(payloads), 4)
+
+        rejected_payload = next(
+            payload for payload in payloads[:2] if payload["file_deltas"]
+        )
+        resent_payloads = payloads[2:]
+
+        self.assertEqual(
+            set().union(*(payload["files"] for payload in resent_payloads)),
+            {*rejected_payload["files"], self._path("file3")},
+        )
+        self.assertEqual(
+            {
+                file_path: change
+                for payload in resent_payloads
+                for file_path, change in payload["changes"].items()
+            },
+            {**rejected_payload["changes"], self._path("file3"): "update"},
+        )
+        self.assertFalse(any(payload["file_deltas"] for payload in resent_payloads))
+
+    @patch("requests.Session.request")
     def test_make_batch_request(self, mock_request_put) -> None:
         payload = {
             "files": {
-                "file3": bytes(5 * 1024**2),
-                "file4": bytes(2 * 1024**2),
-                "file5": bytes(0),
-                "file6": bytes(0),
+                "file3": {
+                    "content": b"a" * 5 * 1024**2,
+                    "size_bytes": 5 * 1024**2,
+                    "chunk_index": 0,
+                    "num_total_chunks": 1,
+                },
+                "file4": {
+                    "content": b"a" * 2 * 1024**2,
+                    "size_bytes": 2 * 1024**2,
+                    "chunk_index": 0,
+                    "num_total_chunks": 1,
+                },
             },
             "changes": {
                 "file3": "update",
@@ -133,6 +394,9 @@ class TestReinitializeRepositoryAPI(unittest.TestCase):
                 "file6": "delete",
             },
             "repository_id": "12312",
+            "batch_id": "batch_id",
+            "file_references": {},
+            "file_deltas": {},
             "batch_index": 1,
             "num_total_batches": 1,
         }
@@ -140,39 +404,77 @@ class TestReinitializeRepositoryAPI(unittest.TestCase):
         ReinitializeRepositoryAPI._make_batch_request(payload)
 
         mock_request_put.assert_called_once_with(
+            "PUT",
             url=f"{config.INSIGHT_API_BASE_URL}/reinitialize_repository",
-            json={
+            headers={
+                "Idempotency-Key": payload["batch_id"],
+                "Content-Type": "application/json",
+            },
+            data=ANY,
+            timeout=config.INSIGHT_API_TIMEOUTS["reinitialize_repository"],
+        )
+        self.assertEqual(
+            json.loads(
+                RequestBodyCompressor.decompress(
+                    mock_request_put.call_args.kwargs["data"],
+                    RequestBodyCompressor().encoding,
+                )
+            ),
+            {
                 "repository_id": payload["repository_id"],
-                "files": payload["files"],
+                "files": {
+                    file_path: {
+                        **file,
+                        "content": base64.b64encode(file["content"]).decode("utf-8"),
+                    }
+                    for file_path, file in payload["files"].items()
+                },
                 "changes": payload["changes"],
                 "batch_index": payload["batch_index"],
                 "num_total_batches": payload["num_total_batches"],
+                "file_references": payload["file_references"],
+                "file_deltas": payload["file_deltas"],
             },
-            timeout=None
         )
 
-    @patch("requests.put")
+    @patch("requests.Session.request")
     def test_make_request(self, mock_put):
         repository_id = "123"
-        repository_file_changes = {
-            "add": [
-                ("file1", bytes(11 * 1024**2)),
-                ("file2", bytes(10 * 1024**2)),
-            ],
-            "update": [
-                ("file3", bytes(5 * 1024**2)),
-                ("file4", bytes(2 * 1024**2)),
-            ],
-            "delete": [
-                ("file5", bytes(0)),
-                ("file6", bytes(0)),
-            ],
-        }
 
-        ReinitializeRepositoryAPI().make_request(repository_id, repository_file_changes)
+        with patch.object(ReinitializeRepositoryAPI, "_MAX_BATCH_SIZE_BYTES", 16 * 1024):
+            ReinitializeRepositoryAPI().make_request(
+                repository_id, self.repository_file_changes
+            )
 
         self.assertEqual(mock_put.call_count, 3)
 
+    @patch("requests.Session.request")
+    def test_make_request_skips_acknowledged_batches(self, mock_put):
+        repository_id = "123"
+        planned_batches = ReinitializeRepositoryAPI._batch_repository_file_changes(
+            self.repository_file_changes, 10 * 1024
+        )
+        request_batch_plans = ReinitializeRepositoryAPI._add_metadata_to_batches(
+            planned_batches, repository_id
+        )
+        batch_ids = [
+            request_batch_plan["batch_id"] for request_batch_plan in request_batch_plans
+        ]
+        journal = MagicMock()
+        journal.is_acknowledged.side_effect = lambda batch_id: batch_id != batch_ids[1]
+
+        with patch.object(ReinitializeRepositoryAPI, "_MAX_BATCH_SIZE_BYTES", 10 * 1024):
+            ReinitializeRepositoryAPI().make_request(
+                repository_id, self.repository_file_changes, journal
+            )
+
+        journal.plan.assert_called_once_with(batch_ids)
+        journal.acknowledge.assert_called_once_with(batch_ids[1])
+        mock_put.assert_called_once()
+        self.assertEqual(
+            mock_put.call_args.kwargs["headers"]["Idempotency-Key"], batch_ids[1]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
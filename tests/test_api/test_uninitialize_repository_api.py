@@ -1,23 +1,52 @@
-from unittest.mock import patch
-import unittest
+from unittest.mock import patch, MagicMock
+import asyncio, requests, unittest
 
-from insight_cli.api import UninitializeRepositoryAPI
+from insight_cli.api import AsyncUninitializeRepositoryAPI, UninitializeRepositoryAPI
 from insight_cli.config import config
 
 
+def error_response(status_code: int) -> MagicMock:
+    response = MagicMock(status_code=status_code)
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+        response=response
+    )
+
+    return response
+
+
 class TestUninitializeRepositoryAPI(unittest.TestCase):
-    @patch("requests.delete")
+    @patch("requests.Session.request")
     def test_make_request(self, mock_request_get):
         repository_id = "test_repo_id"
 
         UninitializeRepositoryAPI().make_request(repository_id),
 
         mock_request_get.assert_called_once_with(
+            "DELETE",
             url=f"{config.INSIGHT_API_BASE_URL}/uninitialize_repository",
             json={"repository_id": repository_id},
-            timeout=None
+            timeout=config.INSIGHT_API_TIMEOUTS["uninitialize_repository"],
         )
 
+    @patch("time.sleep")
+    @patch("requests.Session.request")
+    def test_make_request_with_not_found_retry(self, mock_request_get, _):
+        mock_request_get.side_effect = [error_response(503), error_response(404)]
+
+        UninitializeRepositoryAPI().make_request("test_repo_id")
+
+        self.assertEqual(mock_request_get.call_count, 2)
+
+    @patch("requests.Session.request")
+    def test_make_request_with_not_found(self, mock_request_get):
+        mock_request_get.return_value = error_response(404)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            UninitializeRepositoryAPI().make_request("test_repo_id")
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            asyncio.run(AsyncUninitializeRepositoryAPI().make_request("test_repo_id"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,15 +6,17 @@ from insight_cli.config import config
 
 
 class TestValidateRepositoryIdAPI(unittest.TestCase):
-    @patch("requests.post")
+    @patch("requests.Session.request")
     def test_make_request(self, mock_request_get):
         repository_id = "test_repo_id"
 
         ValidateRepositoryIdAPI().make_request(repository_id),
 
         mock_request_get.assert_called_once_with(
+            "POST",
             url=f"{config.INSIGHT_API_BASE_URL}/validate_repository_id",
             json={"repository_id": repository_id},
+            timeout=config.INSIGHT_API_TIMEOUTS["validate_repository_id"],
         )
 
 
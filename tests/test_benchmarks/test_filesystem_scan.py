@@ -0,0 +1,55 @@
+from pathlib import Path
+import os, tempfile, unittest
+
+from benchmarks.filesystem_scan import SyscallCounter, compare, create_tree, run
+
+
+class TestFilesystemScan(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_syscall_counter(self) -> None:
+        file_path = self.temp_dir_path / "file1.py"
+        file_path.write_text("")
+
+        with SyscallCounter() as counter:
+            os.path.getmtime(file_path)
+            file_path.is_file()
+            open(file_path).close()
+
+            with os.scandir(self.temp_dir_path) as entries:
+                for entry in entries:
+                    entry.is_file()
+                    entry.stat()
+                    entry.stat(follow_symlinks=False)
+
+        self.assertEqual(counter.counts, {"stat": 3, "open": 1, "scandir": 1})
+
+    def test_run(self) -> None:
+        create_tree(self.temp_dir_path, 100)
+        results = run(self.temp_dir_path, 1)
+
+        self.assertEqual(
+            results["Directory.file_modified_times"]["stat"],
+            results["Directory.largest_file_by_size"]["stat"],
+        )
+        self.assertGreater(results["Directory._get_files"]["scandir"], 0)
+        self.assertGreater(results["Directory._get_files"]["stat"], 0)
+
+    def test_compare(self) -> None:
+        baseline = {"1000": {"stage1": {"seconds": 1.0}, "stage2": {"seconds": 1.0}}}
+        results = {"1000": {"stage1": {"seconds": 1.5}, "stage2": {"seconds": 1.0}}}
+
+        lines = compare(results, baseline, 1.1)
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith("REGRESSION"))
+        self.assertFalse(lines[1].endswith("REGRESSION"))
+
+
+if __name__ == "__main__":
+    unittest.main()
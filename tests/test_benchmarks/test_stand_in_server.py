@@ -0,0 +1,219 @@
+from pathlib import Path
+from unittest.mock import patch
+import tempfile, time, unittest
+
+from benchmarks.stand_in_server import StandInServer
+from insight_cli.api import (
+    CreateRepositoryAPI,
+    InitializeRepositoryAPI,
+    QueryRepositoryAPI,
+    ReinitializeRepositoryAPI,
+)
+from insight_cli.api.base import Client, RequestBodyCompressor
+from insight_cli.utils import File
+from insight_cli import config
+
+
+class TestStandInServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+        Client._instance = None
+
+    def tearDown(self) -> None:
+        Client._instance = None
+        self.temp_dir.cleanup()
+
+    def _create_file(self, file_name: str, content: bytes) -> File:
+        file_path = self.temp_dir_path / file_name
+        file_path.write_bytes(content)
+
+        return File(file_path)
+
+    def _upload(self, server: StandInServer, upload_format: str) -> None:
+        file1 = self._create_file("file1.py", b"def add(a, b):\n    return a + b\n")
+        file2 = self._create_file("file2.py", bytes(range(256)) * 64)
+
+        with patch.multiple(
+            config,
+            INSIGHT_API_BASE_URL=server.base_url,
+            INSIGHT_API_UPLOAD_FORMAT=upload_format,
+        ), patch.object(InitializeRepositoryAPI, "_MAX_BATCH_SIZE_BYTES", 4 * 1024):
+            repository_id = CreateRepositoryAPI.make_request()["repository_id"]
+            InitializeRepositoryAPI.make_request(repository_id, [file1, file2])
+
+            self.assertEqual(
+                server.repositories[repository_id].files,
+                {str(file1.path): file1.content, str(file2.path): file2.content},
+            )
+
+            file1.path.write_bytes(b"def subtract(a, b):\n    return a - b\n")
+            ReinitializeRepositoryAPI.make_request(
+                repository_id, {"add": [], "update": [file1], "delete": [file2]}
+            )
+
+            self.assertEqual(
+                server.repositories[repository_id].files,
+                {str(file1.path): file1.content},
+            )
+            self.assertEqual(
+                QueryRepositoryAPI.make_request(repository_id, "subtract", 1),
+                [
+                    {
+                        "path": str(file1.path),
+                        "start_line": 1,
+                        "end_line": 1,
+                        "content": "def subtract(a, b):",
+                    }
+                ],
+            )
+
+    def test_json_upload_format(self) -> None:
+        with StandInServer() as server:
+            self._upload(server, "json")
+
+    def test_binary_upload_format(self) -> None:
+        with StandInServer() as server:
+            self._upload(server, "binary")
+
+    def test_unsupported_compression_falls_back(self) -> None:
+        with StandInServer(
+            accepted_encodings=[RequestBodyCompressor.IDENTITY]
+        ) as server:
+            self._upload(server, "binary")
+
+    def test_unchanged_content_is_not_resent(self) -> None:
+        file1 = self._create_file("file1.py", b"def add(a, b):\n    return a + b\n")
+        file2 = self._create_file("file2.py", b"def add(a, b):\n    return a + b\n")
+
+        with StandInServer() as server, patch.object(
+            config, "INSIGHT_API_BASE_URL", server.base_url
+        ):
+            repository_ids = []
+
+            for _ in range(2):
+                repository_id = CreateRepositoryAPI.make_request()["repository_id"]
+                InitializeRepositoryAPI.make_request(repository_id, [file1, file2])
+                repository_ids.append(repository_id)
+
+            for repository_id in repository_ids:
+                self.assertEqual(
+                    server.repositories[repository_id].files,
+                    {str(file1.path): file1.content, str(file2.path): file2.content},
+                )
+
+            self.assertEqual(list(server.blobs.values()), [file1.content])
+
+    def test_empty_files_are_uploaded(self) -> None:
+        (self.temp_dir_path / "a").mkdir()
+        (self.temp_dir_path / "b").mkdir()
+        files = [
+            self._create_file("a/m.py", b"def add(a, b):\n    return a + b\n"),
+            self._create_file("a/__init__.py", b""),
+            self._create_file("b/__init__.py", b""),
+        ]
+
+        with StandInServer() as server, patch.object(
+            config, "INSIGHT_API_BASE_URL", server.base_url
+        ):
+            repository_id = CreateRepositoryAPI.make_request()["repository_id"]
+            InitializeRepositoryAPI.make_request(repository_id, files)
+
+            self.assertEqual(
+                server.repositories[repository_id].files,
+                {str(file.path): file.content for file in files},
+            )
+
+            files[0].path.write_bytes(b"")
+            files.append(self._create_file("c.py", b""))
+            ReinitializeRepositoryAPI.make_request(
+                repository_id, {"add": [files[3]], "update": [files[0]], "delete": []}
+            )
+
+            self.assertEqual(
+                server.repositories[repository_id].files,
+                {str(file.path): b"" for file in files},
+            )
+
+    def _reinitialize_with_base_content(
+        self, server: StandInServer, base_content: bytes
+    ) -> tuple[str, File]:
+        content = b"".join(b"line %d\n" % i for i in range(1000))
+        file = self._create_file("file.py", content)
+
+        repository_id = CreateRepositoryAPI.make_request()["repository_id"]
+        InitializeRepositoryAPI.make_request(repository_id, [file])
+        file.path.write_bytes(content.replace(b"line 500\n", b"line five hundred\n"))
+
+        ReinitializeRepositoryAPI.make_request(
+            repository_id,
+            {"add": [], "update": [file], "delete": []},
+            get_base_content=lambda file_path: base_content,
+        )
+
+        return repository_id, file
+
+    def test_file_delta_is_applied(self) -> None:
+        with StandInServer() as server, patch.object(
+            config, "INSIGHT_API_BASE_URL", server.base_url
+        ):
+            base_content = b"".join(b"line %d\n" % i for i in range(1000))
+            repository_id, file = self._reinitialize_with_base_content(
+                server, base_content
+            )
+
+            self.assertEqual(
+                server.repositories[repository_id].files,
+                {str(file.path): file.content},
+            )
+            self.assertLess(
+                server.bytes_received["reinitialize_repository"], len(file.content)
+            )
+
+    def test_file_delta_with_stale_base_falls_back(self) -> None:
+        with StandInServer() as server, patch.object(
+            config, "INSIGHT_API_BASE_URL", server.base_url
+        ):
+            repository_id, file = self._reinitialize_with_base_content(
+                server, b"line 0\n"
+            )
+
+            self.assertEqual(
+                server.repositories[repository_id].files,
+                {str(file.path): file.content},
+            )
+            self.assertEqual(server.requests_handled["reinitialize_repository"], 2)
+
+    def _query_stream(self, server: StandInServer) -> list[dict]:
+        file = self._create_file("file.py", b"water = 1\nfire = 2\nwater = 3\n")
+
+        with patch.object(config, "INSIGHT_API_BASE_URL", server.base_url):
+            repository_id = CreateRepositoryAPI.make_request()["repository_id"]
+            InitializeRepositoryAPI.make_request(repository_id, [file])
+
+            return list(QueryRepositoryAPI.stream_request(repository_id, "water", 5))
+
+    def test_streamed_query(self) -> None:
+        with StandInServer() as server:
+            self.assertEqual(
+                [match["start_line"] for match in self._query_stream(server)], [1, 3]
+            )
+
+    def test_buffered_query(self) -> None:
+        with StandInServer(streams_queries=False) as server:
+            self.assertEqual(
+                [match["start_line"] for match in self._query_stream(server)], [1, 3]
+            )
+
+    def test_latency(self) -> None:
+        with StandInServer(latency_seconds=0.2) as server, patch.object(
+            config, "INSIGHT_API_BASE_URL", server.base_url
+        ):
+            start_time = time.monotonic()
+            CreateRepositoryAPI.make_request()
+
+            self.assertGreaterEqual(time.monotonic() - start_time, 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
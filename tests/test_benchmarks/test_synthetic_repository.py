@@ -0,0 +1,67 @@
+from pathlib import Path
+import tempfile, unittest
+
+from benchmarks.synthetic_repository import SyntheticRepository
+
+
+class TestSyntheticRepository(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _create(self, dir_name: str) -> SyntheticRepository:
+        return SyntheticRepository(
+            self.temp_dir_path / dir_name, 50, 1024, max_depth=2
+        ).create()
+
+    def test_create(self) -> None:
+        repository = self._create("repository")
+
+        self.assertEqual(len(repository.file_paths), 50)
+        self.assertTrue(all(file_path.is_file() for file_path in repository.file_paths))
+        self.assertTrue(
+            all(
+                len(file_path.relative_to(repository.path).parts) <= 3
+                for file_path in repository.file_paths
+            )
+        )
+
+    def test_create_is_deterministic(self) -> None:
+        repository1 = self._create("repository1")
+        repository2 = self._create("repository2")
+
+        self.assertEqual(
+            [
+                (file_path.relative_to(repository1.path), file_path.read_bytes())
+                for file_path in repository1.file_paths
+            ],
+            [
+                (file_path.relative_to(repository2.path), file_path.read_bytes())
+                for file_path in repository2.file_paths
+            ],
+        )
+
+    def test_churn(self) -> None:
+        repository = self._create("repository")
+        contents = {
+            file_path: file_path.read_bytes() for file_path in repository.file_paths
+        }
+
+        changed_file_paths = repository.churn(0.1)
+
+        self.assertEqual(len(changed_file_paths), 5)
+        self.assertEqual(
+            {
+                file_path
+                for file_path in repository.file_paths
+                if file_path.read_bytes() != contents[file_path]
+            },
+            set(changed_file_paths),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
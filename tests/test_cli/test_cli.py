@@ -1,8 +1,12 @@
-import argparse, unittest
+from pathlib import Path
+import argparse, json, tempfile, unittest
 from unittest.mock import patch
 
+from insight_cli.api.base import Deadline
 from insight_cli.cli import CLI
 from insight_cli.commands import Command, QueryCommand, InitializeCommand
+from insight_cli.utils import Tracer
+from insight_cli import config
 
 
 class TestCLI(unittest.TestCase):
@@ -184,7 +188,7 @@ class TestCLI(unittest.TestCase):
 
         self.assertEqual(
             [action.dest for action in cli._parser._actions],
-            ["help", "initialize", "query"],
+            ["help", "initialize", "query", "profile"],
         )
 
         for command_name in cli._parsed_commands:
@@ -269,6 +273,61 @@ class TestCLI(unittest.TestCase):
 
         mock_print.assert_called_with("command 1 executor")
 
+    @patch("builtins.print")
+    @patch("sys.argv", ["", "--c"])
+    def test_execute_invoked_commands_out_of_time_budget(self, mock_print) -> None:
+        class Command1(Command):
+            def __init__(self):
+                super().__init__(
+                    flags=["--c"],
+                    description="command1",
+                )
+
+            def execute(self) -> None:
+                Deadline.check("command 1 stage")
+
+        cli = CLI(commands=[Command1()])
+
+        cli.parse_arguments()
+
+        with patch.dict(
+            config.INSIGHT_COMMAND_TIME_BUDGETS_SECONDS, {"c": 0}
+        ), self.assertRaises(SystemExit) as context:
+            cli.execute_invoked_commands()
+
+        self.assertEqual(context.exception.code, 1)
+        self.assertIn("command 1 stage", str(mock_print.call_args.args[0]))
+
+    @patch("builtins.print")
+    def test_execute_invoked_commands_with_profile(self, mock_print) -> None:
+        class Command1(Command):
+            def __init__(self):
+                super().__init__(
+                    flags=["--c"],
+                    description="command1",
+                )
+
+            def execute(self) -> None:
+                with Tracer.span("stage"):
+                    print("command 1 executor")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path_prefix = str(Path(temp_dir) / "profile")
+            cli = CLI(commands=[Command1()])
+
+            with patch("sys.argv", ["", "--c", "--profile", path_prefix]):
+                cli.parse_arguments()
+
+            cli.execute_invoked_commands()
+
+            trace = json.loads(Path(f"{path_prefix}.trace.json").read_text())
+            self.assertEqual(
+                [event["name"] for event in trace["traceEvents"]], ["stage"]
+            )
+            self.assertTrue(Path(f"{path_prefix}.pstats").is_file())
+
+        mock_print.assert_any_call("command 1 executor")
+
 
 if __name__ == "__main__":
     unittest.main()
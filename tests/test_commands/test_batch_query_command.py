@@ -0,0 +1,135 @@
+from pathlib import Path
+from unittest.mock import patch
+import contextlib, io, json, tempfile, unittest
+
+from insight_cli.commands import BatchQueryCommand
+from insight_cli.main import main
+from insight_cli import config
+from insight_cli.repository import InvalidRepositoryError
+from insight_cli.utils import Color
+
+
+class TestBatchQueryCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queries_path = Path(self.temp_dir.name) / "queries.jsonl"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_parse_queries(self) -> None:
+        self.assertEqual(
+            BatchQueryCommand._parse_queries(
+                [
+                    "find the database connection",
+                    "",
+                    '{"query": "water", "limit": 3}',
+                    '{"query": "fire"}',
+                    '"earth"',
+                    "42",
+                ],
+                5,
+            ),
+            [
+                ("find the database connection", 5),
+                ("water", 3),
+                ("fire", 5),
+                ("earth", 5),
+                ("42", 5),
+            ],
+        )
+
+    @patch("insight_cli.repository.Repository.query_batch_async")
+    def test_execute(self, mock_query_batch_async) -> None:
+        async def query_batch_async(queries):
+            yield 1, [{"path": "file.py"}]
+            yield 0, None
+
+        mock_query_batch_async.side_effect = query_batch_async
+        self.queries_path.write_text('water\n{"query": "fire", "limit": 2}\n')
+
+        with io.StringIO() as buffer, contextlib.redirect_stdout(buffer):
+            BatchQueryCommand().execute(str(self.queries_path), 1)
+            output = buffer.getvalue().splitlines()
+
+        mock_query_batch_async.assert_called_once_with([("water", 1), ("fire", 2)])
+        self.assertEqual(
+            [json.loads(line) for line in output],
+            [
+                {"index": 1, "query": "fire", "matches": [{"path": "file.py"}]},
+                {"index": 0, "query": "water", "matches": []},
+            ],
+        )
+
+    @patch("insight_cli.cli.cli.Deadline")
+    @patch("insight_cli.repository.Repository.query_batch_async")
+    def test_execute_through_cli(self, mock_query_batch_async, mock_deadline) -> None:
+        async def query_batch_async(queries):
+            yield 0, [{"path": "file.py"}]
+
+        mock_query_batch_async.side_effect = query_batch_async
+        self.queries_path.write_text("water\n")
+
+        with patch(
+            "sys.argv", ["insight", "-b", str(self.queries_path), "2"]
+        ), io.StringIO() as buffer, contextlib.redirect_stdout(buffer):
+            main()
+            output = buffer.getvalue().splitlines()
+
+        mock_query_batch_async.assert_called_once_with([("water", 2)])
+        mock_deadline.assert_called_once_with(
+            config.INSIGHT_COMMAND_TIME_BUDGETS_SECONDS["batch-query"]
+        )
+        self.assertEqual(
+            [json.loads(line) for line in output],
+            [{"index": 0, "query": "water", "matches": [{"path": "file.py"}]}],
+        )
+
+    @patch("builtins.print")
+    @patch("insight_cli.repository.Repository.query_batch_async")
+    def test_execute_with_invalid_repository(
+        self, mock_query_batch_async, mock_print
+    ) -> None:
+        Color.init()
+
+        async def query_batch_async(queries):
+            raise InvalidRepositoryError(Path.cwd())
+            yield
+
+        mock_query_batch_async.side_effect = query_batch_async
+        self.queries_path.write_text("water\n")
+
+        BatchQueryCommand().execute(str(self.queries_path), 1)
+
+        mock_print.assert_called_once_with(
+            Color.red(f"{Path.cwd()} is not an insight repository")
+        )
+
+    @patch("builtins.print")
+    def test_execute_with_invalid_limit(self, mock_print) -> None:
+        Color.init()
+
+        BatchQueryCommand().execute(str(self.queries_path), 0)
+
+        mock_print.assert_called_once_with(
+            Color.red("Limit must be a positive integer")
+        )
+
+    @patch("insight_cli.repository.Repository.query_batch_async")
+    @patch("builtins.print")
+    def test_execute_with_invalid_query_limit(
+        self, mock_print, mock_query_batch_async
+    ) -> None:
+        Color.init()
+        self.queries_path.write_text('water\n{"query": "fire", "limit": -1}\n')
+
+        BatchQueryCommand().execute(str(self.queries_path), 1)
+
+        mock_print.assert_called_once_with(
+            Color.red("Limit must be a positive integer")
+        )
+        mock_query_batch_async.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -55,6 +55,28 @@ class TestInitializeCommand(unittest.TestCase):
             ],
         )
 
+    @patch("builtins.print")
+    @patch("insight_cli.repository.Repository.initialize")
+    @patch("insight_cli.repository.Repository.reinitialize")
+    @patch(
+        "insight_cli.repository.Repository.is_valid",
+        new_callable=PropertyMock,
+        return_value=True,
+    )
+    def test_execute_with_repository_deleted_on_server(
+        self, mock_repository_is_valid, mock_reinitialize, mock_initialize, mock_print
+    ) -> None:
+        mock_reinitialize.side_effect = InvalidRepositoryError(Path())
+        initialize_command = InitializeCommand()
+
+        initialize_command.execute()
+
+        mock_reinitialize.assert_called_once()
+        mock_initialize.assert_called_once()
+        mock_print.assert_called_once_with(
+            Color.green(f"Initialized insight repository in {Path.cwd()}")
+        )
+
     @patch("insight_cli.repository.Repository.initialize")
     @patch(
         "insight_cli.repository.Repository.is_valid",
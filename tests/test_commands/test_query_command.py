@@ -65,8 +65,38 @@ class TestQueryCommand(unittest.TestCase):
             ],
         )
 
+    def test_print_matches_as_they_arrive(self) -> None:
+        printed_outputs = []
+
+        def get_matches():
+            for line in [1, 2]:
+                yield {
+                    "path": "/example_path",
+                    "start_line": line,
+                    "end_line": line,
+                    "content": "x = 1",
+                }
+
+                self.assertEqual(len(printed_outputs), line)
+
+        with patch(
+            "builtins.print",
+            side_effect=lambda output, **kwargs: printed_outputs.append(output),
+        ):
+            QueryCommand._print_matches(get_matches())
+
+        self.assertEqual(len(printed_outputs), 2)
+
+    @patch("builtins.print")
+    def test_print_matches_with_no_matches(self, mock_print) -> None:
+        Color.init()
+
+        QueryCommand._print_matches(iter([]))
+
+        mock_print.assert_called_once_with(Color.red("No matches found"))
+
     @patch("insight_cli.commands.QueryCommand._print_matches")
-    @patch("insight_cli.repository.Repository.query")
+    @patch("insight_cli.repository.Repository.query_stream")
     def test_execute_with_valid_repository(
         self, mock_repository_query, mock_print_matches
     ) -> None:
@@ -82,7 +112,7 @@ class TestQueryCommand(unittest.TestCase):
         mock_print_matches.assert_called_once()
 
     @patch("builtins.print")
-    @patch("insight_cli.repository.Repository.query")
+    @patch("insight_cli.repository.Repository.query_stream")
     def test_execute_with_invalid_repository(
         self, mock_repository_query, mock_print
     ) -> None:
@@ -100,7 +130,7 @@ class TestQueryCommand(unittest.TestCase):
             Color.red(f"{Path.cwd()} is not an insight repository")
         )
 
-    @patch("insight_cli.repository.Repository.query")
+    @patch("insight_cli.repository.Repository.query_stream")
     def test_execute_with_connection_error(self, mock_repository_query) -> None:
         Color.init()
         query_command = QueryCommand()
@@ -0,0 +1,105 @@
+from pathlib import Path
+from unittest.mock import patch
+import os, tempfile, unittest
+
+from insight_cli.commands import StatsCommand
+from insight_cli.repository import MetricsLog
+from insight_cli.utils import Color
+
+
+class TestStatsCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    @patch("builtins.print")
+    def test_execute_with_no_records(self, mock_print) -> None:
+        StatsCommand().execute()
+
+        mock_print.assert_called_once_with(
+            Color.red(f"No operations have been recorded for {Path('').resolve()}")
+        )
+
+    @patch("builtins.print")
+    def test_execute(self, mock_print) -> None:
+        os.mkdir(".insight")
+        metrics_log = MetricsLog(Path(".insight"))
+
+        for operation, duration_seconds in [("reinitialize", 2), ("query", 0.5)]:
+            metrics_log.append(
+                {
+                    "operation": operation,
+                    "start_time": 1702751393.0,
+                    "duration_seconds": duration_seconds,
+                    "endpoints": {
+                        "reinitialize_repository": {
+                            "latency_histogram": {"0": 1},
+                            "num_requests": 1,
+                            "bytes_sent": 2 * 1024**2,
+                            "bytes_received": 10,
+                        }
+                    },
+                    "num_batches": 1,
+                    "num_retries": 0,
+                    "concurrency": 4,
+                    "compression_ratio": 3.5,
+                    "num_hedges": 0,
+                    "num_hedge_wins": 0,
+                }
+            )
+
+        StatsCommand().execute()
+
+        lines = [line.split() for line in mock_print.call_args.args[0].split("\n")]
+        self.assertEqual(
+            lines[0], ["operation", "count", "p50", "ms", "p90", "ms", "p99", "ms"]
+        )
+        self.assertEqual(lines[1], ["query", "1", "500.0", "500.0", "500.0"])
+        self.assertEqual(lines[2], ["reinitialize", "1", "2000.0", "2000.0", "2000.0"])
+        self.assertEqual(
+            lines[5], ["reinitialize_repository", "2", "1000.0", "1000.0", "1000.0"]
+        )
+        self.assertEqual(
+            lines[-1][-7:], ["1", "0", "4", "2.00", "3.50", "2.00", "1.00"]
+        )
+        self.assertEqual(len(lines), 9)
+
+    @patch("builtins.print")
+    def test_execute_with_hedges_and_older_records(self, mock_print) -> None:
+        os.mkdir(".insight")
+        metrics_log = MetricsLog(Path(".insight"))
+        record = {
+            "operation": "reinitialize",
+            "start_time": 1702751393.0,
+            "duration_seconds": 1,
+            "endpoints": {},
+            "num_batches": 0,
+            "num_retries": 0,
+        }
+        metrics_log.append(record)
+        metrics_log.append(
+            {
+                **record,
+                "operation": "query",
+                "concurrency": None,
+                "compression_ratio": None,
+                "num_hedges": 3,
+                "num_hedge_wins": 2,
+            }
+        )
+
+        StatsCommand().execute()
+
+        lines = [line.split() for line in mock_print.call_args.args[0].split("\n")]
+        self.assertIn(["hedged", "requests", "3"], lines)
+        self.assertIn(["answered", "first", "by", "the", "hedge", "2"], lines)
+        self.assertEqual(lines[-1][-7:], ["0", "0", "-", "0.00", "-", "1.00", "0.00"])
+
+
+if __name__ == "__main__":
+    unittest.main()
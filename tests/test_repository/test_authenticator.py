@@ -1,6 +1,6 @@
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-import json, tempfile, unittest
+import json, tempfile, time, unittest
 
 from insight_cli.repository.authenticator import Authenticator
 
@@ -142,6 +142,89 @@ class Testauthenticator(unittest.TestCase):
 
         self.assertTrue(authenticator.is_valid)
 
+    @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
+    def test_is_valid_caches_validation(
+        self, mock_validate_repository_id_request
+    ) -> None:
+        Authenticator(self._temp_dir_path).create_file({"repository_id": "example"})
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+
+        self.assertTrue(Authenticator(self._temp_dir_path).is_valid)
+        self.assertTrue(Authenticator(self._temp_dir_path).is_valid)
+
+        mock_validate_repository_id_request.assert_called_once_with("example")
+
+    @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
+    def test_is_valid_does_not_cache_invalid_repository_id(
+        self, mock_validate_repository_id_request
+    ) -> None:
+        authenticator = Authenticator(self._temp_dir_path)
+        authenticator.create_file({"repository_id": "example"})
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": False
+        }
+
+        self.assertFalse(authenticator.is_valid)
+        self.assertFalse(authenticator.is_valid)
+
+        self.assertEqual(mock_validate_repository_id_request.call_count, 2)
+
+    @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
+    def test_is_valid_after_validation_expires(
+        self, mock_validate_repository_id_request
+    ) -> None:
+        authenticator = Authenticator(self._temp_dir_path, validation_ttl_seconds=0)
+        authenticator.create_file({"repository_id": "example"})
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+
+        self.assertTrue(authenticator.is_valid)
+        self.assertTrue(authenticator.is_valid)
+
+        self.assertEqual(mock_validate_repository_id_request.call_count, 2)
+
+    @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
+    def test_is_valid_revalidates_once_validation_expires(
+        self, mock_validate_repository_id_request
+    ) -> None:
+        authenticator = Authenticator(self._temp_dir_path, validation_ttl_seconds=60)
+        authenticator.create_file({"repository_id": "example"})
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        self.assertTrue(authenticator.is_valid)
+        validated_time = time.time()
+
+        with patch("time.time", return_value=validated_time + 45):
+            self.assertTrue(authenticator.is_valid)
+
+        mock_validate_repository_id_request.assert_called_once()
+
+        with patch("time.time", return_value=validated_time + 61):
+            self.assertTrue(authenticator.is_valid)
+
+        self.assertEqual(mock_validate_repository_id_request.call_count, 2)
+
+    @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
+    def test_invalidate(self, mock_validate_repository_id_request) -> None:
+        authenticator = Authenticator(self._temp_dir_path)
+        authenticator.create_file({"repository_id": "example"})
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+
+        self.assertTrue(authenticator.is_valid)
+
+        authenticator.invalidate()
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": False
+        }
+
+        self.assertFalse(authenticator.is_valid)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+from pathlib import Path
+import os, tempfile, unittest
+
+from insight_cli.repository.file_snapshots import FileSnapshots
+
+
+class TestFileSnapshots(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+        self.snapshots_dir_path = self.temp_dir_path / ".insight"
+        self.file_path1 = self.temp_dir_path / "file1.py"
+        self.file_path2 = self.temp_dir_path / "file2.py"
+        self.file_path1.write_bytes(b"print('hello')\n")
+        self.file_path2.write_bytes(b"print('hello')\n")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _get_num_snapshots(self) -> int:
+        return len(os.listdir(self.snapshots_dir_path / "snapshots")) - 1
+
+    def test_create(self) -> None:
+        file_snapshots = FileSnapshots(self.snapshots_dir_path)
+        file_snapshots.change_file_paths([self.file_path1], [])
+        file_snapshots.create()
+        file_snapshots = FileSnapshots(self.snapshots_dir_path)
+
+        self.assertIsNone(file_snapshots.get_content(str(self.file_path1)))
+        self.assertEqual(self._get_num_snapshots(), 0)
+
+    def test_change_file_paths(self) -> None:
+        file_snapshots = FileSnapshots(self.snapshots_dir_path)
+        file_snapshots.create()
+        file_snapshots.change_file_paths([self.file_path1, self.file_path2], [])
+
+        self.assertEqual(
+            file_snapshots.get_content(str(self.file_path1)), b"print('hello')\n"
+        )
+        self.assertEqual(
+            file_snapshots.get_content(str(self.file_path2)), b"print('hello')\n"
+        )
+        self.assertIsNone(file_snapshots.get_content("untracked.py"))
+        self.assertEqual(self._get_num_snapshots(), 1)
+
+        self.file_path1.write_bytes(b"print('bye')\n")
+        file_snapshots.change_file_paths([self.file_path1], [self.file_path2])
+        file_snapshots = FileSnapshots(self.snapshots_dir_path)
+
+        self.assertEqual(
+            file_snapshots.get_content(str(self.file_path1)), b"print('bye')\n"
+        )
+        self.assertIsNone(file_snapshots.get_content(str(self.file_path2)))
+        self.assertEqual(self._get_num_snapshots(), 1)
+
+    def test_change_file_paths_drops_oldest_snapshots(self) -> None:
+        self.file_path2.write_bytes(b"print('bye')\n")
+        file_snapshots = FileSnapshots(self.snapshots_dir_path, max_size_bytes=32)
+        file_snapshots.create()
+
+        file_snapshots.change_file_paths([self.file_path1], [])
+        file_snapshots.change_file_paths([self.file_path2], [])
+
+        self.assertIsNone(file_snapshots.get_content(str(self.file_path1)))
+        self.assertEqual(
+            file_snapshots.get_content(str(self.file_path2)), b"print('bye')\n"
+        )
+        self.assertEqual(self._get_num_snapshots(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -98,6 +98,20 @@ class TestFileTracker(unittest.TestCase):
             },
         )
 
+    def test_create_file_with_scanned_modified_times(self) -> None:
+        file_modified_times = {
+            self.temp_dir_path / "file1": datetime.fromtimestamp(1702751393.824125),
+            self.temp_dir_path / "file2": datetime.fromtimestamp(1701634560.0),
+        }
+        file_tracker = FileTracker(self.temp_dir_path)
+
+        file_tracker.create_file(list(file_modified_times), file_modified_times)
+
+        self.assertEqual(
+            FileTracker(self.temp_dir_path).tracked_file_modified_times,
+            file_modified_times,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -42,6 +42,7 @@ class TestManager(unittest.TestCase):
             paths_to_add=[Path(self.temp_dir.name + "/file3")],
             paths_to_update=[Path(self.temp_dir.name + "/file1")],
             paths_to_delete=[Path(self.temp_dir.name + "/file2")],
+            file_modified_times=None,
         )
 
     def test_delete(self):
@@ -0,0 +1,91 @@
+from pathlib import Path
+import tempfile, unittest
+
+from insight_cli.repository.metrics_log import MetricsLog, OperationRecord
+
+
+class TestMetricsLog(unittest.TestCase):
+    @staticmethod
+    def _get_record(operation: str, duration_seconds: float) -> OperationRecord:
+        return {
+            "operation": operation,
+            "start_time": 1702751393.0,
+            "duration_seconds": duration_seconds,
+            "endpoints": {
+                "query_repository": {
+                    "latency_histogram": {"-8": 1},
+                    "num_requests": 1,
+                    "bytes_sent": 10,
+                    "bytes_received": 20,
+                }
+            },
+            "num_batches": 0,
+            "num_retries": 0,
+        }
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_records_with_no_file(self) -> None:
+        self.assertEqual(MetricsLog(self.temp_dir_path).records, [])
+
+    def test_append_and_read(self) -> None:
+        record = TestMetricsLog._get_record("query", 0.5)
+
+        MetricsLog(self.temp_dir_path).append(record)
+
+        self.assertEqual(MetricsLog(self.temp_dir_path).records, [record])
+
+    def test_append_drops_oldest_records(self) -> None:
+        metrics_log = MetricsLog(self.temp_dir_path, max_num_records=2)
+
+        for duration_seconds in [1, 2, 3]:
+            metrics_log.append(TestMetricsLog._get_record("query", duration_seconds))
+
+        self.assertEqual(
+            [
+                record["duration_seconds"]
+                for record in MetricsLog(self.temp_dir_path).records
+            ],
+            [2, 3],
+        )
+
+    def test_append_without_parent_dir(self) -> None:
+        metrics_log = MetricsLog(self.temp_dir_path / ".insight")
+
+        metrics_log.append(TestMetricsLog._get_record("query", 0.5))
+
+        self.assertFalse((self.temp_dir_path / ".insight").exists())
+
+    def test_records_with_corrupt_file(self) -> None:
+        (self.temp_dir_path / MetricsLog._FILE_NAME).write_text("[{")
+
+        self.assertEqual(MetricsLog(self.temp_dir_path).records, [])
+
+    def test_get_latency_histograms(self) -> None:
+        metrics_log = MetricsLog(self.temp_dir_path)
+        metrics_log.append(TestMetricsLog._get_record("query", 0.5))
+        metrics_log.append(TestMetricsLog._get_record("query", 0.5))
+        metrics_log.append(TestMetricsLog._get_record("reinitialize", 2))
+
+        operation_histograms = metrics_log.get_operation_latency_histograms()
+        endpoint_histograms = metrics_log.get_endpoint_latency_histograms()
+
+        self.assertEqual(
+            {
+                operation: histogram.to_dict()
+                for operation, histogram in operation_histograms.items()
+            },
+            {"query": {"-8": 2}, "reinitialize": {"8": 1}},
+        )
+        self.assertEqual(
+            endpoint_histograms["query_repository"].to_dict(), {"-8": 3}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from datetime import datetime
+from pathlib import Path
+import tempfile, unittest
+
+from insight_cli.repository.query_cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+        self.file_modified_times = {
+            Path("file1.py"): datetime.fromtimestamp(1702751393.8241253),
+            Path("file2.py"): datetime.fromtimestamp(1701634560.0),
+        }
+        self.matches = [
+            {"path": "file1.py", "start_line": 1, "end_line": 1, "content": "x = 1"}
+        ]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_get_with_no_entry(self) -> None:
+        self.assertIsNone(
+            QueryCache(self.temp_dir_path).get("water", 1, self.file_modified_times)
+        )
+
+    def test_put_and_get(self) -> None:
+        QueryCache(self.temp_dir_path).put(
+            "water", 1, self.file_modified_times, self.matches
+        )
+        query_cache = QueryCache(self.temp_dir_path)
+
+        self.assertEqual(
+            query_cache.get("  water ", 1, self.file_modified_times), self.matches
+        )
+        self.assertIsNone(query_cache.get("water", 2, self.file_modified_times))
+
+    def test_get_after_unreferenced_file_changes(self) -> None:
+        query_cache = QueryCache(self.temp_dir_path)
+        query_cache.put("water", 1, self.file_modified_times, self.matches)
+        self.file_modified_times[Path("file2.py")] = datetime.now()
+
+        self.assertEqual(
+            query_cache.get("water", 1, self.file_modified_times), self.matches
+        )
+
+    def test_get_after_referenced_file_changes(self) -> None:
+        query_cache = QueryCache(self.temp_dir_path)
+        query_cache.put("water", 1, self.file_modified_times, self.matches)
+        self.file_modified_times[Path("file1.py")] = datetime.now()
+
+        self.assertIsNone(query_cache.get("water", 1, self.file_modified_times))
+
+    def test_get_after_tracked_files_change(self) -> None:
+        query_cache = QueryCache(self.temp_dir_path)
+        query_cache.put("water", 1, self.file_modified_times, self.matches)
+        self.file_modified_times[Path("file3.py")] = datetime.now()
+
+        self.assertIsNone(query_cache.get("water", 1, self.file_modified_times))
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        query_cache = QueryCache(self.temp_dir_path, max_size_bytes=500)
+        query_cache.put("water", 1, self.file_modified_times, self.matches)
+        query_cache.put("fire", 1, self.file_modified_times, self.matches)
+        query_cache.get("water", 1, self.file_modified_times)
+        query_cache.put("earth", 1, self.file_modified_times, self.matches)
+        query_cache = QueryCache(self.temp_dir_path, max_size_bytes=500)
+
+        self.assertIsNone(query_cache.get("fire", 1, self.file_modified_times))
+        self.assertEqual(
+            query_cache.get("water", 1, self.file_modified_times), self.matches
+        )
+        self.assertEqual(
+            query_cache.get("earth", 1, self.file_modified_times), self.matches
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,9 @@
 from pathlib import Path
-from unittest.mock import patch
-import tempfile, unittest
+from unittest.mock import MagicMock, patch
+import asyncio, requests, tempfile, unittest
 
 from insight_cli.repository import Repository, InvalidRepositoryError
+from insight_cli import config
 
 
 class TestRepository(unittest.TestCase):
@@ -14,8 +15,8 @@ class TestRepository(unittest.TestCase):
         self._temp_dir.cleanup()
 
     @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
-    @patch("insight_cli.api.InitializeRepositoryAPI.make_request")
-    @patch("insight_cli.api.CreateRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
     def test_initialize_with_non_existing_repository(
         self,
         mock_create_repository_request,
@@ -37,8 +38,8 @@ class TestRepository(unittest.TestCase):
         self.assertTrue(repository.is_valid)
 
     @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
-    @patch("insight_cli.api.InitializeRepositoryAPI.make_request")
-    @patch("insight_cli.api.CreateRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
     def test_initialize_with_existing_repository(
         self,
         mock_create_repository_request,
@@ -80,10 +81,10 @@ class TestRepository(unittest.TestCase):
         with self.assertRaises(InvalidRepositoryError):
             repository.reinitialize()
 
-    @patch("insight_cli.api.ReinitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncReinitializeRepositoryAPI.make_request")
     @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
-    @patch("insight_cli.api.InitializeRepositoryAPI.make_request")
-    @patch("insight_cli.api.CreateRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
     def test_reinitialize_with_existing_repository(
         self,
         mock_create_repository_request,
@@ -116,10 +117,10 @@ class TestRepository(unittest.TestCase):
         with self.assertRaises(InvalidRepositoryError):
             repository.uninitialize()
 
-    @patch("insight_cli.api.UninitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncUninitializeRepositoryAPI.make_request")
     @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
-    @patch("insight_cli.api.InitializeRepositoryAPI.make_request")
-    @patch("insight_cli.api.CreateRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
     def test_uninitialize_with_existing_repository(
         self,
         mock_create_repository_request,
@@ -154,10 +155,10 @@ class TestRepository(unittest.TestCase):
         with self.assertRaises(InvalidRepositoryError):
             repository.query(query_string, limit)
 
-    @patch("insight_cli.api.QueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
     @patch("insight_cli.api.ValidateRepositoryIdAPI.make_request")
-    @patch("insight_cli.api.InitializeRepositoryAPI.make_request")
-    @patch("insight_cli.api.CreateRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
     def test_query_with_existing_repository(
         self,
         mock_create_repository_request,
@@ -185,6 +186,265 @@ class TestRepository(unittest.TestCase):
 
         self.assertTrue(repository.is_valid)
 
+    @patch("insight_cli.api.AsyncReinitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncValidateRepositoryIdAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
+    def test_query_batch(
+        self,
+        mock_create_repository_request,
+        mock_initialize_repository_request,
+        mock_validate_repository_id_request,
+        mock_query_repository_request,
+        mock_reinitialize_repository_request,
+    ) -> None:
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        mock_create_repository_request.return_value = {"repository_id": "123"}
+        mock_query_repository_request.side_effect = (
+            lambda repository_id, query_string, limit, **kwargs: [
+                {"path": "new_file.py", "content": query_string}
+            ]
+        )
+        repository = Repository(self._temp_dir_path)
+        repository.initialize()
+        Path(repository._path / "new_file.py").touch()
+        repository.query("water", 1)
+
+        async def query_batch() -> list:
+            return [
+                result
+                async for result in repository.query_batch_async(
+                    [("water", 1), ("fire", 1), ("earth", 2)]
+                )
+            ]
+
+        results = asyncio.run(query_batch())
+
+        self.assertEqual(results[0], (0, [{"path": "new_file.py", "content": "water"}]))
+        self.assertEqual(
+            sorted(results),
+            [
+                (0, [{"path": "new_file.py", "content": "water"}]),
+                (1, [{"path": "new_file.py", "content": "fire"}]),
+                (2, [{"path": "new_file.py", "content": "earth"}]),
+            ],
+        )
+        self.assertEqual(mock_query_repository_request.call_count, 3)
+        mock_reinitialize_repository_request.assert_called_once()
+
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncValidateRepositoryIdAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
+    def test_query_batch_limits_and_cancels_queries(
+        self,
+        mock_create_repository_request,
+        mock_initialize_repository_request,
+        mock_validate_repository_id_request,
+        mock_query_repository_request,
+    ) -> None:
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        mock_create_repository_request.return_value = {"repository_id": "123"}
+        num_in_flight, max_num_in_flight, query_strings = 0, 0, []
+
+        async def query(repository_id, query_string, limit, is_hedged):
+            nonlocal num_in_flight, max_num_in_flight
+            self.assertFalse(is_hedged)
+            num_in_flight += 1
+            max_num_in_flight = max(max_num_in_flight, num_in_flight)
+            await asyncio.sleep(0.01)
+            num_in_flight -= 1
+            query_strings.append(query_string)
+
+            if query_string == "query 3":
+                raise ValueError()
+
+            return []
+
+        mock_query_repository_request.side_effect = query
+        repository = Repository(self._temp_dir_path)
+        repository.initialize()
+
+        async def query_batch() -> None:
+            async for _ in repository.query_batch_async(
+                [(f"query {i}", 1) for i in range(20)]
+            ):
+                pass
+
+        with patch.object(
+            config, "INSIGHT_API_MAX_CONCURRENCY", 2
+        ), self.assertRaises(ValueError):
+            asyncio.run(query_batch())
+
+        self.assertEqual(max_num_in_flight, 2)
+        self.assertLess(len(query_strings), 20)
+
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncValidateRepositoryIdAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
+    def test_query_with_unknown_repository_id(
+        self,
+        mock_create_repository_request,
+        mock_initialize_repository_request,
+        mock_validate_repository_id_request,
+        mock_query_repository_request,
+    ) -> None:
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        mock_create_repository_request.return_value = {"repository_id": "123"}
+        mock_query_repository_request.side_effect = requests.exceptions.HTTPError(
+            response=MagicMock(status_code=404)
+        )
+        Repository(self._temp_dir_path).initialize()
+
+        with self.assertRaises(InvalidRepositoryError):
+            Repository(self._temp_dir_path).query("water", 1)
+
+        self.assertFalse(
+            (self._temp_dir_path / ".insight" / "validation.json").is_file()
+        )
+
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncValidateRepositoryIdAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
+    def test_query_returns_cached_matches(
+        self,
+        mock_create_repository_request,
+        mock_initialize_repository_request,
+        mock_make_validate_repository_id_request,
+        mock_query_repository_request,
+    ) -> None:
+        mock_make_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        mock_create_repository_request.return_value = {"repository_id": "123"}
+        file_path = self._temp_dir_path / "water.py"
+        file_path.write_text("water = 1\n")
+        mock_query_repository_request.return_value = [
+            {
+                "path": str(file_path),
+                "start_line": 1,
+                "end_line": 1,
+                "content": "water = 1",
+            }
+        ]
+        Repository(self._temp_dir_path).initialize()
+
+        for _ in range(2):
+            self.assertEqual(
+                Repository(self._temp_dir_path).query("water", 1),
+                mock_query_repository_request.return_value,
+            )
+
+        mock_query_repository_request.assert_called_once()
+        mock_make_validate_repository_id_request.assert_called_once()
+
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncValidateRepositoryIdAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
+    def test_query_validates_repository_id_asynchronously(
+        self,
+        mock_create_repository_request,
+        mock_initialize_repository_request,
+        mock_validate_repository_id_request,
+        mock_query_repository_request,
+    ) -> None:
+        mock_create_repository_request.return_value = {"repository_id": "123"}
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        mock_query_repository_request.return_value = []
+        Repository(self._temp_dir_path).initialize()
+
+        self.assertEqual(Repository(self._temp_dir_path).query("water", 1), [])
+
+        mock_validate_repository_id_request.assert_awaited_once_with("123")
+        mock_query_repository_request.assert_awaited_once_with("123", "water", 1)
+
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncValidateRepositoryIdAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
+    def test_operations_are_recorded_in_metrics_log(
+        self,
+        mock_create_repository_request,
+        mock_initialize_repository_request,
+        mock_validate_repository_id_request,
+        mock_query_repository_request,
+    ) -> None:
+        mock_create_repository_request.return_value = {"repository_id": "123"}
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        mock_query_repository_request.return_value = []
+        Repository(self._temp_dir_path).initialize()
+        Repository(self._temp_dir_path).query("water", 1)
+
+        with self.assertRaises(ValueError), patch(
+            "insight_cli.api.AsyncQueryRepositoryAPI.make_request",
+            side_effect=ValueError(),
+        ):
+            Repository(self._temp_dir_path).query("fire", 1)
+
+        records = Repository(self._temp_dir_path).metrics_log.records
+
+        self.assertEqual(
+            [record["operation"] for record in records], ["initialize", "query"]
+        )
+        self.assertTrue(all(record["duration_seconds"] >= 0 for record in records))
+
+    @patch("insight_cli.api.QueryRepositoryAPI.add_latency_history")
+    @patch("insight_cli.api.AsyncQueryRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncValidateRepositoryIdAPI.make_request")
+    @patch("insight_cli.api.AsyncInitializeRepositoryAPI.make_request")
+    @patch("insight_cli.api.AsyncCreateRepositoryAPI.make_request")
+    def test_query_loads_latency_history_into_hedger(
+        self,
+        mock_create_repository_request,
+        mock_initialize_repository_request,
+        mock_validate_repository_id_request,
+        mock_query_repository_request,
+        mock_add_latency_history,
+    ) -> None:
+        mock_create_repository_request.return_value = {"repository_id": "123"}
+        mock_validate_repository_id_request.return_value = {
+            "repository_id_is_valid": True
+        }
+        mock_query_repository_request.return_value = []
+        repository = Repository(self._temp_dir_path)
+        repository.initialize()
+        repository.metrics_log.append(
+            {
+                "operation": "query",
+                "start_time": 0,
+                "duration_seconds": 0.5,
+                "endpoints": {
+                    "query_repository": {
+                        "latency_histogram": {"-8": 1},
+                        "num_requests": 1,
+                        "bytes_sent": 0,
+                        "bytes_received": 0,
+                    }
+                },
+                "num_batches": 0,
+                "num_retries": 0,
+            }
+        )
+
+        Repository(self._temp_dir_path).query("water", 1)
+
+        mock_add_latency_history.assert_called_once()
+        self.assertEqual(mock_add_latency_history.call_args.args[0].num_samples, 1)
+
     def test_is_valid_with_invalid_repository(self) -> None:
         repository = Repository(self._temp_dir_path)
         self.assertFalse(repository.is_valid)
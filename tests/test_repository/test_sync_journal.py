@@ -0,0 +1,108 @@
+from datetime import datetime
+from pathlib import Path
+import tempfile, unittest
+
+from insight_cli.repository.sync_journal import SyncJournal
+
+
+class TestSyncJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+        self.file_modified_times = {
+            Path("file1"): datetime.fromtimestamp(1702751393.8241253),
+            Path("file2"): datetime.fromtimestamp(1701634560.0),
+        }
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_get_resumable_repository_id(self) -> None:
+        sync_journal = SyncJournal(self.temp_dir_path)
+
+        self.assertIsNone(
+            sync_journal.get_resumable_repository_id(
+                "initialize", self.file_modified_times
+            )
+        )
+
+        sync_journal.begin("initialize", "123", self.file_modified_times)
+        sync_journal = SyncJournal(self.temp_dir_path)
+
+        self.assertEqual(sync_journal.pending_operation, "initialize")
+        self.assertEqual(
+            sync_journal.get_resumable_repository_id(
+                "initialize", self.file_modified_times
+            ),
+            "123",
+        )
+        self.assertIsNone(
+            sync_journal.get_resumable_repository_id(
+                "reinitialize", self.file_modified_times
+            )
+        )
+        self.assertIsNone(
+            sync_journal.get_resumable_repository_id(
+                "initialize",
+                {**self.file_modified_times, Path("file3"): datetime.now()},
+            )
+        )
+
+    def test_acknowledged_batches_persist(self) -> None:
+        sync_journal = SyncJournal(self.temp_dir_path)
+        sync_journal.begin("initialize", "123", self.file_modified_times)
+        sync_journal.plan(["batch1", "batch2"])
+        sync_journal.acknowledge("batch1")
+
+        sync_journal = SyncJournal(self.temp_dir_path)
+        sync_journal.begin("initialize", "123", self.file_modified_times)
+        sync_journal.plan(["batch1", "batch2"])
+
+        self.assertTrue(sync_journal.is_acknowledged("batch1"))
+        self.assertFalse(sync_journal.is_acknowledged("batch2"))
+
+    def test_begin_with_changed_files_discards_acknowledged_batches(self) -> None:
+        sync_journal = SyncJournal(self.temp_dir_path)
+        sync_journal.begin("initialize", "123", self.file_modified_times)
+        sync_journal.plan(["batch1"])
+        sync_journal.acknowledge("batch1")
+
+        sync_journal = SyncJournal(self.temp_dir_path)
+        sync_journal.begin("initialize", "123", {})
+
+        self.assertFalse(sync_journal.is_acknowledged("batch1"))
+
+    def test_plan_with_different_batches_discards_acknowledged_batches(self) -> None:
+        sync_journal = SyncJournal(self.temp_dir_path)
+        sync_journal.begin("reinitialize", "123", self.file_modified_times)
+        sync_journal.plan(["batch1"])
+        sync_journal.acknowledge("batch1")
+        sync_journal.plan(["batch1", "batch2"])
+
+        self.assertFalse(SyncJournal(self.temp_dir_path).is_acknowledged("batch1"))
+
+    def test_truncated_last_line_is_ignored(self) -> None:
+        sync_journal = SyncJournal(self.temp_dir_path)
+        sync_journal.begin("initialize", "123", self.file_modified_times)
+        sync_journal.plan(["batch1", "batch2"])
+        sync_journal.acknowledge("batch1")
+
+        with open(self.temp_dir_path / SyncJournal._FILE_NAME, "a") as file:
+            file.write('{"acknowledged_batch_id": "bat')
+
+        sync_journal = SyncJournal(self.temp_dir_path)
+
+        self.assertTrue(sync_journal.is_acknowledged("batch1"))
+        self.assertFalse(sync_journal.is_acknowledged("batch2"))
+
+    def test_complete(self) -> None:
+        sync_journal = SyncJournal(self.temp_dir_path)
+        sync_journal.begin("initialize", "123", self.file_modified_times)
+        sync_journal.complete()
+
+        self.assertFalse((self.temp_dir_path / SyncJournal._FILE_NAME).exists())
+        self.assertIsNone(SyncJournal(self.temp_dir_path).pending_operation)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from insight_cli.utils import BatchFrameCodec
+
+
+class TestBatchFrameCodec(unittest.TestCase):
+    def test_encode_decode(self) -> None:
+        batch_header = {"batch_index": 0, "num_total_batches": 1}
+        file_chunks = [
+            ({"path": "file1", "chunk_index": 0, "num_total_chunks": 1}, b"content1"),
+            (
+                {"path": "file2", "chunk_index": 1, "num_total_chunks": 2},
+                memoryview(b"\x00\xff" * 100),
+            ),
+            ({"path": "file3", "chunk_index": 0, "num_total_chunks": 1}, b""),
+        ]
+
+        decoded_batch_header, decoded_file_chunks = BatchFrameCodec.decode(
+            BatchFrameCodec.encode(batch_header, file_chunks)
+        )
+
+        self.assertEqual(decoded_batch_header, batch_header)
+        self.assertEqual(
+            [(header, bytes(content)) for header, content in decoded_file_chunks],
+            [(header, bytes(content)) for header, content in file_chunks],
+        )
+
+    def test_encode_size(self) -> None:
+        body = BatchFrameCodec.encode({}, [({}, b"a" * 1000)])
+
+        self.assertEqual(len(body), 5 + 2 * (4 + len(b"{}") + 8) + 1000)
+
+    def test_decode_invalid_body(self) -> None:
+        body = BatchFrameCodec.encode({}, [({"path": "file1"}, b"content")])
+
+        for invalid_body in [b"", b"XXXX\x01", body[:-1], body[:10]]:
+            with self.assertRaises(ValueError):
+                BatchFrameCodec.decode(invalid_body)
+
+
+if __name__ == "__main__":
+    unittest.main()
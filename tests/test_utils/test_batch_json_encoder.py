@@ -0,0 +1,46 @@
+from unittest.mock import patch
+import base64, json, unittest
+
+from insight_cli.utils import BatchJsonEncoder
+
+
+class TestBatchJsonEncoder(unittest.TestCase):
+    def test_encode(self) -> None:
+        batch_header = {"batch_index": 0, "changes": {'dir/"file1"': "add"}}
+        files = {
+            'dir/"file1"': {
+                "content": memoryview(b"Hello, World!" * 100),
+                "size_bytes": 1300,
+                "chunk_index": 0,
+                "num_total_chunks": 1,
+            },
+            "file2": {"content": b""},
+        }
+
+        with patch.object(BatchJsonEncoder, "_BASE64_BLOCK_SIZE_BYTES", 3 * 4):
+            body = BatchJsonEncoder.encode(batch_header, files)
+
+        self.assertEqual(
+            json.loads(body),
+            {
+                **batch_header,
+                "files": {
+                    'dir/"file1"': {
+                        "content": base64.b64encode(b"Hello, World!" * 100).decode(
+                            "utf-8"
+                        ),
+                        "size_bytes": 1300,
+                        "chunk_index": 0,
+                        "num_total_chunks": 1,
+                    },
+                    "file2": {"content": ""},
+                },
+            },
+        )
+
+    def test_encode_with_no_batch_header(self) -> None:
+        self.assertEqual(json.loads(BatchJsonEncoder.encode({}, {})), {"files": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
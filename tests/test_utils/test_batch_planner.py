@@ -0,0 +1,166 @@
+import base64, json, unittest
+
+from insight_cli.utils import BatchPlanner
+
+
+class TestBatchPlanner(unittest.TestCase):
+    @staticmethod
+    def _get_chunks(planned_batches: list[list[dict]]) -> list[list[tuple]]:
+        return [
+            [
+                (chunk["path"], chunk["start"], chunk["end"], chunk["chunk_index"])
+                for chunk in batch
+            ]
+            for batch in planned_batches
+        ]
+
+    def test_get_content_size_bytes(self) -> None:
+        for size_bytes in range(10):
+            self.assertEqual(
+                BatchPlanner.get_content_size_bytes(size_bytes),
+                len(base64.b64encode(bytes(size_bytes))),
+            )
+            self.assertEqual(
+                BatchPlanner.get_content_size_bytes(size_bytes, "binary"), size_bytes
+            )
+
+    def test_get_chunk_size_bytes(self) -> None:
+        path = 'dir/"file1"'
+        chunk_size_bytes = len(
+            json.dumps(
+                {
+                    path: {
+                        "content": base64.b64encode(bytes(100)).decode("utf-8"),
+                        "size_bytes": 100,
+                        "chunk_index": 0,
+                        "num_total_chunks": 1,
+                    }
+                }
+            )
+            + json.dumps({path: "update"})
+        )
+
+        self.assertGreaterEqual(
+            BatchPlanner.get_chunk_size_bytes(path, 100), chunk_size_bytes
+        )
+
+    def test_get_batch_size_bytes(self) -> None:
+        max_batch_size_bytes = 512 + 1000
+        planned_batches = BatchPlanner.plan(
+            [("file1", 465), ("file2", 265), ("file3", 1465)],
+            max_batch_size_bytes,
+            "binary",
+        )
+
+        self.assertEqual(BatchPlanner.get_batch_size_bytes([]), 512)
+
+        for planned_batch in planned_batches:
+            self.assertLessEqual(
+                BatchPlanner.get_batch_size_bytes(planned_batch, "binary"),
+                max_batch_size_bytes,
+            )
+
+    def test_plan_with_no_files(self) -> None:
+        self.assertEqual(BatchPlanner.plan([], 10), [])
+
+    def test_plan_with_files_that_fit_in_one_batch(self) -> None:
+        self.assertEqual(
+            BatchPlanner.plan([("file1", 4), ("file2", 7)], 4096),
+            [
+                [
+                    {
+                        "path": "file2",
+                        "start": 0,
+                        "end": 7,
+                        "chunk_index": 0,
+                        "num_total_chunks": 1,
+                    },
+                    {
+                        "path": "file1",
+                        "start": 0,
+                        "end": 4,
+                        "chunk_index": 0,
+                        "num_total_chunks": 1,
+                    },
+                ]
+            ],
+        )
+
+    def test_plan_packs_whole_files_first_fit_decreasing(self) -> None:
+        # Each chunk of "fileN" takes 135 bytes besides its content.
+        planned_batches = BatchPlanner.plan(
+            [("file1", 465), ("file2", 265), ("file3", 265), ("file4", 465)],
+            512 + 1000,
+            "binary",
+        )
+
+        self.assertEqual(
+            self._get_chunks(planned_batches),
+            [
+                [("file1", 0, 465, 0), ("file2", 0, 265, 0)],
+                [("file4", 0, 465, 0), ("file3", 0, 265, 0)],
+            ],
+        )
+
+    def test_plan_splits_only_files_larger_than_a_batch(self) -> None:
+        planned_batches = BatchPlanner.plan(
+            [("file1", 2000), ("file2", 300)], 512 + 1000, "binary"
+        )
+
+        self.assertEqual(
+            self._get_chunks(planned_batches),
+            [
+                [("file1", 0, 865, 0)],
+                [("file1", 865, 1730, 1)],
+                [("file2", 0, 300, 0), ("file1", 1730, 2000, 2)],
+            ],
+        )
+
+    def test_plan_counts_encoded_size(self) -> None:
+        planned_batches = BatchPlanner.plan([("file1", 800)], 512 + 1000)
+
+        self.assertEqual(
+            self._get_chunks(planned_batches),
+            [[("file1", 0, 642, 0)], [("file1", 642, 800, 1)]],
+        )
+        self.assertTrue(
+            all(
+                sum(
+                    BatchPlanner.get_chunk_size_bytes(
+                        chunk["path"], chunk["end"] - chunk["start"]
+                    )
+                    for chunk in batch
+                )
+                <= 1000
+                for batch in planned_batches
+            )
+        )
+
+    def test_plan_keeps_empty_files(self) -> None:
+        self.assertEqual(
+            BatchPlanner.plan([("file1", 0), ("file2", 0)], 10),
+            [
+                [
+                    {
+                        "path": "file1",
+                        "start": 0,
+                        "end": 0,
+                        "chunk_index": 0,
+                        "num_total_chunks": 1,
+                    }
+                ],
+                [
+                    {
+                        "path": "file2",
+                        "start": 0,
+                        "end": 0,
+                        "chunk_index": 0,
+                        "num_total_chunks": 1,
+                    }
+                ],
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
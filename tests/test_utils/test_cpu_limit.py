@@ -0,0 +1,66 @@
+from pathlib import Path
+from unittest.mock import patch
+import tempfile, unittest
+
+from insight_cli.utils import CpuLimit
+
+
+class TestCpuLimit(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_dir_path = Path(self.temp_dir.name)
+        self.patchers = [
+            patch.object(
+                CpuLimit, "_CGROUP_V2_CPU_MAX_PATH", self.temp_dir_path / "cpu.max"
+            ),
+            patch.object(
+                CpuLimit, "_CGROUP_V1_QUOTA_PATH", self.temp_dir_path / "quota"
+            ),
+            patch.object(
+                CpuLimit, "_CGROUP_V1_PERIOD_PATH", self.temp_dir_path / "period"
+            ),
+            patch("os.sched_getaffinity", return_value=set(range(8)), create=True),
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in self.patchers:
+            patcher.stop()
+
+        self.temp_dir.cleanup()
+
+    def test_without_cgroup_quota(self) -> None:
+        self.assertEqual(CpuLimit.get_num_available_cpus(), 8)
+
+    def test_with_unlimited_cgroup_v2_quota(self) -> None:
+        (self.temp_dir_path / "cpu.max").write_text("max 100000\n")
+
+        self.assertEqual(CpuLimit.get_num_available_cpus(), 8)
+
+    def test_with_cgroup_v2_quota(self) -> None:
+        (self.temp_dir_path / "cpu.max").write_text("250000 100000\n")
+
+        self.assertEqual(CpuLimit.get_num_available_cpus(), 3)
+
+    def test_with_cgroup_v1_quota(self) -> None:
+        (self.temp_dir_path / "quota").write_text("50000\n")
+        (self.temp_dir_path / "period").write_text("100000\n")
+
+        self.assertEqual(CpuLimit.get_num_available_cpus(), 1)
+
+    def test_with_unlimited_cgroup_v1_quota(self) -> None:
+        (self.temp_dir_path / "quota").write_text("-1\n")
+        (self.temp_dir_path / "period").write_text("100000\n")
+
+        self.assertEqual(CpuLimit.get_num_available_cpus(), 8)
+
+    def test_with_more_quota_than_cpus(self) -> None:
+        (self.temp_dir_path / "cpu.max").write_text("1600000 100000\n")
+
+        self.assertEqual(CpuLimit.get_num_available_cpus(), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from insight_cli.utils import Diagnostics
+
+
+class TestDiagnostics(unittest.TestCase):
+    def setUp(self) -> None:
+        Diagnostics.reset()
+
+    def tearDown(self) -> None:
+        Diagnostics.reset()
+
+    def test_record(self) -> None:
+        Diagnostics.record("name", 1)
+        Diagnostics.record("name", 2)
+
+        self.assertEqual(Diagnostics.get("name"), 2)
+
+    def test_increment(self) -> None:
+        Diagnostics.increment("name")
+        Diagnostics.increment("name", 2)
+
+        self.assertEqual(Diagnostics.get("name"), 3)
+
+    def test_get_with_missing_name(self) -> None:
+        self.assertIsNone(Diagnostics.get("name"))
+        self.assertEqual(Diagnostics.get("name", 0), 0)
+
+    def test_snapshot(self) -> None:
+        Diagnostics.record("name", 1)
+        snapshot = Diagnostics.snapshot()
+        Diagnostics.record("name", 2)
+
+        self.assertEqual(snapshot, {"name": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 import os, tempfile, unittest
 
 from insight_cli.utils.directory import Directory, File
@@ -77,17 +78,111 @@ class TestDirectory(unittest.TestCase):
             expected_file_modification_times,
         )
 
-    def test_file_paths_to_content(self) -> None:
+    def test_files_are_stat_once(self) -> None:
+        directory = Directory(
+            self.temp_dir_path,
+            {"directory": {"subdir1"}, "file": set()},
+            {".py"},
+        )
+
+        with patch("os.stat") as mock_stat, patch("os.path.getmtime") as mock_getmtime:
+            file_modified_times = directory.file_modified_times
+            largest_file = directory.largest_file_by_size
+
+        mock_stat.assert_not_called()
+        mock_getmtime.assert_not_called()
+        self.assertEqual(len(file_modified_times), 5)
+        self.assertEqual(largest_file.size_bytes, len("content1"))
+
+        for file in directory.files:
+            stat_result = os.stat(file.path)
+            self.assertEqual(
+                file.scan_record,
+                {
+                    "size_bytes": stat_result.st_size,
+                    "modified_time_ns": stat_result.st_mtime_ns,
+                    "inode": stat_result.st_ino,
+                },
+            )
+
+    def test_files_with_links(self) -> None:
+        os.symlink(self.temp_dir_path / "subdir", self.temp_dir_path / "link")
+        os.symlink(self.temp_dir_path / "missing.py", self.temp_dir_path / "broken.py")
+
+        self.assertEqual(
+            sorted(
+                Directory(
+                    self.temp_dir_path,
+                    {"directory": {"subdir$"}, "file": set()},
+                    {".py"},
+                ).file_paths
+            ),
+            [
+                self.temp_dir_path / "file1.py",
+                self.temp_dir_path / "file2.py",
+                self.temp_dir_path / "subdir1/file3.py",
+            ],
+        )
+
+    def test_files_with_relative_path(self) -> None:
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir_path)
+
+        try:
+            file_paths = Directory(
+                Path(""), {"directory": {"^subdir$"}, "file": {"^file2"}}, {".py"}
+            ).file_paths
+
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(
+            sorted(file_paths), [Path("file1.py"), Path("subdir1/file3.py")]
+        )
+
+    def test_files_are_sorted_whatever_the_number_of_workers(self) -> None:
+        for i in range(50):
+            file_path = self.temp_dir_path / f"dir{i % 7}/sub{i % 3}/file{i}.py"
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(str(i))
+
+        file_paths = [
+            Directory(
+                self.temp_dir_path,
+                {"directory": {"sub2$"}, "file": set()},
+                {".py"},
+                num_workers,
+            ).file_paths
+            for num_workers in [1, 2, 8]
+        ]
+
+        self.assertEqual(file_paths[0], file_paths[1])
+        self.assertEqual(file_paths[0], file_paths[2])
+        self.assertEqual(len(file_paths[0]), 6 + 50 - len(range(2, 50, 3)))
         self.assertEqual(
+            file_paths[0][:5],
+            [
+                self.temp_dir_path / "file1.py",
+                self.temp_dir_path / "file2.py",
+                self.temp_dir_path / "dir0/sub0/file0.py",
+                self.temp_dir_path / "dir0/sub0/file21.py",
+                self.temp_dir_path / "dir0/sub0/file42.py",
+            ],
+        )
+        self.assertEqual(file_paths[0][-1], self.temp_dir_path / "subdir1/file3.py")
+
+    def test_ignored_directories_are_not_scanned(self) -> None:
+        with patch.object(
+            Directory, "_scan_dir", autospec=True, side_effect=Directory._scan_dir
+        ) as mock_scan_dir:
             Directory(
                 self.temp_dir_path,
-                {"directory": {"subdir1"}, "file": {"file2.py"}},
+                {"directory": {"subdir1"}, "file": set()},
                 {".py"},
-            ).file_paths_to_content,
-            {
-                str(self.temp_dir_path / "file1.py"): b"content1",
-                str(self.temp_dir_path / "subdir/file3.py"): b"content3",
-                str(self.temp_dir_path / "subdir/file4.py"): b"content4",
-                str(self.temp_dir_path / "subdir/file5.py"): b"content5",
-            },
+                num_workers=2,
+            )
+
+        self.assertEqual(
+            sorted(call.args[1] for call in mock_scan_dir.call_args_list),
+            [str(self.temp_dir_path), str(self.temp_dir_path / "subdir")],
         )
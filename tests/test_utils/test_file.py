@@ -1,5 +1,7 @@
+from datetime import datetime
 from pathlib import Path
-import tempfile, unittest
+from unittest.mock import patch
+import hashlib, os, tempfile, unittest
 
 from insight_cli.utils.file import File
 
@@ -30,11 +32,92 @@ class TestFileClass(unittest.TestCase):
 
         self.assertEqual(File(file_path).content, content)
 
+    def test_content_is_reread_from_disk(self):
+        file_path = self.temp_dir_path / "test_file_1.txt"
+        file_path.write_bytes(b"Hello")
+        self.assertEqual(File(file_path).content, b"Hello")
+
+        file_path.write_bytes(b"Hello, World!")
+        self.assertEqual(File(file_path).content, b"Hello, World!")
+
+    def test_read_range(self):
+        file_path = self.temp_dir_path / "test_file_1.txt"
+        file_path.write_bytes(b"Hello, World!")
+
+        self.assertEqual(File(file_path).read_range(0, 5), b"Hello")
+        self.assertEqual(File(file_path).read_range(7, 12), b"World")
+        self.assertEqual(File(file_path).read_range(7), b"World!")
+
+    def test_read_range_into(self):
+        file_path = self.temp_dir_path / "test_file_1.txt"
+        file_path.write_bytes(b"Hello, World!")
+        buffer = memoryview(bytearray(10))
+
+        self.assertEqual(File(file_path).read_range_into(7, buffer[:5]), 5)
+        self.assertEqual(File(file_path).read_range_into(0, buffer[5:]), 5)
+        self.assertEqual(bytes(buffer), b"WorldHello")
+        self.assertEqual(File(file_path).read_range_into(12, buffer), 1)
+        self.assertEqual(
+            File(self.temp_dir_path / "test_file_2.txt").read_range_into(0, buffer), 0
+        )
+
+    def test_blob_hash(self):
+        file_path = self.temp_dir_path / "test_file_1.txt"
+        content = b"Hello, World!" * 1000
+        file_path.write_bytes(content)
+
+        with patch.object(File, "_HASH_BLOCK_SIZE_BYTES", 1024):
+            self.assertEqual(
+                File(file_path).blob_hash,
+                hashlib.blake2b(content, digest_size=32).hexdigest(),
+            )
+
+    def test_blob_hash_with_non_existing_file(self):
+        self.assertEqual(
+            File(self.temp_dir_path / "test_file_1.txt").blob_hash,
+            hashlib.blake2b(b"", digest_size=32).hexdigest(),
+        )
+
     def test_content_with_non_existing_file(self):
         file_path = self.temp_dir_path / "test_file_1.txt"
 
         self.assertEqual(File(file_path).content, b"")
 
+    def test_scan_record_of_unscanned_file(self):
+        file_path = self.temp_dir_path / "test_file_1.txt"
+        file_path.write_bytes(b"abc")
+        file = File(file_path)
+
+        self.assertEqual(file.size_bytes, 3)
+
+        file_path.write_bytes(b"abcdef")
+
+        self.assertEqual(file.size_bytes, 6)
+        self.assertEqual(file.scan_record["inode"], os.stat(file_path).st_ino)
+
+    def test_scan_record_of_scanned_file(self):
+        file_path = self.temp_dir_path / "test_file_1.txt"
+        file_path.write_bytes(b"abc")
+        scan_record = File.get_scan_record(os.stat(file_path))
+        file = File(file_path, scan_record)
+        file_path.write_bytes(b"abcdef")
+
+        with patch("os.stat") as mock_stat:
+            self.assertEqual(File(file_path).scan_record, scan_record)
+            self.assertEqual(file.size_bytes, 3)
+
+        mock_stat.assert_not_called()
+
+    def test_modified_time(self):
+        file_path = self.temp_dir_path / "test_file_1.txt"
+        file_path.write_bytes(b"abc")
+        os.utime(file_path, ns=(0, 1702751393_824125349))
+
+        self.assertEqual(
+            File(file_path, File.get_scan_record(os.stat(file_path))).modified_time,
+            datetime.fromtimestamp(os.path.getmtime(file_path)),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -115,19 +115,24 @@ class TestFileChangesDetector(unittest.TestCase):
             current_file_modified_times=current_files,
         )
 
+        file_changes = {
+            change: {(str(file.path), file.content) for file in files}
+            for change, files in file_changes_detector.file_changes.items()
+        }
+
         self.assertSetEqual(
-            set(file_changes_detector.file_changes["add"]),
+            file_changes["add"],
             {
                 (str(self.temp_dir_path / "file5.txt"), b"yo5"),
                 (str(self.temp_dir_path / "file4.txt"), b"yo4"),
             },
         )
         self.assertSetEqual(
-            set(file_changes_detector.file_changes["update"]),
+            file_changes["update"],
             {(str(self.temp_dir_path / "file1.txt"), b"yo1")},
         )
         self.assertSetEqual(
-            set(file_changes_detector.file_changes["delete"]),
+            file_changes["delete"],
             {(str(self.temp_dir_path / "file3.txt"), b"")},
         )
 
@@ -0,0 +1,16 @@
+import unittest
+
+from insight_cli.utils import FileChunkifier
+
+
+class TestFileChunkifier(unittest.TestCase):
+    def test_chunk_ranges(self) -> None:
+        self.assertEqual(FileChunkifier.chunk_ranges(10, 4), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(
+            FileChunkifier.chunk_ranges(10, 4, 2), [(0, 2), (2, 6), (6, 10)]
+        )
+        self.assertEqual(FileChunkifier.chunk_ranges(0, 4), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from insight_cli.utils import FileDelta
+
+
+class TestFileDelta(unittest.TestCase):
+    def test_create(self) -> None:
+        self.assertEqual(
+            FileDelta.create(b"a\nb\nc\n", b"a\nB\nc\nd\n"),
+            [
+                {"start_line": 1, "end_line": 2, "content": b"B\n"},
+                {"start_line": 3, "end_line": 3, "content": b"d\n"},
+            ],
+        )
+
+    def test_create_with_identical_content(self) -> None:
+        self.assertEqual(FileDelta.create(b"a\nb\n", b"a\nb\n"), [])
+
+    def test_create_with_scattered_edits_of_large_file(self) -> None:
+        base_lines = [b"value_%d = %d\n" % (i, i) for i in range(20000)]
+        lines = list(base_lines)
+
+        for i in range(0, len(lines), 97):
+            lines[i] = b"edited_%d\n" % i
+
+        base_content, content = b"".join(base_lines), b"".join(lines)
+        line_edits = FileDelta.create(base_content, content)
+
+        self.assertEqual(FileDelta.apply(base_content, line_edits), content)
+        self.assertEqual(len(line_edits), len(range(0, len(lines), 97)))
+
+    def test_create_replaces_large_gaps_whole(self) -> None:
+        base_content = b"start\n" + b"a\nb\n" * 100 + b"end\n"
+        content = b"start\n" + b"b\na\n" * 100 + b"end\n"
+
+        self.assertEqual(
+            FileDelta.create(base_content, content),
+            [{"start_line": 1, "end_line": 201, "content": b"b\na\n" * 100}],
+        )
+
+    def test_apply(self) -> None:
+        base_content = b"a\nb\nc\nd\ne"
+        contents = [b"", b"a\nb\nc\nd\ne\n", b"x\nb\nd\ny\nz", b"c\n"]
+
+        for content in contents:
+            self.assertEqual(
+                FileDelta.apply(base_content, FileDelta.create(base_content, content)),
+                content,
+            )
+
+    def test_get_size_bytes(self) -> None:
+        self.assertEqual(
+            FileDelta.get_size_bytes(FileDelta.create(b"a\nb\n", b"a\nbc\nd\n")), 5
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from insight_cli.utils import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_get_percentile_with_no_samples(self) -> None:
+        self.assertIsNone(LatencyHistogram().get_percentile(50))
+
+    def test_get_percentile_is_within_bucket_resolution(self) -> None:
+        histogram = LatencyHistogram()
+
+        for i in range(1, 101):
+            histogram.record(i / 1000)
+
+        for percentile in [50, 90, 99]:
+            latency_seconds = histogram.get_percentile(percentile)
+            self.assertGreaterEqual(latency_seconds, percentile / 1000)
+            self.assertLess(latency_seconds, percentile / 1000 * 1.1)
+
+        self.assertEqual(histogram.num_samples, 100)
+
+    def test_get_percentile_of_single_sample(self) -> None:
+        histogram = LatencyHistogram()
+        histogram.record(0.25)
+
+        self.assertAlmostEqual(histogram.get_percentile(0), 0.25)
+        self.assertAlmostEqual(histogram.get_percentile(100), 0.25)
+
+    def test_get_latencies_seconds(self) -> None:
+        histogram = LatencyHistogram()
+
+        for latency_seconds in [1, 0.001, 1]:
+            histogram.record(latency_seconds)
+
+        latencies_seconds = histogram.get_latencies_seconds()
+
+        self.assertEqual(len(latencies_seconds), 3)
+        self.assertEqual(latencies_seconds, sorted(latencies_seconds))
+        self.assertAlmostEqual(latencies_seconds[0], 0.001, delta=0.0001)
+        self.assertAlmostEqual(latencies_seconds[2], 1)
+
+    def test_merge(self) -> None:
+        histogram1, histogram2 = LatencyHistogram(), LatencyHistogram()
+        histogram1.record(0.001)
+        histogram2.record(1)
+        histogram2.record(1)
+
+        histogram1.merge(histogram2)
+
+        self.assertEqual(histogram1.num_samples, 3)
+        self.assertAlmostEqual(histogram1.get_percentile(50), 1)
+        self.assertEqual(histogram2.num_samples, 2)
+
+    def test_to_dict_and_from_dict(self) -> None:
+        histogram = LatencyHistogram()
+        histogram.record(0.5)
+        histogram.record(0.5)
+        histogram.record(2)
+
+        counts = histogram.to_dict()
+
+        self.assertEqual(counts, {"-8": 2, "8": 1})
+        self.assertEqual(LatencyHistogram.from_dict(counts).to_dict(), counts)
+
+
+if __name__ == "__main__":
+    unittest.main()
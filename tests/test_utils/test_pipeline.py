@@ -0,0 +1,66 @@
+import threading, time, unittest
+
+from insight_cli.utils import Pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    def test_stage_yields_items_in_order(self) -> None:
+        self.assertEqual(list(Pipeline.stage(range(100), 2)), list(range(100)))
+
+    def test_stage_with_empty_iterable(self) -> None:
+        self.assertEqual(list(Pipeline.stage([], 1)), [])
+
+    def test_stage_is_bounded(self) -> None:
+        num_produced = 0
+
+        def produce():
+            nonlocal num_produced
+            for i in range(100):
+                num_produced += 1
+                yield i
+
+        stage = Pipeline.stage(produce(), 2)
+        self.assertEqual(next(stage), 0)
+        time.sleep(0.2)
+
+        # one item consumed, two buffered and one blocked on the full queue
+        self.assertLessEqual(num_produced, 4)
+
+        stage.close()
+
+    def test_stage_reraises_producer_exception(self) -> None:
+        def produce():
+            yield 1
+            raise ValueError("error message")
+
+        stage = Pipeline.stage(produce(), 1)
+        self.assertEqual(next(stage), 1)
+
+        with self.assertRaises(ValueError):
+            next(stage)
+
+    def test_stage_close_stops_producer(self) -> None:
+        producer_stopped = threading.Event()
+
+        def produce():
+            try:
+                while True:
+                    yield 0
+            finally:
+                producer_stopped.set()
+
+        stage = Pipeline.stage(produce(), 1)
+        next(stage)
+        stage.close()
+
+        self.assertTrue(producer_stopped.wait(timeout=1))
+
+    def test_chained_stages(self) -> None:
+        first_stage = Pipeline.stage(range(10), 1)
+        second_stage = Pipeline.stage((i * 2 for i in first_stage), 1)
+
+        self.assertEqual(list(second_stage), [i * 2 for i in range(10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+from pathlib import Path
+import json, tempfile, unittest
+
+from insight_cli.utils import Tracer
+
+
+class TestTracer(unittest.TestCase):
+    def tearDown(self) -> None:
+        Tracer.stop()
+
+    def test_span_is_not_recorded_when_not_started(self) -> None:
+        with Tracer.span("scan"):
+            pass
+
+        self.assertEqual(Tracer.stop(), [])
+
+    def test_span_is_recorded_when_started(self) -> None:
+        Tracer.start()
+
+        with Tracer.span("read", size_bytes=4):
+            pass
+
+        (event,) = Tracer.stop()
+        self.assertEqual(event["name"], "read")
+        self.assertEqual(event["ph"], "X")
+        self.assertEqual(event["args"], {"size_bytes": 4})
+        self.assertGreaterEqual(event["ts"], 0)
+        self.assertGreaterEqual(event["dur"], 0)
+
+    def test_nested_spans(self) -> None:
+        Tracer.start()
+
+        with Tracer.span("query"):
+            with Tracer.span("render"):
+                pass
+
+        render, query = Tracer.stop()
+        self.assertEqual([render["name"], query["name"]], ["render", "query"])
+        self.assertLessEqual(query["ts"], render["ts"])
+        self.assertGreaterEqual(
+            query["ts"] + query["dur"], render["ts"] + render["dur"]
+        )
+
+    def test_span_is_recorded_when_raising(self) -> None:
+        Tracer.start()
+
+        with self.assertRaises(ValueError), Tracer.span("encode"):
+            raise ValueError()
+
+        self.assertEqual([event["name"] for event in Tracer.stop()], ["encode"])
+
+    def test_write_chrome_trace(self) -> None:
+        events = [{"name": "scan", "ph": "X", "ts": 0, "dur": 1, "pid": 1, "tid": 1}]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = str(Path(temp_dir) / "trace.json")
+            Tracer.write_chrome_trace(events, path)
+
+            with open(path) as file:
+                self.assertEqual(
+                    json.load(file), {"traceEvents": events, "displayTimeUnit": "ms"}
+                )
+
+    def test_get_summary(self) -> None:
+        events = [
+            {"name": "scan", "dur": 1000},
+            {"name": "read", "dur": 2000},
+            {"name": "read", "dur": 3000},
+        ]
+
+        header, read, scan = Tracer.get_summary(events)
+        self.assertEqual(header.split(), ["phase", "count", "total", "ms", "max", "ms"])
+        self.assertEqual(read.split(), ["read", "2", "5.0", "3.0"])
+        self.assertEqual(scan.split(), ["scan", "1", "1.0", "1.0"])
+
+    def test_get_summary_is_limited_to_num_phases(self) -> None:
+        events = [{"name": f"phase {i}", "dur": i} for i in range(5)]
+
+        self.assertEqual(len(Tracer.get_summary(events, num_phases=2)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()